@@ -6,11 +6,15 @@ from datetime import UTC, datetime, timedelta
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import get_cache, get_or_compute
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.deps import ActiveUser, AdminUser, TeacherOrAdmin
+from app.core.pagination import decode_datetime_cursor, encode_cursor
+from app.core.security import password_hash_pool
 from app.models import (
     Leaderboard,
     Notification,
@@ -24,6 +28,13 @@ from app.models import (
 )
 from app.models.enums import AttemptStatus
 from app.services.analytics_service import AnalyticsService
+from app.services.leaderboard_service import LeaderboardService, board_key, period_bounds
+from app.services.platform_analytics_service import PlatformAnalyticsService
+from app.services.score_distribution_service import (
+    DEFAULT_BUCKET_WIDTH,
+    SCORE_RANGES,
+    ScoreDistributionService,
+)
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
@@ -36,28 +47,33 @@ async def get_public_stats(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Get public platform stats (no auth required)."""
-    total_users = (await db.execute(
-        select(func.count()).select_from(User)
-    )).scalar() or 0
 
-    tests_completed = (await db.execute(
-        select(func.count()).select_from(TestAttempt)
-        .where(TestAttempt.status == AttemptStatus.COMPLETED)
-    )).scalar() or 0
+    async def compute():
+        completed = TestAttempt.status == AttemptStatus.COMPLETED
+        row = (await db.execute(
+            select(
+                select(func.count()).select_from(User).scalar_subquery().label("total_users"),
+                select(func.count())
+                .select_from(TestAttempt)
+                .where(completed)
+                .scalar_subquery()
+                .label("tests_completed"),
+                select(func.avg(TestAttempt.total_score))
+                .where(completed, TestAttempt.total_score.isnot(None))
+                .scalar_subquery()
+                .label("avg_score"),
+            )
+        )).one()
 
-    avg_score_result = (await db.execute(
-        select(func.avg(TestAttempt.total_score))
-        .where(
-            TestAttempt.status == AttemptStatus.COMPLETED,
-            TestAttempt.total_score.isnot(None),
-        )
-    )).scalar()
+        return {
+            "total_users": row.total_users or 0,
+            "tests_completed": row.tests_completed or 0,
+            "avg_score": round(row.avg_score, 0) if row.avg_score else None,
+        }
 
-    return {
-        "total_users": total_users,
-        "tests_completed": tests_completed,
-        "avg_score": round(avg_score_result, 0) if avg_score_result else None,
-    }
+    return await get_or_compute(
+        get_cache(), "analytics:public-stats", settings.analytics_cache_ttl_seconds, compute
+    )
 
 
 # === Student Analytics ===
@@ -152,31 +168,52 @@ async def get_leaderboard(
     period_type: str = Query("weekly", regex="^(weekly|monthly|alltime)$"),
     limit: int = Query(50, ge=1, le=100),
 ):
-    """Get leaderboard rankings."""
-    query = select(Leaderboard, User).join(User, User.id == Leaderboard.user_id)
-
-    query = query.where(
-        Leaderboard.scope_type == scope_type,
-        Leaderboard.period_type == period_type,
-    )
-
-    if scope_id:
-        query = query.where(Leaderboard.scope_id == scope_id)
-
-    query = query.order_by(Leaderboard.rank).limit(limit)
-
-    result = await db.execute(query)
-    entries = result.all()
-
-    # Find current user's rank
-    user_rank = None
-    for entry in entries:
-        if entry.Leaderboard.user_id == current_user.id:
-            user_rank = entry.Leaderboard.rank
-            break
-
-    return {
-        "leaderboard": [
+    """
+    Get leaderboard rankings for the current period.
+
+    Served from the live sorted sets; falls back to the last materialized
+    snapshot in the leaderboard table if the cache has no data.
+    """
+    period_start, _ = period_bounds(period_type, datetime.now(UTC))
+    service = LeaderboardService(db, get_cache())
+    key = board_key(scope_type, scope_id, period_type, period_start)
+
+    entries = await service.top(key, limit)
+    if entries:
+        user_rank = await service.rank_of(key, current_user.id)
+        result = await db.execute(
+            select(User.id, User.full_name, User.avatar_url)
+            .where(User.id.in_([e["user_id"] for e in entries]))
+        )
+        users = {row.id: row for row in result.all()}
+        leaderboard = [
+            {
+                "rank": e["rank"],
+                "user_id": e["user_id"],
+                "user_name": users[e["user_id"]].full_name or "Anonymous",
+                "avatar_url": users[e["user_id"]].avatar_url,
+                "score": e["score"],
+                "tests_completed": e["tests_completed"],
+                "average_accuracy": e["average_accuracy"],
+            }
+            for e in entries
+            if e["user_id"] in users
+        ]
+    else:
+        board_filter = (
+            Leaderboard.scope_type == scope_type,
+            Leaderboard.scope_id == scope_id if scope_id else Leaderboard.scope_id.is_(None),
+            Leaderboard.period_type == period_type,
+            Leaderboard.period_start == period_start,
+        )
+        result = await db.execute(
+            select(Leaderboard, User)
+            .join(User, User.id == Leaderboard.user_id)
+            .where(*board_filter)
+            .order_by(Leaderboard.rank)
+            .limit(limit)
+        )
+        leaderboard = [
             {
                 "rank": e.Leaderboard.rank,
                 "user_id": e.Leaderboard.user_id,
@@ -186,8 +223,15 @@ async def get_leaderboard(
                 "tests_completed": e.Leaderboard.tests_completed,
                 "average_accuracy": e.Leaderboard.average_accuracy,
             }
-            for e in entries
-        ],
+            for e in result.all()
+        ]
+        user_rank = (await db.execute(
+            select(Leaderboard.rank)
+            .where(*board_filter, Leaderboard.user_id == current_user.id)
+        )).scalar()
+
+    return {
+        "leaderboard": leaderboard,
         "my_rank": user_rank,
         "scope_type": scope_type,
         "period_type": period_type,
@@ -496,54 +540,11 @@ async def get_platform_analytics(
 async def get_score_distribution(
     admin: AdminUser,
     db: Annotated[AsyncSession, Depends(get_db)],
+    scope: str = Query("total", regex="^(total|reading_writing|math)$"),
+    bucket_width: int = Query(DEFAULT_BUCKET_WIDTH, ge=10, le=600, multiple_of=10),
 ):
     """Get distribution of scores across the platform."""
-    result = await db.execute(
-        select(TestAttempt.total_score)
-        .where(
-            TestAttempt.status == AttemptStatus.COMPLETED,
-            TestAttempt.total_score.isnot(None),
-        )
-    )
-    scores = [row[0] for row in result]
-
-    if not scores:
-        return {"distribution": {}, "stats": {}}
-
-    # Create distribution buckets
-    buckets = {
-        "400-600": 0,
-        "600-800": 0,
-        "800-1000": 0,
-        "1000-1200": 0,
-        "1200-1400": 0,
-        "1400-1600": 0,
-    }
-
-    for score in scores:
-        if score < 600:
-            buckets["400-600"] += 1
-        elif score < 800:
-            buckets["600-800"] += 1
-        elif score < 1000:
-            buckets["800-1000"] += 1
-        elif score < 1200:
-            buckets["1000-1200"] += 1
-        elif score < 1400:
-            buckets["1200-1400"] += 1
-        else:
-            buckets["1400-1600"] += 1
-
-    return {
-        "distribution": buckets,
-        "stats": {
-            "count": len(scores),
-            "average": sum(scores) / len(scores),
-            "min": min(scores),
-            "max": max(scores),
-            "median": sorted(scores)[len(scores) // 2],
-        },
-    }
+    return await ScoreDistributionService(db).get_summary(scope, bucket_width, get_cache())
 
 
 # === Enhanced Admin Analytics ===
@@ -554,118 +555,135 @@ async def get_admin_dashboard(
     admin: AdminUser,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    """Get comprehensive admin dashboard data."""
-    from app.models import Test, Question
-
-    now = datetime.now(UTC)
-    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_ago = today - timedelta(days=7)
-    month_ago = today - timedelta(days=30)
-
-    # User stats
-    total_users = (await db.execute(select(func.count()).select_from(User))).scalar() or 0
-    active_users = (await db.execute(
-        select(func.count()).select_from(User).where(User.is_active == True)  # noqa: E712
-    )).scalar() or 0
-    new_users_week = (await db.execute(
-        select(func.count()).select_from(User).where(User.created_at >= week_ago)
-    )).scalar() or 0
-    new_users_month = (await db.execute(
-        select(func.count()).select_from(User).where(User.created_at >= month_ago)
-    )).scalar() or 0
-
-    # Test stats
-    total_tests = (await db.execute(select(func.count()).select_from(Test))).scalar() or 0
-    published_tests = (await db.execute(
-        select(func.count()).select_from(Test).where(Test.is_published == True)  # noqa: E712
-    )).scalar() or 0
-
-    # Attempt stats
-    total_attempts = (await db.execute(
-        select(func.count()).select_from(TestAttempt)
-    )).scalar() or 0
-    completed_attempts = (await db.execute(
-        select(func.count()).select_from(TestAttempt)
-        .where(TestAttempt.status == AttemptStatus.COMPLETED)
-    )).scalar() or 0
-    attempts_this_week = (await db.execute(
-        select(func.count()).select_from(TestAttempt)
-        .where(TestAttempt.started_at >= week_ago)
-    )).scalar() or 0
-
-    # Average score
-    avg_score_result = await db.execute(
-        select(func.avg(TestAttempt.total_score))
-        .where(TestAttempt.total_score.isnot(None))
-    )
-    avg_score = avg_score_result.scalar()
+    """
+    Get comprehensive admin dashboard data.
 
-    # Completion rate
-    completion_rate = (completed_attempts / total_attempts * 100) if total_attempts > 0 else 0
+    Computed with a few aggregate queries and cached for
+    ANALYTICS_CACHE_TTL_SECONDS; concurrent misses share one computation.
+    """
+    from app.models import Test
 
-    # Recent activity (last 10 completed tests)
-    recent_result = await db.execute(
-        select(TestAttempt, User, Test)
-        .join(User, User.id == TestAttempt.user_id)
-        .join(Test, Test.id == TestAttempt.test_id)
-        .where(TestAttempt.status == AttemptStatus.COMPLETED)
-        .order_by(TestAttempt.completed_at.desc())
-        .limit(10)
-    )
-    recent_activity = [
-        {
-            "user_name": row.User.full_name or row.User.email,
-            "test_title": row.Test.title,
-            "score": row.TestAttempt.total_score,
-            "completed_at": row.TestAttempt.completed_at.isoformat() if row.TestAttempt.completed_at else None,
+    async def compute():
+        now = datetime.now(UTC)
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        week_ago = today - timedelta(days=7)
+        month_ago = today - timedelta(days=30)
+
+        users = (await db.execute(
+            select(
+                func.count().label("total"),
+                func.count().filter(User.is_active == True).label("active"),  # noqa: E712
+                func.count().filter(User.created_at >= week_ago).label("new_week"),
+                func.count().filter(User.created_at >= month_ago).label("new_month"),
+            ).select_from(User)
+        )).one()
+
+        tests = (await db.execute(
+            select(
+                func.count().label("total"),
+                func.count().filter(Test.is_published == True).label("published"),  # noqa: E712
+            ).select_from(Test)
+        )).one()
+
+        attempts = (await db.execute(
+            select(
+                func.count().label("total"),
+                func.count()
+                .filter(TestAttempt.status == AttemptStatus.COMPLETED)
+                .label("completed"),
+                func.count().filter(TestAttempt.started_at >= week_ago).label("this_week"),
+                func.avg(TestAttempt.total_score).label("avg_score"),
+            ).select_from(TestAttempt)
+        )).one()
+
+        # Score distributions, shared (and cached) with /platform/score-distribution
+        distribution_service = ScoreDistributionService(db)
+        score_summaries = {
+            scope: await distribution_service.get_summary(scope, DEFAULT_BUCKET_WIDTH, cache)
+            for scope in SCORE_RANGES
         }
-        for row in recent_result
-    ]
 
-    # Top performers (last 30 days)
-    top_performers_result = await db.execute(
-        select(User, func.max(TestAttempt.total_score).label("best_score"))
-        .join(TestAttempt, TestAttempt.user_id == User.id)
-        .where(
-            TestAttempt.status == AttemptStatus.COMPLETED,
-            TestAttempt.completed_at >= month_ago,
+        completion_rate = (attempts.completed / attempts.total * 100) if attempts.total > 0 else 0
+
+        # Recent activity (last 10 completed tests)
+        recent_result = await db.execute(
+            select(
+                User.full_name,
+                User.email,
+                Test.title,
+                TestAttempt.total_score,
+                TestAttempt.completed_at,
+            )
+            .join(User, User.id == TestAttempt.user_id)
+            .join(Test, Test.id == TestAttempt.test_id)
+            .where(TestAttempt.status == AttemptStatus.COMPLETED)
+            .order_by(TestAttempt.completed_at.desc())
+            .limit(10)
         )
-        .group_by(User.id)
-        .order_by(func.max(TestAttempt.total_score).desc())
-        .limit(10)
-    )
-    top_performers = [
-        {
-            "user_id": row.User.id,
-            "user_name": row.User.full_name or row.User.email,
-            "best_score": row.best_score,
+        recent_activity = [
+            {
+                "user_name": row.full_name or row.email,
+                "test_title": row.title,
+                "score": row.total_score,
+                "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+            }
+            for row in recent_result
+        ]
+
+        # Top performers (last 30 days)
+        best_score = func.max(TestAttempt.total_score)
+        top_performers_result = await db.execute(
+            select(User.id, User.full_name, User.email, best_score.label("best_score"))
+            .join(TestAttempt, TestAttempt.user_id == User.id)
+            .where(
+                TestAttempt.status == AttemptStatus.COMPLETED,
+                TestAttempt.completed_at >= month_ago,
+            )
+            .group_by(User.id, User.full_name, User.email)
+            .order_by(best_score.desc())
+            .limit(10)
+        )
+        top_performers = [
+            {
+                "user_id": row.id,
+                "user_name": row.full_name or row.email,
+                "best_score": row.best_score,
+            }
+            for row in top_performers_result
+        ]
+
+        return {
+            "users": {
+                "total": users.total,
+                "active": users.active,
+                "new_this_week": users.new_week,
+                "new_this_month": users.new_month,
+            },
+            "tests": {
+                "total": tests.total,
+                "published": tests.published,
+            },
+            "attempts": {
+                "total": attempts.total,
+                "completed": attempts.completed,
+                "this_week": attempts.this_week,
+                "completion_rate": round(completion_rate, 1),
+            },
+            "scores": {
+                "average": round(attempts.avg_score, 0) if attempts.avg_score else None,
+                "median": score_summaries["total"]["stats"].get("median"),
+                "distributions": {
+                    scope: summary["distribution"] for scope, summary in score_summaries.items()
+                },
+            },
+            "recent_activity": recent_activity,
+            "top_performers": top_performers,
         }
-        for row in top_performers_result
-    ]
 
-    return {
-        "users": {
-            "total": total_users,
-            "active": active_users,
-            "new_this_week": new_users_week,
-            "new_this_month": new_users_month,
-        },
-        "tests": {
-            "total": total_tests,
-            "published": published_tests,
-        },
-        "attempts": {
-            "total": total_attempts,
-            "completed": completed_attempts,
-            "this_week": attempts_this_week,
-            "completion_rate": round(completion_rate, 1),
-        },
-        "scores": {
-            "average": round(avg_score, 0) if avg_score else None,
-        },
-        "recent_activity": recent_activity,
-        "top_performers": top_performers,
-    }
+    cache = get_cache()
+    return await get_or_compute(
+        cache, "analytics:admin-dashboard", settings.analytics_cache_ttl_seconds, compute
+    )
 
 
 @router.get("/admin/users")
@@ -675,45 +693,21 @@ async def get_admin_users_analytics(
     days: int = Query(30, ge=1, le=365),
 ):
     """Get user growth and engagement analytics for charts."""
-    now = datetime.now(UTC)
-    start_date = now - timedelta(days=days)
+    series = await PlatformAnalyticsService(db).daily_series(days)
 
-    # Daily new user counts
-    daily_users = []
-    for i in range(days):
-        day_start = (now - timedelta(days=days - 1 - i)).replace(hour=0, minute=0, second=0, microsecond=0)
-        day_end = day_start + timedelta(days=1)
-
-        count = (await db.execute(
-            select(func.count()).select_from(User)
-            .where(User.created_at >= day_start, User.created_at < day_end)
-        )).scalar() or 0
-
-        daily_users.append({
-            "date": day_start.date().isoformat(),
-            "count": count,
-        })
+    daily_users = [
+        {"date": day["period_start"].date().isoformat(), "count": day["new_users"]}
+        for day in series
+    ]
+    cumulative = [
+        {"date": day["period_start"].date().isoformat(), "total": day["total_users"]}
+        for day in series
+    ]
 
     # User role distribution
-    role_counts = {}
-    for role in ["student", "teacher", "admin"]:
-        count = (await db.execute(
-            select(func.count()).select_from(User).where(User.role == role)
-        )).scalar() or 0
-        role_counts[role] = count
-
-    # Cumulative user growth
-    cumulative = []
-    running_total = (await db.execute(
-        select(func.count()).select_from(User).where(User.created_at < start_date)
-    )).scalar() or 0
-
-    for day_data in daily_users:
-        running_total += day_data["count"]
-        cumulative.append({
-            "date": day_data["date"],
-            "total": running_total,
-        })
+    result = await db.execute(select(User.role, func.count()).group_by(User.role))
+    role_counts = {"student": 0, "teacher": 0, "admin": 0}
+    role_counts.update({role.value: count for role, count in result.all()})
 
     return {
         "daily_signups": daily_users,
@@ -801,47 +795,18 @@ async def get_admin_trends(
     db: Annotated[AsyncSession, Depends(get_db)],
     days: int = Query(30, ge=7, le=365),
 ):
-    """Get historical trend data for charts."""
-    now = datetime.now(UTC)
+    """Get historical trend data for charts (daily rollups plus today live)."""
+    series = await PlatformAnalyticsService(db).daily_series(days)
 
-    # Daily data for charts
-    daily_data = []
-    for i in range(days):
-        day_start = (now - timedelta(days=days - 1 - i)).replace(hour=0, minute=0, second=0, microsecond=0)
-        day_end = day_start + timedelta(days=1)
-
-        # Tests completed that day
-        tests_completed = (await db.execute(
-            select(func.count()).select_from(TestAttempt)
-            .where(
-                TestAttempt.completed_at >= day_start,
-                TestAttempt.completed_at < day_end,
-                TestAttempt.status == AttemptStatus.COMPLETED,
-            )
-        )).scalar() or 0
-
-        # Average score that day
-        avg_score = (await db.execute(
-            select(func.avg(TestAttempt.total_score))
-            .where(
-                TestAttempt.completed_at >= day_start,
-                TestAttempt.completed_at < day_end,
-                TestAttempt.status == AttemptStatus.COMPLETED,
-            )
-        )).scalar()
-
-        # New users that day
-        new_users = (await db.execute(
-            select(func.count()).select_from(User)
-            .where(User.created_at >= day_start, User.created_at < day_end)
-        )).scalar() or 0
-
-        daily_data.append({
-            "date": day_start.date().isoformat(),
-            "tests_completed": tests_completed,
-            "average_score": round(avg_score, 0) if avg_score else None,
-            "new_users": new_users,
-        })
+    daily_data = [
+        {
+            "date": day["period_start"].date().isoformat(),
+            "tests_completed": day["tests_completed"],
+            "average_score": round(day["average_score"], 0) if day["average_score"] else None,
+            "new_users": day["new_users"],
+        }
+        for day in series
+    ]
 
     return {
         "daily": daily_data,
@@ -849,6 +814,12 @@ async def get_admin_trends(
     }
 
 
+@router.get("/admin/password-hashing")
+async def get_password_hashing_stats(admin: AdminUser):
+    """Get this worker's password hashing pool depth and queue wait times."""
+    return password_hash_pool.stats()
+
+
 @router.get("/admin/score-analytics")
 async def get_score_analytics(
     admin: AdminUser,
@@ -866,10 +837,25 @@ async def get_score_analytics(
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    include_total: bool = False,
 ):
-    """Get detailed score analytics with filtering and pagination."""
+    """
+    Get detailed score analytics with filtering and pagination.
+
+    When sorting by completed_at, pass `cursor` (empty for the first page,
+    then `next_cursor`) for keyset pagination over (completed_at, id);
+    the filtered total is then only counted if `include_total` is set.
+    A cursor with any other sort_by is rejected with 400.
+    """
     from app.models import Test
 
+    if cursor is not None and sort_by != "completed_at":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is only available when sorting by completed_at",
+        )
+
     # Build base query
     query = (
         select(TestAttempt, User, Test)
@@ -939,9 +925,13 @@ async def get_score_analytics(
             (User.full_name.ilike(search_pattern)) | (User.email.ilike(search_pattern))
         )
 
+    use_cursor = cursor is not None
+
     # Get total count for pagination
-    count_query = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_query)).scalar() or 0
+    total = None
+    if not use_cursor or include_total:
+        count_query = select(func.count()).select_from(query.subquery())
+        total = (await db.execute(count_query)).scalar() or 0
 
     # Apply sorting
     if sort_by == "completed_at":
@@ -952,17 +942,35 @@ async def get_score_analytics(
         order_col = User.full_name
 
     if sort_order == "desc":
-        query = query.order_by(order_col.desc().nulls_last())
+        query = query.order_by(order_col.desc().nulls_last(), TestAttempt.id.desc())
     else:
-        query = query.order_by(order_col.asc().nulls_last())
+        query = query.order_by(order_col.asc().nulls_last(), TestAttempt.id.asc())
 
     # Apply pagination
-    offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size)
+    if use_cursor:
+        if cursor:
+            completed_at, last_id = decode_datetime_cursor(cursor)
+            key = tuple_(TestAttempt.completed_at, TestAttempt.id)
+            query = query.where(
+                key < tuple_(completed_at, last_id)
+                if sort_order == "desc"
+                else key > tuple_(completed_at, last_id)
+            )
+        # Fetch one extra row to know whether another page exists
+        query = query.limit(page_size + 1)
+    else:
+        offset = (page - 1) * page_size
+        query = query.offset(offset).limit(page_size)
 
     result = await db.execute(query)
     rows = result.all()
 
+    next_cursor = None
+    if use_cursor and len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1].TestAttempt
+        next_cursor = encode_cursor(last.completed_at, last.id)
+
     # Build items
     items = []
     for row in rows:
@@ -1003,7 +1011,7 @@ async def get_score_analytics(
     summary_result = await db.execute(summary_query)
     summary_row = summary_result.one()
 
-    total_pages = (total + page_size - 1) // page_size
+    total_pages = (total + page_size - 1) // page_size if total is not None else None
 
     return {
         "items": items,
@@ -1011,6 +1019,7 @@ async def get_score_analytics(
         "page": page,
         "page_size": page_size,
         "total_pages": total_pages,
+        "next_cursor": next_cursor,
         "summary": {
             "total_attempts": summary_row.total or 0,
             "average_score": round(summary_row.avg, 0) if summary_row.avg else None,
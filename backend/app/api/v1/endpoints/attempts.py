@@ -1,34 +1,63 @@
+import logging
 from datetime import UTC, datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import get_cache
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.deps import ActiveUser
+from app.core.pagination import decode_datetime_cursor, encode_cursor
 from app.models import (
     AttemptAnswer,
+    AttemptSummary,
     ModuleResult,
     Question,
     Test,
     TestAttempt,
     TestModule,
 )
-from app.models.enums import AttemptStatus, ModuleDifficulty, SATModule, SATSection, TestScope
+from app.models.enums import (
+    AttemptStatus,
+    ModuleDifficulty,
+    QuestionDomain,
+    SATModule,
+    SATSection,
+    TestScope,
+)
 from app.schemas import (
     AttemptListResponse,
+    AutosaveRequest,
+    AutosaveResponse,
     DomainBreakdown,
+    SubmitAnswerRequest,
     SubmitModuleRequest,
     TestAttemptDetailResponse,
     TestAttemptResponse,
     TestModuleWithQuestions,
 )
-from app.schemas.test import QuestionReviewView, QuestionStudentView, ModuleResultResponse
+from app.schemas.test import (
+    ModuleResultResponse,
+    PassageResponse,
+    QuestionReviewView,
+    QuestionStudentView,
+)
 from app.services.analytics_service import AnalyticsService
+from app.services.attempt_summary_service import AttemptSummaryService
+from app.services.autosave_service import AutosaveService, snapshot_state
+from app.services.irt_service import estimate_ability, item_parameters
+from app.services.leaderboard_service import LeaderboardService
+from app.services.org_analytics_service import OrgAnalyticsService
+from app.services.recommendation_service import RecommendationService
+from app.services.review_service import ReviewService
+from app.services.score_distribution_service import ScoreDistributionService
 
+logger = logging.getLogger(__name__)
 
 # === Request/Response schemas for new endpoints ===
 
@@ -70,6 +99,43 @@ class AttemptReviewResponse(BaseModel):
 
 router = APIRouter(prefix="/attempts", tags=["Test Attempts"])
 
+# Finished attempts are immutable; review also embeds editable question content
+FINISHED_DETAIL_CACHE_CONTROL = "private, max-age=300"
+FINISHED_REVIEW_CACHE_CONTROL = "private, no-cache"
+
+
+def _summary_etag(summary: AttemptSummary, content_version: int = 0) -> str:
+    return (
+        f'W/"attempt-{summary.attempt_id}-v{summary.version}'
+        f'-{int(summary.updated_at.timestamp())}-{content_version}"'
+    )
+
+
+def _not_modified(request: Request, response: Response, etag: str, cache_control: str) -> bool:
+    """Set caching headers and report whether the client copy is still current."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return request.headers.get("if-none-match") == etag
+
+
+def _submit_idempotency_key(user_id: int, attempt_id: int, key: str) -> str:
+    return f"idempotency:submit-module:{user_id}:{attempt_id}:{key}"
+
+
+def _merge_autosaved(
+    answers: list[SubmitAnswerRequest], buffered: dict | None, module_id: int
+) -> list[SubmitAnswerRequest]:
+    """Add autosaved answers the client did not resend; submitted answers win."""
+    if not buffered or buffered["module_id"] != module_id:
+        return answers
+
+    submitted = {a.question_id for a in answers}
+    return answers + [
+        SubmitAnswerRequest(question_id=question_id, **saved)
+        for question_id, saved in buffered["answers"].items()
+        if question_id not in submitted
+    ]
+
 
 @router.post("", response_model=TestAttemptResponse, status_code=status.HTTP_201_CREATED)
 async def start_test(
@@ -175,6 +241,7 @@ async def start_test(
         user_id=current_user.id,
         test_id=actual_test_id,
         current_module_id=first_module.id if first_module else None,
+        scope=config.scope if config else "full",
     )
 
     # Store config in domain_breakdown JSON field as metadata
@@ -211,37 +278,50 @@ async def list_my_attempts(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     status_filter: AttemptStatus | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
 ):
-    """List current user's test attempts."""
+    """
+    List current user's test attempts, newest first.
+
+    Pass `cursor` (empty for the first page, then `next_cursor`) for keyset
+    pagination; totals are skipped in that mode unless `include_total` is set.
+    Without a cursor, classic page/page_size pagination is used.
+    """
     query = select(TestAttempt).where(TestAttempt.user_id == current_user.id)
 
     if status_filter:
         query = query.where(TestAttempt.status == status_filter)
 
-    count_query = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_query)).scalar() or 0
-
-    query = query.offset((page - 1) * page_size).limit(page_size)
-    query = query.order_by(TestAttempt.started_at.desc())
-    query = query.options(
-        selectinload(TestAttempt.test),
-        selectinload(TestAttempt.module_results)
-    )
+    use_cursor = cursor is not None
+    total = None
+    if not use_cursor or include_total:
+        count_query = select(func.count()).select_from(query.subquery())
+        total = (await db.execute(count_query)).scalar() or 0
+
+    query = query.order_by(TestAttempt.started_at.desc(), TestAttempt.id.desc())
+    if use_cursor:
+        if cursor:
+            started_at, last_id = decode_datetime_cursor(cursor)
+            query = query.where(
+                tuple_(TestAttempt.started_at, TestAttempt.id) < tuple_(started_at, last_id)
+            )
+        # Fetch one extra row to know whether another page exists
+        query = query.limit(page_size + 1)
+    else:
+        query = query.offset((page - 1) * page_size).limit(page_size)
+    query = query.options(selectinload(TestAttempt.test))
 
     result = await db.execute(query)
-    attempts = result.scalars().all()
+    attempts = list(result.scalars().all())
 
-    items = []
-    for a in attempts:
-        # Calculate total time spent across all modules
-        total_time = sum(
-            (mr.time_spent_seconds or 0) for mr in a.module_results
-        )
-        
-        # Extract scope from metadata
-        scope = (a.domain_breakdown or {}).get("_config", {}).get("scope", "full")
-        
-        items.append(TestAttemptResponse(
+    next_cursor = None
+    if use_cursor and len(attempts) > page_size:
+        attempts = attempts[:page_size]
+        next_cursor = encode_cursor(attempts[-1].started_at, attempts[-1].id)
+
+    items = [
+        TestAttemptResponse(
             id=a.id,
             test_id=a.test_id,
             test_title=a.test.title,
@@ -251,33 +331,34 @@ async def list_my_attempts(
             current_module_id=a.current_module_id,
             current_question_number=a.current_question_number,
             total_score=a.total_score,
-            time_spent_seconds=total_time,
-            scope=scope,
-        ))
+            time_spent_seconds=a.total_time_seconds,
+            scope=a.scope,
+        )
+        for a in attempts
+    ]
 
     return AttemptListResponse(
         items=items,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=(total + page_size - 1) // page_size,
+        total_pages=(total + page_size - 1) // page_size if total is not None else None,
+        next_cursor=next_cursor,
     )
 
 
 @router.get("/{attempt_id}", response_model=TestAttemptDetailResponse)
 async def get_attempt(
     attempt_id: int,
+    request: Request,
+    response: Response,
     current_user: ActiveUser,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Get attempt details with domain breakdown."""
     result = await db.execute(
         select(TestAttempt)
-        .options(
-            selectinload(TestAttempt.test).selectinload(Test.modules),
-            selectinload(TestAttempt.module_results),
-            selectinload(TestAttempt.answers),
-        )
+        .options(selectinload(TestAttempt.test))
         .where(TestAttempt.id == attempt_id, TestAttempt.user_id == current_user.id)
     )
     attempt = result.scalar_one_or_none()
@@ -285,64 +366,64 @@ async def get_attempt(
     if not attempt:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attempt not found")
 
-    # Calculate domain breakdown from answers
-    domain_breakdown = []
-    if attempt.status == AttemptStatus.COMPLETED and attempt.answers:
-        # Get all question IDs from this attempt
-        question_ids = [a.question_id for a in attempt.answers]
+    summary = await AttemptSummaryService(db).get_or_build(attempt)
 
-        # Fetch questions with their domains
-        questions_result = await db.execute(
-            select(Question).where(Question.id.in_(question_ids))
+    if summary:
+        etag = _summary_etag(summary)
+        if _not_modified(request, response, etag, FINISHED_DETAIL_CACHE_CONTROL):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers)
+            )
+        module_results = summary.module_results
+    else:
+        # In progress - module results are still changing, read them live
+        result = await db.execute(
+            select(ModuleResult, TestModule)
+            .join(TestModule, TestModule.id == ModuleResult.module_id)
+            .where(ModuleResult.attempt_id == attempt.id)
         )
-        questions = {q.id: q for q in questions_result.scalars().all()}
-
-        # Group answers by domain
-        domain_stats: dict[str, dict] = {}
-        for answer in attempt.answers:
-            question = questions.get(answer.question_id)
-            if question and question.domain:
-                domain_key = question.domain.value
-                if domain_key not in domain_stats:
-                    domain_stats[domain_key] = {"correct": 0, "total": 0}
-                domain_stats[domain_key]["total"] += 1
-                if answer.is_correct:
-                    domain_stats[domain_key]["correct"] += 1
-
-        # Convert to DomainBreakdown list
-        from app.models.enums import QuestionDomain
-        for domain_key, stats in domain_stats.items():
+        module_results = [
+            {
+                "module_id": mr.module_id,
+                "section": module.section,
+                "module_type": module.module,
+                "correct_count": mr.correct_count,
+                "total_count": mr.total_count,
+                "time_spent_seconds": mr.time_spent_seconds,
+                "next_module_difficulty": mr.next_module_difficulty,
+            }
+            for mr, module in result.all()
+        ]
+
+    # Domain breakdown from answered questions
+    domain_breakdown = []
+    if attempt.status == AttemptStatus.COMPLETED and summary:
+        for domain_key, stats in summary.domain_breakdown.items():
             try:
                 domain_enum = QuestionDomain(domain_key)
-                percentage = (stats["correct"] / stats["total"] * 100) if stats["total"] > 0 else 0
-                domain_breakdown.append(DomainBreakdown(
-                    domain=domain_enum,
-                    correct=stats["correct"],
-                    total=stats["total"],
-                    percentage=round(percentage, 1)
-                ))
             except ValueError:
-                pass  # Skip invalid domain values
-
-    # Build module results
-    module_results_response = []
-    for mr in attempt.module_results:
-        # Get module info
-        module_result = await db.execute(
-            select(TestModule).where(TestModule.id == mr.module_id)
-        )
-        module = module_result.scalar_one_or_none()
-        if module:
-            module_results_response.append(ModuleResultResponse(
-                module_id=mr.module_id,
-                section=module.section,
-                module_type=module.module,
-                correct_count=mr.correct_count,
-                total_count=mr.total_count,
-                time_spent_seconds=mr.time_spent_seconds,
-                next_module_difficulty=mr.next_module_difficulty
+                continue  # Skip invalid domain values
+            percentage = (stats["correct"] / stats["total"] * 100) if stats["total"] > 0 else 0
+            domain_breakdown.append(DomainBreakdown(
+                domain=domain_enum,
+                correct=stats["correct"],
+                total=stats["total"],
+                percentage=round(percentage, 1)
             ))
 
+    module_results_response = [
+        ModuleResultResponse(
+            module_id=mr["module_id"],
+            section=mr["section"],
+            module_type=mr["module_type"],
+            correct_count=mr["correct_count"],
+            total_count=mr["total_count"],
+            time_spent_seconds=mr["time_spent_seconds"],
+            next_module_difficulty=mr["next_module_difficulty"],
+        )
+        for mr in module_results
+    ]
+
     return TestAttemptDetailResponse(
         id=attempt.id,
         test_id=attempt.test_id,
@@ -360,7 +441,7 @@ async def get_attempt(
         percentile=attempt.percentile,
         domain_breakdown=domain_breakdown if domain_breakdown else None,
         module_results=module_results_response,
-        scope=(attempt.domain_breakdown or {}).get("_config", {}).get("scope", "full")
+        scope=attempt.scope
     )
 
 
@@ -440,27 +521,140 @@ async def get_current_module(
     )
 
 
+@router.put("/{attempt_id}/autosave")
+async def autosave_answers(
+    attempt_id: int,
+    data: AutosaveRequest,
+    current_user: ActiveUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """
+    Buffer answers for the current module without writing to the database.
+
+    Send only the questions that changed. Buffered answers are merged into
+    the module on submit and flushed to the attempt periodically.
+    """
+    autosave = AutosaveService(get_cache())
+
+    # The buffer remembers the attempt it was validated against, so repeat
+    # saves within a module skip the database entirely
+    meta = await autosave.get_meta(attempt_id)
+    if (
+        not meta
+        or meta["user_id"] != current_user.id
+        or meta["module_id"] != data.module_id
+    ):
+        result = await db.execute(
+            select(TestAttempt.current_module_id).where(
+                TestAttempt.id == attempt_id,
+                TestAttempt.user_id == current_user.id,
+                TestAttempt.status == AttemptStatus.IN_PROGRESS,
+            )
+        )
+        row = result.one_or_none()
+
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Active attempt not found"
+            )
+
+        if meta and meta["module_id"] != row.current_module_id:
+            # Left over from a module that has since been submitted
+            await autosave.clear(attempt_id)
+        meta = {"user_id": current_user.id, "module_id": row.current_module_id}
+
+    if data.module_id != meta["module_id"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Module does not match current module",
+        )
+
+    await autosave.save(attempt_id, meta, [a.model_dump() for a in data.answers])
+
+    return {"message": "Answers saved", "saved_count": len(data.answers)}
+
+
+@router.get("/{attempt_id}/autosave", response_model=AutosaveResponse)
+async def get_autosaved_answers(
+    attempt_id: int,
+    current_user: ActiveUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Get buffered answers for the current module, e.g. to resume after a reconnect."""
+    buffered = await AutosaveService(get_cache()).load(attempt_id)
+
+    if not buffered or buffered["user_id"] != current_user.id:
+        result = await db.execute(
+            select(TestAttempt).where(
+                TestAttempt.id == attempt_id,
+                TestAttempt.user_id == current_user.id,
+                TestAttempt.status == AttemptStatus.IN_PROGRESS,
+            )
+        )
+        attempt = result.scalar_one_or_none()
+
+        if not attempt:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Active attempt not found"
+            )
+
+        # Fall back to the last flushed snapshot (e.g. after a cache restart)
+        buffered = snapshot_state(attempt)
+        if not buffered or buffered["module_id"] != attempt.current_module_id:
+            return AutosaveResponse(module_id=attempt.current_module_id)
+
+    return AutosaveResponse(
+        module_id=buffered["module_id"],
+        answers=[
+            SubmitAnswerRequest(question_id=question_id, **saved)
+            for question_id, saved in buffered["answers"].items()
+        ],
+    )
+
+
 @router.post("/{attempt_id}/submit-module")
 async def submit_module(
     attempt_id: int,
     data: SubmitModuleRequest,
     current_user: ActiveUser,
     db: Annotated[AsyncSession, Depends(get_db)],
+    idempotency_key: Annotated[str | None, Header(max_length=255)] = None,
 ):
-    """Submit answers for a module and move to next or complete test."""
-    # Get attempt
+    """
+    Submit answers for a module and move to next or complete test.
+
+    Send an Idempotency-Key header to make retries safe: a repeated key
+    replays the stored response instead of scoring the module again.
+    """
+    cache = get_cache()
+    cache_key = (
+        _submit_idempotency_key(current_user.id, attempt_id, idempotency_key)
+        if idempotency_key else None
+    )
+    if cache_key:
+        stored = await cache.get_json(cache_key)
+        if stored is not None:
+            return stored
+
+    # Lock the attempt so concurrent submits of the same module serialize
     result = await db.execute(
         select(TestAttempt)
         .options(selectinload(TestAttempt.test).selectinload(Test.modules))
         .where(
             TestAttempt.id == attempt_id,
             TestAttempt.user_id == current_user.id,
-            TestAttempt.status == AttemptStatus.IN_PROGRESS,
         )
+        .with_for_update()
     )
     attempt = result.scalar_one_or_none()
 
-    if not attempt:
+    if cache_key:
+        # A request with the same key may have finished while we waited
+        stored = await cache.get_json(cache_key)
+        if stored is not None:
+            return stored
+
+    if not attempt or attempt.status != AttemptStatus.IN_PROGRESS:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Active attempt not found")
 
     # Verify module belongs to this test
@@ -481,12 +675,19 @@ async def submit_module(
     if not module:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found")
 
+    # Answers autosaved during the module fill in anything the client lost
+    autosave = AutosaveService(cache)
+    buffered = await autosave.load(attempt_id) or snapshot_state(attempt)
+    answers = _merge_autosaved(data.answers, buffered, data.module_id)
+
     # Score the answers
     correct_count = 0
     total_count = len(module.questions)
     question_map = {q.id: q for q in module.questions}
+    answered_correctly: dict[int, bool] = {}
+    domain_results: list[tuple[str, str, bool]] = []
 
-    for answer_data in data.answers:
+    for answer_data in answers:
         question = question_map.get(answer_data.question_id)
         if not question:
             continue
@@ -502,6 +703,9 @@ async def submit_module(
             correct_count += 1
             question.times_correct += 1
         question.times_answered += 1
+        answered_correctly[question.id] = is_correct
+        if question.domain:
+            domain_results.append((question.domain.value, module.section.value, is_correct))
 
         # Save answer
         attempt_answer = AttemptAnswer(
@@ -526,25 +730,42 @@ async def submit_module(
 
     # Determine next module difficulty for adaptive testing (Module 1 -> Module 2)
     if module.module.value == "module_1":
-        # Calculate performance percentage
-        performance = correct_count / total_count if total_count > 0 else 0
+        items = [item_parameters(q) for q in module.questions]
 
-        if performance >= 0.7:
-            module_result.next_module_difficulty = ModuleDifficulty.HARDER
-        elif performance <= 0.4:
-            module_result.next_module_difficulty = ModuleDifficulty.EASIER
+        if items and all(items):
+            # Route on IRT ability estimate; unanswered questions count as wrong
+            ability = estimate_ability(
+                (item, answered_correctly.get(q.id, False))
+                for q, item in zip(module.questions, items)
+            )
+            if ability.theta >= settings.irt_harder_theta:
+                module_result.next_module_difficulty = ModuleDifficulty.HARDER
+            elif ability.theta <= settings.irt_easier_theta:
+                module_result.next_module_difficulty = ModuleDifficulty.EASIER
+            else:
+                module_result.next_module_difficulty = ModuleDifficulty.STANDARD
         else:
-            module_result.next_module_difficulty = ModuleDifficulty.STANDARD
+            # Module not calibrated yet - fall back to percentage correct
+            performance = correct_count / total_count if total_count > 0 else 0
+
+            if performance >= 0.7:
+                module_result.next_module_difficulty = ModuleDifficulty.HARDER
+            elif performance <= 0.4:
+                module_result.next_module_difficulty = ModuleDifficulty.EASIER
+            else:
+                module_result.next_module_difficulty = ModuleDifficulty.STANDARD
 
     db.add(module_result)
 
+    # Keep list columns current without re-aggregating module results
+    attempt.total_time_seconds += data.time_spent_seconds or 0
+    attempt.question_count += total_count
+
     # Determine next module or complete test
     current_section = module.section
     current_module_num = module.module
     
-    # Check scope from metadata
-    config = (attempt.domain_breakdown or {}).get("_config", {})
-    scope = config.get("scope", "full")
+    scope = attempt.scope
 
     next_module = None
 
@@ -606,6 +827,15 @@ async def submit_module(
                 )
                 next_module = result.scalar_one_or_none()
 
+    attempt.autosave_snapshot = None
+
+    analytics_service = AnalyticsService(db)
+    await analytics_service.record_domain_results(current_user.id, domain_results)
+    await ReviewService(db).enqueue_missed(
+        current_user.id, [qid for qid, is_correct in answered_correctly.items() if not is_correct]
+    )
+    await analytics_service.record_activity(current_user.id)
+
     if next_module:
         attempt.current_module_id = next_module.id
         attempt.current_question_number = 1
@@ -714,8 +944,14 @@ async def submit_module(
             if attempt.total_score < 400:
                 attempt.total_score = 400
 
+        # Percentile against the live platform distribution; the attempt is
+        # added to it just before commit
+        attempt.percentile = await ScoreDistributionService(db).get_attempt_percentile(attempt)
+
+        # Materialize the read-side summary while everything is in the session
+        await AttemptSummaryService(db).build(attempt)
+
         # Update analytics
-        analytics_service = AnalyticsService(db)
         await analytics_service.record_score_history(attempt)
         await analytics_service.update_student_analytics(current_user.id)
 
@@ -723,7 +959,7 @@ async def submit_module(
     module_domain_stats: dict[str, dict] = {}
     question_results = []
     
-    for answer_data in data.answers:
+    for answer_data in answers:
         question = question_map.get(answer_data.question_id)
         if not question:
             continue
@@ -761,7 +997,7 @@ async def submit_module(
             "accuracy": round(accuracy, 1)
         })
 
-    return {
+    response = {
         "status": attempt.status.value,
         "module_score": {"correct": correct_count, "total": total_count},
         "section": module.section.value,
@@ -773,6 +1009,43 @@ async def submit_module(
         "total_score": attempt.total_score,
     }
 
+    # Store the replay before commit releases the lock, so a waiting retry
+    # with the same key finds it
+    if cache_key:
+        await cache.set_json(cache_key, response, ttl=settings.idempotency_ttl_seconds)
+    if attempt.status == AttemptStatus.COMPLETED:
+        # Last writes: these shared rollup rows stay locked until commit
+        await OrgAnalyticsService(db).record_attempt(attempt)
+        await ScoreDistributionService(db).add_attempt(attempt)
+    try:
+        await db.commit()
+    except Exception:
+        if cache_key:
+            await cache.delete(cache_key)
+        raise
+
+    # The submit is committed, so these must not turn it into an error.
+    # Each is best effort: a leftover autosave buffer expires (flushes skip
+    # finished attempts), and the nightly leaderboard rebuild recovers a
+    # missed board update.
+    try:
+        # The buffer is only dropped once its answers are durably stored
+        await autosave.clear(attempt_id)
+    except Exception:
+        logger.exception("Failed to clear the autosave buffer of attempt %s", attempt_id)
+    try:
+        await RecommendationService(db, cache).mark_stale(current_user.id)
+    except Exception:
+        logger.exception("Failed to mark recommendations stale for user %s", current_user.id)
+
+    if attempt.status == AttemptStatus.COMPLETED:
+        try:
+            await LeaderboardService(db, cache).record_attempt(attempt)
+        except Exception:
+            logger.exception("Failed to add attempt %s to the leaderboards", attempt_id)
+
+    return response
+
 
 @router.post("/{attempt_id}/abandon")
 async def abandon_attempt(
@@ -795,6 +1068,8 @@ async def abandon_attempt(
 
     attempt.status = AttemptStatus.ABANDONED
     attempt.completed_at = datetime.now(UTC)
+    attempt.autosave_snapshot = None
+    await AutosaveService(get_cache()).clear(attempt_id)
 
     return {"message": "Attempt abandoned"}
 
@@ -802,6 +1077,8 @@ async def abandon_attempt(
 @router.get("/{attempt_id}/review", response_model=AttemptReviewResponse)
 async def get_attempt_review(
     attempt_id: int,
+    request: Request,
+    response: Response,
     current_user: ActiveUser,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
@@ -809,14 +1086,9 @@ async def get_attempt_review(
     Get full review of a completed attempt with all questions, correct answers,
     user answers, and explanations.
     """
-    # Get the attempt with all related data
     result = await db.execute(
         select(TestAttempt)
-        .options(
-            selectinload(TestAttempt.test).selectinload(Test.modules).selectinload(TestModule.questions).selectinload(Question.passage),
-            selectinload(TestAttempt.answers),
-            selectinload(TestAttempt.module_results),
-        )
+        .options(selectinload(TestAttempt.test))
         .where(
             TestAttempt.id == attempt_id,
             TestAttempt.user_id == current_user.id,
@@ -833,95 +1105,87 @@ async def get_attempt_review(
             detail="Can only review completed or abandoned attempts"
         )
 
-    # Create a map of user answers by question_id
-    user_answers = {a.question_id: a for a in attempt.answers}
-
-    # Get module IDs that were actually used in this attempt
-    used_module_ids = {mr.module_id for mr in attempt.module_results}
-
-    # Build module review data
-    modules_review = []
-    total_correct = 0
-    total_questions = 0
-    domain_stats: dict[str, dict] = {}
+    summary = await AttemptSummaryService(db).get_or_build(attempt)
 
-    # Sort modules by section then order
-    section_order = {'reading_writing': 0, 'math': 1}
-    sorted_modules = sorted(
-        [m for m in attempt.test.modules if m.id in used_module_ids],
-        key=lambda m: (section_order.get(m.section.value, 99), m.order_index)
+    # Question content is editable, so it is read live - but only for the modules taken
+    result = await db.execute(
+        select(Question)
+        .options(selectinload(Question.passage))
+        .where(Question.id.in_([q["id"] for q in summary.questions]))
     )
+    questions = {q.id: q for q in result.scalars().all()}
 
-    for module in sorted_modules:
-        questions_review = []
-        sorted_questions = sorted(module.questions, key=lambda q: q.question_number)
+    # Content edits must invalidate the review too
+    content_version = max(
+        (int(q.updated_at.timestamp()) for q in questions.values() if q.updated_at), default=0
+    )
+    etag = _summary_etag(summary, content_version)
+    if _not_modified(request, response, etag, FINISHED_REVIEW_CACHE_CONTROL):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers))
 
-        for question in sorted_questions:
-            user_answer = user_answers.get(question.id)
-            is_correct = user_answer.is_correct if user_answer else None
-            answer_value = user_answer.answer if user_answer else None
+    questions_by_module: dict[int, list[QuestionReviewView]] = {}
+    for entry in summary.questions:
+        question = questions.get(entry["id"])
+        if not question:
+            continue  # Deleted since the attempt
+
+        # Build passage response if exists
+        passage_data = None
+        if question.passage:
+            passage_data = PassageResponse(
+                id=question.passage.id,
+                title=question.passage.title,
+                content=question.passage.content,
+                source=question.passage.source,
+                author=question.passage.author,
+                word_count=question.passage.word_count,
+                figures=question.passage.figures,
+                genre=question.passage.genre,
+                topic_tags=question.passage.topic_tags,
+                created_at=question.passage.created_at,
+                updated_at=question.passage.updated_at
+            )
 
-            # Track stats
-            total_questions += 1
-            if is_correct:
-                total_correct += 1
-
-            # Track domain stats
-            if question.domain:
-                domain_key = question.domain.value
-                if domain_key not in domain_stats:
-                    domain_stats[domain_key] = {"correct": 0, "total": 0}
-                domain_stats[domain_key]["total"] += 1
-                if is_correct:
-                    domain_stats[domain_key]["correct"] += 1
-
-            # Build passage response if exists
-            passage_data = None
-            if question.passage:
-                from app.schemas.test import PassageResponse
-                passage_data = PassageResponse(
-                    id=question.passage.id,
-                    title=question.passage.title,
-                    content=question.passage.content,
-                    source=question.passage.source,
-                    author=question.passage.author,
-                    word_count=question.passage.word_count,
-                    figures=question.passage.figures,
-                    genre=question.passage.genre,
-                    topic_tags=question.passage.topic_tags,
-                    created_at=question.passage.created_at,
-                    updated_at=question.passage.updated_at
-                )
+        questions_by_module.setdefault(entry["module_id"], []).append(QuestionReviewView(
+            id=question.id,
+            question_number=question.question_number,
+            question_text=question.question_text,
+            question_type=question.question_type,
+            question_image_url=question.question_image_url,
+            question_image_alt=question.question_image_alt,
+            options=question.options,
+            answer_constraints=question.answer_constraints,
+            passage=passage_data,
+            correct_answer=question.correct_answer,
+            explanation=question.explanation,
+            explanation_image_url=question.explanation_image_url,
+            user_answer=entry["answer"],
+            is_correct=entry["is_correct"],
+            domain=question.domain,
+            difficulty=question.difficulty,
+            time_spent_seconds=entry["time_spent_seconds"]
+        ))
 
-            questions_review.append(QuestionReviewView(
-                id=question.id,
-                question_number=question.question_number,
-                question_text=question.question_text,
-                question_type=question.question_type,
-                question_image_url=question.question_image_url,
-                question_image_alt=question.question_image_alt,
-                options=question.options,
-                answer_constraints=question.answer_constraints,
-                passage=passage_data,
-                correct_answer=question.correct_answer,
-                explanation=question.explanation,
-                explanation_image_url=question.explanation_image_url,
-                user_answer=answer_value,
-                is_correct=is_correct,
-                domain=question.domain,
-                difficulty=question.difficulty,
-                time_spent_seconds=user_answer.time_spent_seconds if user_answer else None
-            ))
+    modules_review = [
+        ModuleReviewResponse(
+            module_id=mr["module_id"],
+            section=mr["section"],
+            module_type=mr["module_type"],
+            difficulty=mr["difficulty"],
+            questions=questions_by_module.get(mr["module_id"], [])
+        )
+        for mr in summary.module_results
+    ]
 
-        modules_review.append(ModuleReviewResponse(
-            module_id=module.id,
-            section=module.section.value,
-            module_type=module.module.value,
-            difficulty=module.difficulty.value,
-            questions=questions_review
-        ))
+    # Build summary with domain breakdown over all questions in the modules taken
+    domain_stats: dict[str, dict] = {}
+    for entry in summary.questions:
+        if entry["domain"]:
+            stats = domain_stats.setdefault(entry["domain"], {"correct": 0, "total": 0})
+            stats["total"] += 1
+            if entry["is_correct"]:
+                stats["correct"] += 1
 
-    # Build summary with domain breakdown
     domain_breakdown = {}
     for domain_key, stats in domain_stats.items():
         accuracy = (stats["correct"] / stats["total"] * 100) if stats["total"] > 0 else 0
@@ -931,7 +1195,9 @@ async def get_attempt_review(
             "accuracy": round(accuracy, 1)
         }
 
-    summary = {
+    total_correct = summary.total_correct
+    total_questions = summary.total_questions
+    review_summary = {
         "total_correct": total_correct,
         "total_questions": total_questions,
         "accuracy": round((total_correct / total_questions * 100) if total_questions > 0 else 0, 1),
@@ -949,7 +1215,7 @@ async def get_attempt_review(
         reading_writing_scaled_score=attempt.reading_writing_scaled_score,
         math_scaled_score=attempt.math_scaled_score,
         modules=modules_review,
-        summary=summary
+        summary=review_summary
     )
 
 
@@ -1026,5 +1292,6 @@ async def delete_attempt(
 
     await db.delete(attempt)
     await db.commit()
+    await AutosaveService(get_cache()).clear(attempt_id)
 
     return {"message": "Attempt deleted successfully"}
@@ -16,6 +16,7 @@ from app.schemas import (
     UserResponse,
 )
 from app.services.auth_service import AuthService
+from app.services.user_cache_service import invalidate_user
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -65,6 +66,9 @@ async def login(
         user_agent=request.headers.get("user-agent"),
         ip_address=request.client.host if request.client else None,
     )
+    # Login updated last_login_at
+    await auth_service.db.commit()
+    await invalidate_user(user.id)
 
     # Set refresh token as HTTP-only cookie
     response.set_cookie(
@@ -179,6 +183,9 @@ async def change_password(
             detail="Current password is incorrect",
         )
 
+    await auth_service.db.commit()
+    await invalidate_user(current_user.id)
+
     return MessageResponse(message="Password changed successfully")
 
 
@@ -189,4 +196,6 @@ async def logout_all_devices(
 ):
     """Logout from all devices by revoking all refresh tokens."""
     count = await auth_service.revoke_all_user_tokens(current_user.id)
+    await auth_service.db.commit()
+    await invalidate_user(current_user.id)
     return MessageResponse(message=f"Logged out from {count} device(s)")
@@ -24,6 +24,7 @@ from app.schemas import (
     ContentUpdate,
     ContentWithProgressResponse,
 )
+from app.services.analytics_service import AnalyticsService
 
 router = APIRouter(prefix="/content", tags=["Content"])
 
@@ -241,6 +242,8 @@ async def update_progress(
         progress.completed_at = datetime.now(UTC)
         progress.progress_percent = 100
 
+    await AnalyticsService(db).record_activity(current_user.id)
+
     await db.flush()
 
     return ContentProgressResponse(
@@ -8,11 +8,14 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import get_cache
 from app.core.database import get_db
 from app.core.deps import ActiveUser
 from app.models.enums import QuestionDomain, QuestionDifficulty, SATSection
 from app.models.test import Question, TestModule, Passage
 from app.services.analytics_service import AnalyticsService
+from app.services.recommendation_service import RecommendationService
+from app.services.review_service import ReviewService
 
 
 router = APIRouter(prefix="/drills", tags=["Drills"])
@@ -63,6 +66,8 @@ class DrillAnswer(BaseModel):
 class DrillSubmitRequest(BaseModel):
     """Request to submit drill answers."""
     answers: list[DrillAnswer]
+    time_spent_seconds: int = Field(default=0, ge=0)
+    is_review: bool = False  # Answers reschedule the review queue
 
 
 class DrillQuestionResult(BaseModel):
@@ -83,6 +88,7 @@ class DrillQuestionResult(BaseModel):
 
 class DrillResult(BaseModel):
     """Result summary for a completed drill."""
+    drill_attempt_id: int
     total_questions: int
     correct_count: int
     accuracy: float
@@ -90,6 +96,49 @@ class DrillResult(BaseModel):
     questions: list[DrillQuestionResult]
 
 
+def _drill_session(
+    user_id: int,
+    questions: list[Question],
+    section: str | None = None,
+    domains: list[str] | None = None,
+    difficulty: str | None = None,
+) -> DrillSession:
+    """Build the student view of a drill from its questions, in order."""
+    drill_id = f"drill_{user_id}_{int(datetime.now(UTC).timestamp())}"
+    
+    drill_questions = []
+    for i, q in enumerate(questions, 1):
+        passage_data = None
+        if q.passage:
+            passage_data = {
+                "id": q.passage.id,
+                "content": q.passage.content,
+                "title": q.passage.title,
+                "source": q.passage.source,
+            }
+        
+        drill_questions.append(DrillQuestionView(
+            id=q.id,
+            question_number=i,
+            question_text=q.question_text,
+            question_type=q.question_type.value,
+            question_image_url=q.question_image_url,
+            options=q.options,
+            passage=passage_data,
+            domain=q.domain.value if q.domain else None,
+            difficulty=q.difficulty.value if q.difficulty else None,
+        ))
+    
+    return DrillSession(
+        drill_id=drill_id,
+        question_count=len(drill_questions),
+        questions=drill_questions,
+        section=section,
+        domains=domains,
+        difficulty=difficulty,
+    )
+
+
 @router.post("/create", response_model=DrillSession)
 async def create_drill(
     config: DrillConfig,
@@ -151,39 +200,8 @@ async def create_drill(
             detail="Not enough questions match your criteria. Try broadening your filters."
         )
     
-    # Build drill session
-    drill_id = f"drill_{current_user.id}_{int(datetime.now(UTC).timestamp())}"
-    
-    drill_questions = []
-    for i, q in enumerate(questions, 1):
-        passage_data = None
-        if q.passage:
-            passage_data = {
-                "id": q.passage.id,
-                "content": q.passage.content,
-                "title": q.passage.title,
-                "source": q.passage.source,
-            }
-        
-        drill_questions.append(DrillQuestionView(
-            id=q.id,
-            question_number=i,
-            question_text=q.question_text,
-            question_type=q.question_type.value,
-            question_image_url=q.question_image_url,
-            options=q.options,
-            passage=passage_data,
-            domain=q.domain.value if q.domain else None,
-            difficulty=q.difficulty.value if q.difficulty else None,
-        ))
-    
-    return DrillSession(
-        drill_id=drill_id,
-        question_count=len(drill_questions),
-        questions=drill_questions,
-        section=config.section,
-        domains=config.domains,
-        difficulty=config.difficulty,
+    return _drill_session(
+        current_user.id, questions, config.section, config.domains, config.difficulty
     )
 
 
@@ -208,7 +226,7 @@ async def submit_drill(
     # Fetch questions with correct answers
     result = await db.execute(
         select(Question)
-        .options(selectinload(Question.passage))
+        .options(selectinload(Question.passage), selectinload(Question.module))
         .where(Question.id.in_(question_ids))
     )
     questions = {q.id: q for q in result.scalars().all()}
@@ -216,6 +234,9 @@ async def submit_drill(
     # Score answers
     correct_count = 0
     domain_stats: dict[str, dict] = {}
+    domain_results: list[tuple[str, str, bool]] = []
+    skill_stats: dict[str, list[int]] = {}
+    responses: list[list] = []
     question_results = []
     
     for i, answer in enumerate(data.answers, 1):
@@ -238,6 +259,12 @@ async def submit_drill(
             domain_stats[domain_key]["total"] += 1
             if is_correct:
                 domain_stats[domain_key]["correct"] += 1
+            domain_results.append((domain_key, question.module.section.value, is_correct))
+        for skill in dict.fromkeys(question.skill_tags or []):
+            stats = skill_stats.setdefault(skill, [0, 0])
+            stats[0] += 1
+            stats[1] += int(is_correct)
+        responses.append([question.id, answer.answer, is_correct])
         
         question_results.append(DrillQuestionResult(
             id=question.id,
@@ -268,14 +295,27 @@ async def submit_drill(
     total = len(question_results)
     accuracy = (correct_count / total * 100) if total > 0 else 0
     
-    # Update analytics (optional - track drill performance)
-    try:
-        analytics_service = AnalyticsService(db)
-        await analytics_service.update_student_analytics(current_user.id)
-    except Exception:
-        pass  # Non-critical
-    
+    # Fold the drill into analytics incrementally; no full recompute
+    analytics_service = AnalyticsService(db)
+    drill = await analytics_service.record_drill(
+        current_user.id,
+        responses,
+        {key: [stats["total"], stats["correct"]] for key, stats in domain_stats.items()},
+        skill_stats,
+        data.time_spent_seconds,
+    )
+    await analytics_service.record_domain_results(current_user.id, domain_results)
+    await analytics_service.record_activity(current_user.id)
+    if data.is_review:
+        await ReviewService(db).record_reviews(
+            current_user.id, {question_id: is_correct for question_id, _, is_correct in responses}
+        )
+    await db.flush()
+
+    await RecommendationService(db, get_cache()).mark_stale(current_user.id)
+
     return DrillResult(
+        drill_attempt_id=drill.id,
         total_questions=total,
         correct_count=correct_count,
         accuracy=round(accuracy, 1),
@@ -291,30 +331,49 @@ async def get_weak_area_drill(
     question_count: int = Query(10, ge=5, le=30),
 ):
     """
-    Generate a drill from the user's weakest domains based on analytics.
+    Generate a drill from the user's precomputed weak-area recommendations.
     """
-    # Get user's weak domains from analytics
-    analytics_service = AnalyticsService(db)
-    analytics = await analytics_service.get_student_analytics(current_user.id)
-    
-    weak_domains = []
-    if analytics and analytics.domain_performance:
-        # Get domains with accuracy < 60%
-        for domain, stats in analytics.domain_performance.items():
-            if isinstance(stats, dict) and stats.get("accuracy", 100) < 60:
-                weak_domains.append(domain)
-    
-    if not weak_domains:
-        # No weak areas identified, get a general mix
-        weak_domains = None
-    
-    # Create drill with weak domains
-    config = DrillConfig(
-        domains=weak_domains,
-        question_count=question_count,
+    question_ids = await RecommendationService(db, get_cache()).take(
+        current_user.id, question_count
     )
-    
-    return await create_drill(config, current_user, db)
+
+    result = await db.execute(
+        select(Question)
+        .options(selectinload(Question.passage))
+        .where(Question.id.in_(question_ids))
+    )
+    by_id = {q.id: q for q in result.scalars().all()}
+    questions = [by_id[question_id] for question_id in question_ids if question_id in by_id]
+
+    if len(questions) < 5:
+        # Too little history or an exhausted list - fall back to a general mix
+        return await create_drill(DrillConfig(question_count=question_count), current_user, db)
+
+    domains = sorted({q.domain.value for q in questions if q.domain})
+    return _drill_session(current_user.id, questions, domains=domains)
+
+
+@router.get("/review", response_model=DrillSession)
+async def get_review_drill(
+    current_user: ActiveUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    question_count: int = Query(10, ge=1, le=50),
+):
+    """
+    Drill of previously missed questions that are due for review.
+    Submit it with is_review=true so the answers reschedule the queue.
+    """
+    items = await ReviewService(db).due(current_user.id, question_count)
+
+    result = await db.execute(
+        select(Question)
+        .options(selectinload(Question.passage))
+        .where(Question.id.in_([item.question_id for item in items]))
+    )
+    by_id = {q.id: q for q in result.scalars().all()}
+    questions = [by_id[item.question_id] for item in items if item.question_id in by_id]
+
+    return _drill_session(current_user.id, questions)
 
 
 @router.get("/domains")
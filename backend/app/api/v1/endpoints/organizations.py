@@ -2,12 +2,13 @@
 Organization endpoints for learning centers, schools, and tutoring companies.
 """
 
+import csv
 from datetime import UTC, datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
 from pydantic import BaseModel, Field
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, insert, literal, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -20,11 +21,17 @@ from app.models import (
     ClassStudent,
     Organization,
     OrganizationMember,
+    RosterImport,
     StudentAssignment,
     TestAttempt,
     User,
 )
 from app.models.enums import AttemptStatus
+from app.services.membership_service import get_memberships, invalidate_memberships
+from app.services.org_analytics_service import OrgAnalyticsService
+from app.services.roster_import_service import MAX_ROWS, parse_csv
+from app.services.roster_service import get_class_roster
+from app.tasks.organization_tasks import process_roster_import
 
 router = APIRouter(prefix="/organizations", tags=["Organizations"])
 
@@ -72,6 +79,25 @@ class AssignmentCreate(BaseModel):
     max_attempts: int | None = None
 
 
+class AssignmentSubmit(BaseModel):
+    test_attempt_id: int | None = None
+
+
+class RosterImportRow(BaseModel):
+    email: str = Field(max_length=255)
+    grade_level: int | None = None
+    target_score: int | None = None
+    parent_name: str | None = None
+    parent_email: str | None = None
+    parent_phone: str | None = None
+
+
+class RosterImportCreate(BaseModel):
+    rows: list[RosterImportRow] = Field(min_length=1, max_length=MAX_ROWS)
+    class_id: int | None = None
+    role: str = "student"
+
+
 # === Organization Endpoints ===
 
 
@@ -134,6 +160,9 @@ async def create_organization(
         role="owner",
     )
     db.add(membership)
+    await OrgAnalyticsService(db).record_member(org.id, current_user.id, "owner")
+    await db.commit()
+    await invalidate_memberships(db, current_user.id)
 
     return {"id": org.id, "slug": org.slug, "message": "Organization created"}
 
@@ -145,17 +174,9 @@ async def get_organization(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Get organization details."""
-    # Verify membership
-    result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == org_id,
-            OrganizationMember.user_id == current_user.id,
-            OrganizationMember.is_active == True,  # noqa: E712
-        )
-    )
-    membership = result.scalar_one_or_none()
+    role = (await get_memberships(db, current_user.id)).get(org_id)
 
-    if not membership:
+    if role is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found")
 
     result = await db.execute(
@@ -188,7 +209,7 @@ async def get_organization(
         "email": org.email,
         "phone": org.phone,
         "address": org.address,
-        "my_role": membership.role,
+        "my_role": role,
         "member_count": member_count.scalar() or 0,
         "class_count": class_count.scalar() or 0,
     }
@@ -299,6 +320,9 @@ async def add_organization_member(
         # Reactivate
         existing.is_active = True
         existing.role = role
+        await OrgAnalyticsService(db).record_member(org_id, user.id, role)
+        await db.commit()
+        await invalidate_memberships(db, user.id)
         return {"message": "Member reactivated"}
 
     membership = OrganizationMember(
@@ -307,6 +331,9 @@ async def add_organization_member(
         role=role,
     )
     db.add(membership)
+    await OrgAnalyticsService(db).record_member(org_id, user.id, role)
+    await db.commit()
+    await invalidate_memberships(db, user.id)
 
     return {"message": "Member added", "user_id": user.id}
 
@@ -321,7 +348,7 @@ async def list_classes(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """List classes in an organization."""
-    membership = await _verify_org_membership(db, org_id, current_user.id)
+    role = await _verify_org_membership(db, org_id, current_user.id)
 
     query = select(Class).where(
         Class.organization_id == org_id,
@@ -329,7 +356,7 @@ async def list_classes(
     )
 
     # Students only see their classes
-    if membership.role == "student":
+    if role == "student":
         query = query.join(ClassStudent).where(
             ClassStudent.student_id == current_user.id,
             ClassStudent.is_active == True,  # noqa: E712
@@ -360,7 +387,7 @@ async def create_class(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Create a class in the organization."""
-    membership = await _verify_org_admin(db, org_id, current_user.id)
+    await _verify_org_admin(db, org_id, current_user.id)
 
     class_ = Class(
         organization_id=org_id,
@@ -369,6 +396,7 @@ async def create_class(
     )
     db.add(class_)
     await db.flush()
+    await OrgAnalyticsService(db).record_class(org_id, class_.id)
 
     return {"id": class_.id, "message": "Class created"}
 
@@ -383,50 +411,7 @@ async def list_class_students(
     """List students in a class with their stats."""
     await _verify_org_admin(db, org_id, current_user.id)
 
-    result = await db.execute(
-        select(ClassStudent, User)
-        .join(User, User.id == ClassStudent.student_id)
-        .where(
-            ClassStudent.class_id == class_id,
-            ClassStudent.is_active == True,  # noqa: E712
-        )
-    )
-    students = result.all()
-
-    # Get stats for each student
-    student_stats = []
-    for cs, user in students:
-        # Get latest test score
-        score_result = await db.execute(
-            select(TestAttempt.total_score)
-            .where(
-                TestAttempt.user_id == user.id,
-                TestAttempt.status == AttemptStatus.COMPLETED,
-            )
-            .order_by(TestAttempt.completed_at.desc())
-            .limit(1)
-        )
-        latest_score = score_result.scalar()
-
-        # Get test count
-        test_count = await db.execute(
-            select(func.count())
-            .where(
-                TestAttempt.user_id == user.id,
-                TestAttempt.status == AttemptStatus.COMPLETED,
-            )
-        )
-
-        student_stats.append({
-            "user_id": user.id,
-            "email": user.email,
-            "full_name": user.full_name,
-            "enrolled_at": cs.enrolled_at.isoformat(),
-            "latest_score": latest_score,
-            "tests_completed": test_count.scalar() or 0,
-        })
-
-    return {"students": student_stats}
+    return {"students": await get_class_roster(db, org_id, class_id)}
 
 
 @router.post("/{org_id}/classes/{class_id}/students")
@@ -470,6 +455,7 @@ async def add_student_to_class(
                 detail="Student is already in this class",
             )
         existing.is_active = True
+        await OrgAnalyticsService(db).record_enrollment(class_id, student_id)
         return {"message": "Student re-added to class"}
 
     enrollment = ClassStudent(
@@ -478,10 +464,81 @@ async def add_student_to_class(
         enrolled_at=datetime.now(UTC),
     )
     db.add(enrollment)
+    await OrgAnalyticsService(db).record_enrollment(class_id, student_id)
 
     return {"message": "Student added to class"}
 
 
+# === Roster Import Endpoints ===
+
+
+@router.post("/{org_id}/imports", status_code=status.HTTP_202_ACCEPTED)
+async def import_roster_csv(
+    org_id: int,
+    current_user: ActiveUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    file: UploadFile = File(...),
+    class_id: int | None = Form(None),
+    role: str = Form("student"),
+):
+    """
+    Bulk-add existing users from a CSV with an `email` column.
+
+    Optional columns: grade_level, target_score, parent_name,
+    parent_email, parent_phone. Rows are processed in the background;
+    poll the returned import for progress and per-row errors.
+    """
+    await _verify_org_admin(db, org_id, current_user.id)
+
+    try:
+        rows = parse_csv(file.file)
+    except (UnicodeDecodeError, csv.Error, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid CSV: {e}")
+
+    return await _start_roster_import(db, org_id, current_user.id, rows, class_id, role)
+
+
+@router.post("/{org_id}/imports/json", status_code=status.HTTP_202_ACCEPTED)
+async def import_roster_json(
+    org_id: int,
+    data: RosterImportCreate,
+    current_user: ActiveUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Bulk-add existing users from JSON rows; processed like a CSV import."""
+    await _verify_org_admin(db, org_id, current_user.id)
+
+    rows = [
+        {"row": number, **row.model_dump(exclude_none=True)}
+        for number, row in enumerate(data.rows, 1)
+    ]
+    return await _start_roster_import(db, org_id, current_user.id, rows, data.class_id, data.role)
+
+
+@router.get("/{org_id}/imports/{import_id}")
+async def get_roster_import(
+    org_id: int,
+    import_id: int,
+    current_user: ActiveUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Get the progress and error report of a roster import."""
+    await _verify_org_admin(db, org_id, current_user.id)
+
+    result = await db.execute(
+        select(RosterImport).where(
+            RosterImport.id == import_id,
+            RosterImport.organization_id == org_id,
+        )
+    )
+    roster_import = result.scalar_one_or_none()
+
+    if not roster_import:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+
+    return _roster_import_response(roster_import)
+
+
 # === Assignment Endpoints ===
 
 
@@ -493,7 +550,7 @@ async def list_assignments(
     class_id: int | None = None,
 ):
     """List assignments."""
-    membership = await _verify_org_membership(db, org_id, current_user.id)
+    role = await _verify_org_membership(db, org_id, current_user.id)
 
     query = select(Assignment).where(
         Assignment.organization_id == org_id,
@@ -504,7 +561,7 @@ async def list_assignments(
         query = query.where(Assignment.class_id == class_id)
 
     # Students see only their assignments
-    if membership.role == "student":
+    if role == "student":
         # Assignments for their classes or directly assigned
         query = query.where(
             (Assignment.class_id.in_(
@@ -520,30 +577,49 @@ async def list_assignments(
             ))
         )
 
+    # The caller's latest submission per assignment, joined in
+    latest_submission = (
+        select(
+            AssignmentSubmission.assignment_id,
+            AssignmentSubmission.status,
+            AssignmentSubmission.grade,
+            func.row_number().over(
+                partition_by=AssignmentSubmission.assignment_id,
+                order_by=(AssignmentSubmission.created_at.desc(), AssignmentSubmission.id.desc()),
+            ).label("recency"),
+        )
+        .where(AssignmentSubmission.student_id == current_user.id)
+        .subquery()
+    )
+    query = (
+        query.add_columns(latest_submission.c.status, latest_submission.c.grade)
+        .outerjoin(
+            latest_submission,
+            and_(
+                latest_submission.c.assignment_id == Assignment.id,
+                latest_submission.c.recency == 1,
+            ),
+        )
+    )
+
     result = await db.execute(query.order_by(Assignment.due_date))
-    assignments = result.scalars().all()
 
-    # Get submission status for each
     assignment_list = []
-    for a in assignments:
-        submission = await db.execute(
-            select(AssignmentSubmission).where(
-                AssignmentSubmission.assignment_id == a.id,
-                AssignmentSubmission.student_id == current_user.id,
-            )
-        )
-        sub = submission.scalar_one_or_none()
-
-        assignment_list.append({
+    for a, submission_status, grade in result.all():
+        item = {
             "id": a.id,
             "title": a.title,
             "description": a.description,
             "assignment_type": a.assignment_type,
             "due_date": a.due_date.isoformat() if a.due_date else None,
             "class_id": a.class_id,
-            "submission_status": sub.status if sub else "not_started",
-            "grade": sub.grade if sub else None,
-        })
+            "submission_status": submission_status or "not_started",
+            "grade": grade,
+        }
+        if role != "student":
+            item["assigned_count"] = a.assigned_count
+            item["submitted_count"] = a.submitted_count
+        assignment_list.append(item)
 
     return {"assignments": assignment_list}
 
@@ -555,9 +631,16 @@ async def create_assignment(
     current_user: ActiveUser,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    """Create an assignment."""
+    """Create an assignment for a class, a list of students, or both."""
     await _verify_org_admin(db, org_id, current_user.id)
 
+    if data.class_id:
+        result = await db.execute(
+            select(Class.id).where(Class.id == data.class_id, Class.organization_id == org_id)
+        )
+        if not result.scalar_one_or_none():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Class not found")
+
     assignment = Assignment(
         organization_id=org_id,
         created_by_id=current_user.id,
@@ -574,123 +657,275 @@ async def create_assignment(
     db.add(assignment)
     await db.flush()
 
-    # Add individual student assignments if specified
+    # Fan out to the class roster and listed students in one INSERT ... SELECT;
+    # only active organization members are assigned
+    targets = []
+    if data.class_id:
+        targets.append(OrganizationMember.user_id.in_(
+            select(ClassStudent.student_id).where(
+                ClassStudent.class_id == data.class_id,
+                ClassStudent.is_active == True,  # noqa: E712
+            )
+        ))
     if data.student_ids:
-        from app.models.organization import StudentAssignment
-        for student_id in data.student_ids:
-            sa = StudentAssignment(
-                assignment_id=assignment.id,
-                student_id=student_id,
+        targets.append(OrganizationMember.user_id.in_(data.student_ids))
+
+    if targets:
+        result = await db.execute(
+            insert(StudentAssignment).from_select(
+                ["assignment_id", "student_id"],
+                select(literal(assignment.id), OrganizationMember.user_id).where(
+                    OrganizationMember.organization_id == org_id,
+                    OrganizationMember.is_active == True,  # noqa: E712
+                    or_(*targets),
+                ),
             )
-            db.add(sa)
+        )
+        assignment.assigned_count = result.rowcount
 
-    return {"id": assignment.id, "message": "Assignment created"}
+    return {
+        "id": assignment.id,
+        "assigned_count": assignment.assigned_count,
+        "message": "Assignment created",
+    }
 
 
-@router.get("/{org_id}/dashboard")
-async def get_org_dashboard(
+@router.post("/{org_id}/assignments/{assignment_id}/submit")
+async def submit_assignment(
     org_id: int,
+    assignment_id: int,
+    data: AssignmentSubmit,
     current_user: ActiveUser,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    """Get organization dashboard stats."""
-    await _verify_org_admin(db, org_id, current_user.id)
+    """Submit an assignment, optionally linking the test attempt that completes it."""
+    await _verify_org_membership(db, org_id, current_user.id)
 
-    # Member counts by role
-    member_counts = await db.execute(
-        select(OrganizationMember.role, func.count())
-        .where(
-            OrganizationMember.organization_id == org_id,
-            OrganizationMember.is_active == True,  # noqa: E712
+    result = await db.execute(
+        select(Assignment).where(
+            Assignment.id == assignment_id,
+            Assignment.organization_id == org_id,
+            Assignment.is_published == True,  # noqa: E712
         )
-        .group_by(OrganizationMember.role)
     )
-    role_counts = {role: count for role, count in member_counts}
+    assignment = result.scalar_one_or_none()
 
-    # Class count
-    class_count = await db.execute(
-        select(func.count()).where(
-            Class.organization_id == org_id,
-            Class.is_active == True,  # noqa: E712
-        )
-    )
+    if not assignment:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
 
-    # Get student IDs
-    student_ids_result = await db.execute(
-        select(OrganizationMember.user_id).where(
-            OrganizationMember.organization_id == org_id,
-            OrganizationMember.role == "student",
-            OrganizationMember.is_active == True,  # noqa: E712
+    # Lock the student's row so their concurrent submissions serialize
+    result = await db.execute(
+        select(StudentAssignment)
+        .where(
+            StudentAssignment.assignment_id == assignment_id,
+            StudentAssignment.student_id == current_user.id,
         )
+        .with_for_update()
     )
-    student_ids = [row[0] for row in student_ids_result]
-
-    # Tests completed by students
-    tests_completed = 0
-    avg_score = None
-    if student_ids:
-        stats = await db.execute(
-            select(
-                func.count(),
-                func.avg(TestAttempt.total_score),
+    if not result.scalar_one_or_none():
+        # Joined the class after the assignment fanned out
+        result = await db.execute(
+            select(ClassStudent.id).where(
+                ClassStudent.class_id == assignment.class_id,
+                ClassStudent.student_id == current_user.id,
+                ClassStudent.is_active == True,  # noqa: E712
+            )
+        )
+        if not assignment.class_id or not result.scalar_one_or_none():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found"
             )
-            .where(
-                TestAttempt.user_id.in_(student_ids),
+
+        db.add(StudentAssignment(assignment_id=assignment_id, student_id=current_user.id))
+        await db.flush()
+        await db.execute(
+            update(Assignment)
+            .where(Assignment.id == assignment_id)
+            .values(assigned_count=Assignment.assigned_count + 1)
+        )
+
+    now = datetime.now(UTC)
+    if assignment.due_date and now > assignment.due_date and not assignment.allow_late_submission:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Assignment is past its due date",
+        )
+
+    if data.test_attempt_id:
+        result = await db.execute(
+            select(TestAttempt.id).where(
+                TestAttempt.id == data.test_attempt_id,
+                TestAttempt.user_id == current_user.id,
                 TestAttempt.status == AttemptStatus.COMPLETED,
             )
         )
-        row = stats.one()
-        tests_completed = row[0] or 0
-        avg_score = float(row[1]) if row[1] else None
+        if not result.scalar_one_or_none():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Completed test attempt not found",
+            )
+
+    result = await db.execute(
+        select(func.count()).where(
+            AssignmentSubmission.assignment_id == assignment_id,
+            AssignmentSubmission.student_id == current_user.id,
+        )
+    )
+    previous = result.scalar() or 0
+    if assignment.max_attempts and previous >= assignment.max_attempts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No attempts left for this assignment",
+        )
 
-    return {
-        "member_counts": role_counts,
-        "class_count": class_count.scalar() or 0,
-        "student_count": len(student_ids),
-        "tests_completed": tests_completed,
-        "average_score": avg_score,
-    }
+    submission = AssignmentSubmission(
+        assignment_id=assignment_id,
+        student_id=current_user.id,
+        test_attempt_id=data.test_attempt_id,
+        status="submitted",
+        submitted_at=now,
+    )
+    db.add(submission)
+
+    if not previous:
+        # Incremented in SQL; other students may be submitting at the same time
+        await db.execute(
+            update(Assignment)
+            .where(Assignment.id == assignment_id)
+            .values(submitted_count=Assignment.submitted_count + 1)
+        )
+    await db.flush()
+
+    return {"id": submission.id, "status": submission.status, "message": "Assignment submitted"}
+
+
+@router.get("/{org_id}/dashboard")
+async def get_org_dashboard(
+    org_id: int,
+    current_user: ActiveUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Get organization dashboard stats."""
+    await _verify_org_admin(db, org_id, current_user.id)
+
+    return await OrgAnalyticsService(db).organization_dashboard(org_id)
+
+
+@router.get("/{org_id}/classes/{class_id}/dashboard")
+async def get_class_dashboard(
+    org_id: int,
+    class_id: int,
+    current_user: ActiveUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Get class dashboard stats."""
+    await _verify_org_admin(db, org_id, current_user.id)
+
+    result = await db.execute(
+        select(Class.id).where(Class.id == class_id, Class.organization_id == org_id)
+    )
+    if not result.scalar_one_or_none():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Class not found")
+
+    return await OrgAnalyticsService(db).class_dashboard(class_id)
 
 
 # === Helper Functions ===
 
 
-async def _verify_org_membership(
+async def _start_roster_import(
     db: AsyncSession,
     org_id: int,
     user_id: int,
-) -> OrganizationMember:
-    """Verify user is a member of the organization."""
-    result = await db.execute(
-        select(OrganizationMember).where(
-            OrganizationMember.organization_id == org_id,
-            OrganizationMember.user_id == user_id,
-            OrganizationMember.is_active == True,  # noqa: E712
+    rows: list[dict],
+    class_id: int | None,
+    role: str,
+) -> dict:
+    """Store parsed roster rows and queue them for processing."""
+    if role not in ("student", "teacher", "admin"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Role must be student, teacher or admin",
+        )
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No rows to import")
+
+    if class_id:
+        result = await db.execute(
+            select(Class.id).where(Class.id == class_id, Class.organization_id == org_id)
         )
+        if not result.scalar_one_or_none():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Class not found")
+
+    roster_import = RosterImport(
+        organization_id=org_id,
+        class_id=class_id,
+        created_by_id=user_id,
+        role=role,
+        rows=rows,
+        total_rows=len(rows),
     )
-    membership = result.scalar_one_or_none()
+    db.add(roster_import)
+    # Commit before queueing so the worker can see the rows
+    await db.commit()
+
+    task = process_roster_import.delay(roster_import.id)
+    roster_import.celery_task_id = task.id
+    await db.commit()
+
+    return _roster_import_response(roster_import)
+
+
+def _roster_import_response(roster_import: RosterImport) -> dict:
+    return {
+        "id": roster_import.id,
+        "status": roster_import.status,
+        "class_id": roster_import.class_id,
+        "role": roster_import.role,
+        "total_rows": roster_import.total_rows,
+        "processed_rows": roster_import.processed_rows,
+        "added_count": roster_import.added_count,
+        "enrolled_count": roster_import.enrolled_count,
+        "skipped_count": roster_import.skipped_count,
+        "error_count": roster_import.error_count,
+        "errors": roster_import.errors or [],
+        "error_message": roster_import.error_message,
+        "created_at": roster_import.created_at.isoformat(),
+        "completed_at": (
+            roster_import.completed_at.isoformat() if roster_import.completed_at else None
+        ),
+    }
+
+
+async def _verify_org_membership(
+    db: AsyncSession,
+    org_id: int,
+    user_id: int,
+) -> str:
+    """Verify user is a member of the organization. Returns their role."""
+    role = (await get_memberships(db, user_id)).get(org_id)
 
-    if not membership:
+    if role is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organization not found or not a member",
         )
 
-    return membership
+    return role
 
 
 async def _verify_org_admin(
     db: AsyncSession,
     org_id: int,
     user_id: int,
-) -> OrganizationMember:
-    """Verify user has admin rights in the organization."""
-    membership = await _verify_org_membership(db, org_id, user_id)
+) -> str:
+    """Verify user has admin rights in the organization. Returns their role."""
+    role = await _verify_org_membership(db, org_id, user_id)
 
-    if membership.role not in ("owner", "admin", "teacher"):
+    if role not in ("owner", "admin", "teacher"):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Insufficient permissions",
         )
 
-    return membership
+    return role
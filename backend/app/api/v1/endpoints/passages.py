@@ -9,14 +9,21 @@ from app.core.deps import AdminUser
 from app.models.test import Passage
 from app.schemas.base import PaginatedResponse
 from app.schemas.test import PassageCreate, PassageResponse, PassageUpdate
+from app.services.search_service import SearchService
 
 router = APIRouter(prefix="/passages", tags=["Passages"])
 
 
+class PassageListItem(PassageResponse):
+    """Passage in a list, with the matching text when searching."""
+
+    highlight: str | None = None
+
+
 class PassageListResponse(PaginatedResponse):
     """Paginated passage list response."""
 
-    items: list[PassageResponse]
+    items: list[PassageListItem]
 
 
 @router.get("", response_model=PassageListResponse)
@@ -31,26 +38,27 @@ async def list_passages(
     query = select(Passage)
 
     if search:
-        query = query.where(
-            Passage.title.ilike(f"%{search}%")
-            | Passage.content.ilike(f"%{search}%")
-            | Passage.source.ilike(f"%{search}%")
-            | Passage.author.ilike(f"%{search}%")
+        total, hits = await SearchService(db).search(
+            query, Passage, search, offset=(page - 1) * page_size, limit=page_size
         )
-
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_query)).scalar() or 0
-
-    # Apply pagination
-    query = query.offset((page - 1) * page_size).limit(page_size)
-    query = query.order_by(Passage.created_at.desc())
-
-    result = await db.execute(query)
-    passages = result.scalars().all()
+        items = [
+            PassageListItem.model_validate(hit.item).model_copy(update={"highlight": hit.highlight})
+            for hit in hits
+        ]
+    else:
+        # Get total count
+        count_query = select(func.count()).select_from(query.subquery())
+        total = (await db.execute(count_query)).scalar() or 0
+
+        # Apply pagination
+        query = query.offset((page - 1) * page_size).limit(page_size)
+        query = query.order_by(Passage.created_at.desc())
+
+        result = await db.execute(query)
+        items = [PassageListItem.model_validate(p) for p in result.scalars().all()]
 
     return PassageListResponse(
-        items=[PassageResponse.model_validate(p) for p in passages],
+        items=items,
         total=total,
         page=page,
         page_size=page_size,
@@ -11,6 +11,7 @@ from app.core.deps import AdminUser
 from app.models.test import Question, TestModule, Test
 from app.models.enums import QuestionDomain, QuestionDifficulty, QuestionType, SATSection
 from app.schemas.base import BaseSchema, PaginatedResponse
+from app.services.search_service import SearchService
 
 
 router = APIRouter(prefix="/questions", tags=["Questions"])
@@ -31,6 +32,8 @@ class QuestionBankItem(BaseSchema):
     module_section: str
     test_id: int
     test_title: str
+    # Matching text with search terms in <mark>, when searching
+    highlight: str | None = None
 
 
 class QuestionBankResponse(PaginatedResponse):
@@ -84,8 +87,6 @@ async def list_questions(
     )
 
     # Apply filters
-    if search:
-        query = query.where(Question.question_text.ilike(f"%{search}%"))
     if section:
         query = query.where(TestModule.section == section)
     if domain:
@@ -97,16 +98,25 @@ async def list_questions(
     if test_id:
         query = query.where(TestModule.test_id == test_id)
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_query)).scalar() or 0
+    highlights = {}
+    if search:
+        # Ranked by relevance instead of newest first
+        total, hits = await SearchService(db).search(
+            query, Question, search, offset=(page - 1) * page_size, limit=page_size
+        )
+        questions = [hit.item for hit in hits]
+        highlights = {hit.item.id: hit.highlight for hit in hits}
+    else:
+        # Get total count
+        count_query = select(func.count()).select_from(query.subquery())
+        total = (await db.execute(count_query)).scalar() or 0
 
-    # Apply pagination
-    query = query.offset((page - 1) * page_size).limit(page_size)
-    query = query.order_by(Question.id.desc())
+        # Apply pagination
+        query = query.offset((page - 1) * page_size).limit(page_size)
+        query = query.order_by(Question.id.desc())
 
-    result = await db.execute(query)
-    questions = result.scalars().all()
+        result = await db.execute(query)
+        questions = result.scalars().all()
 
     items = []
     for q in questions:
@@ -128,6 +138,7 @@ async def list_questions(
             module_section=q.module.section.value if q.module else "",
             test_id=q.module.test_id if q.module else 0,
             test_title=q.module.test.title if q.module and q.module.test else "",
+            highlight=highlights.get(q.id),
         ))
 
     return QuestionBankResponse(
@@ -176,8 +187,6 @@ async def export_questions(
         )
     )
 
-    if search:
-        query = query.where(Question.question_text.ilike(f"%{search}%"))
     if section:
         query = query.where(TestModule.section == section)
     if domain:
@@ -185,10 +194,13 @@ async def export_questions(
     if difficulty:
         query = query.where(Question.difficulty == difficulty)
 
-    query = query.order_by(Question.id.desc()).limit(limit)
-
-    result = await db.execute(query)
-    questions = result.scalars().all()
+    if search:
+        _, hits = await SearchService(db).search(query, Question, search, limit=limit)
+        questions = [hit.item for hit in hits]
+    else:
+        query = query.order_by(Question.id.desc()).limit(limit)
+        result = await db.execute(query)
+        questions = result.scalars().all()
 
     return [
         QuestionExportItem(
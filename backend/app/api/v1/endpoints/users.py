@@ -7,7 +7,7 @@ from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
 from app.core.deps import ActiveUser, AdminUser
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 from app.models import Subscription, User
 from app.schemas import (
     UserAdminUpdate,
@@ -17,6 +17,8 @@ from app.schemas import (
     UserWithSubscription,
 )
 from app.schemas.base import PaginatedResponse
+from app.services.auth_service import AuthService
+from app.services.user_cache_service import invalidate_user
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -52,6 +54,9 @@ async def update_my_profile(
     for field, value in update_data.items():
         setattr(current_user, field, value)
 
+    await db.commit()
+    await invalidate_user(current_user.id)
+
     return current_user
 
 
@@ -139,7 +144,7 @@ async def create_user(
 
     user = User(
         email=data.email,
-        password_hash=hash_password(data.password),
+        password_hash=await hash_password_async(data.password),
         full_name=data.full_name,
         phone=data.phone,
         avatar_url=data.avatar_url,
@@ -176,6 +181,12 @@ async def update_user(
     for field, value in update_data.items():
         setattr(user, field, value)
 
+    if update_data.get("is_active") is False:
+        await AuthService(db).revoke_all_user_tokens(user.id)
+
+    await db.commit()
+    await invalidate_user(user.id)
+
     return user
 
 
@@ -199,3 +210,7 @@ async def delete_user(
         )
 
     user.is_active = False
+    await AuthService(db).revoke_all_user_tokens(user.id)
+
+    await db.commit()
+    await invalidate_user(user.id)
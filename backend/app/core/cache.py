@@ -0,0 +1,446 @@
+"""
+Shared cache and fast state store.
+
+Redis in deployment (same instance as the Celery broker by default).
+The in-memory backend keeps the same interface for tests and
+single-process development; it is not shared between workers.
+"""
+
+import asyncio
+import json
+import ssl
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.config import settings
+
+
+class MemoryCache:
+    """In-process stand-in for the subset of Redis the app uses."""
+
+    def __init__(self):
+        self._data: dict[str, Any] = {}
+        self._expires: dict[str, float] = {}
+
+    def _alive(self, key: str) -> bool:
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def _set_ttl(self, key: str, ttl: int | None) -> None:
+        if ttl:
+            self._expires[key] = time.monotonic() + ttl
+        else:
+            self._expires.pop(key, None)
+
+    # Strings / JSON
+
+    async def get_json(self, key: str) -> Any:
+        if not self._alive(key):
+            return None
+        return json.loads(self._data[key])
+
+    async def set_json(self, key: str, value: Any, ttl: int | None = None) -> None:
+        self._data[key] = json.dumps(value, default=str)
+        self._set_ttl(key, ttl)
+
+    async def set_nx(self, key: str, value: Any, ttl: int) -> bool:
+        """Set only if the key does not exist. Returns whether it was set."""
+        if self._alive(key):
+            return False
+        await self.set_json(key, value, ttl)
+        return True
+
+    async def pop_json(self, key: str) -> Any:
+        """Get and delete in one step (GETDEL)."""
+        value = await self.get_json(key)
+        await self.delete(key)
+        return value
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+
+    async def expire(self, key: str, ttl: int) -> None:
+        if self._alive(key):
+            self._set_ttl(key, ttl)
+
+    # Hashes (values are JSON-encoded)
+
+    async def hset_json(self, key: str, mapping: dict[str, Any], ttl: int | None = None) -> None:
+        if not self._alive(key):
+            self._data[key] = {}
+        self._data[key].update({f: json.dumps(v, default=str) for f, v in mapping.items()})
+        if ttl:
+            self._set_ttl(key, ttl)
+
+    async def hgetall_json(self, key: str) -> dict[str, Any]:
+        if not self._alive(key):
+            return {}
+        return {f: json.loads(v) for f, v in self._data[key].items()}
+
+    # Sets
+
+    async def sadd(self, key: str, *members: str) -> None:
+        if not self._alive(key):
+            self._data[key] = set()
+        self._data[key].update(str(m) for m in members)
+
+    async def srem(self, key: str, *members: str) -> None:
+        if self._alive(key):
+            self._data[key].difference_update(str(m) for m in members)
+
+    async def smembers(self, key: str) -> set[str]:
+        return set(self._data[key]) if self._alive(key) else set()
+
+    # Counters in hashes
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        if not self._alive(key):
+            self._data[key] = {}
+        value = int(self._data[key].get(field, 0)) + amount
+        self._data[key][field] = str(value)
+        return value
+
+    async def hmget(self, key: str, fields: list[str]) -> list[str | None]:
+        values = self._data[key] if self._alive(key) else {}
+        return [values.get(f) for f in fields]
+
+    # Sorted sets (ties order by member, descending, as in Redis)
+
+    def _zsorted(self, key: str) -> list[tuple[str, float]]:
+        if not self._alive(key):
+            return []
+        return sorted(self._data[key].items(), key=lambda item: (item[1], item[0]), reverse=True)
+
+    async def zincrby(self, key: str, member: str, amount: float) -> float:
+        if not self._alive(key):
+            self._data[key] = {}
+        value = self._data[key].get(str(member), 0.0) + amount
+        self._data[key][str(member)] = value
+        return value
+
+    async def zadd(self, key: str, mapping: dict[str, float]) -> None:
+        if not self._alive(key):
+            self._data[key] = {}
+        self._data[key].update({str(m): float(s) for m, s in mapping.items()})
+
+    async def zrevrange(self, key: str, start: int, stop: int) -> list[tuple[str, float]]:
+        items = self._zsorted(key)
+        return items[start:] if stop == -1 else items[start:stop + 1]
+
+    async def zrevrank(self, key: str, member: str) -> int | None:
+        for index, (m, _) in enumerate(self._zsorted(key)):
+            if m == str(member):
+                return index
+        return None
+
+    async def zscore(self, key: str, member: str) -> float | None:
+        return self._data[key].get(str(member)) if self._alive(key) else None
+
+    async def zcard(self, key: str) -> int:
+        return len(self._data[key]) if self._alive(key) else 0
+
+    def pipeline(self) -> "MemoryPipeline":
+        return MemoryPipeline(self)
+
+    async def clear(self) -> None:
+        self._data.clear()
+        self._expires.clear()
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryPipeline:
+    """
+    Queues MemoryCache writes and applies them in order on execute.
+    Nothing else runs in between, as with MULTI/EXEC.
+    """
+
+    def __init__(self, cache: MemoryCache):
+        self._cache = cache
+        self._commands: list[tuple[Callable[..., Awaitable[Any]], tuple]] = []
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        method = getattr(self._cache, name)
+
+        def queue(*args: Any) -> None:
+            self._commands.append((method, args))
+
+        return queue
+
+    async def execute(self) -> None:
+        commands, self._commands = self._commands, []
+        for method, args in commands:
+            await method(*args)
+
+    async def __aenter__(self) -> "MemoryPipeline":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.execute()
+
+
+class RedisCache:
+    """Redis-backed cache."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        kwargs: dict[str, Any] = {"decode_responses": True}
+        if url.startswith("rediss://"):
+            # Heroku Redis requires SSL with CERT_NONE (matches celery_config)
+            kwargs["ssl_cert_reqs"] = ssl.CERT_NONE
+        self.client = redis.from_url(url, **kwargs)
+
+    async def get_json(self, key: str) -> Any:
+        value = await self.client.get(key)
+        return json.loads(value) if value is not None else None
+
+    async def set_json(self, key: str, value: Any, ttl: int | None = None) -> None:
+        await self.client.set(key, json.dumps(value, default=str), ex=ttl)
+
+    async def set_nx(self, key: str, value: Any, ttl: int) -> bool:
+        return bool(await self.client.set(key, json.dumps(value, default=str), ex=ttl, nx=True))
+
+    async def pop_json(self, key: str) -> Any:
+        value = await self.client.getdel(key)
+        return json.loads(value) if value is not None else None
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+    async def expire(self, key: str, ttl: int) -> None:
+        await self.client.expire(key, ttl)
+
+    async def hset_json(self, key: str, mapping: dict[str, Any], ttl: int | None = None) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={f: json.dumps(v, default=str) for f, v in mapping.items()})
+            if ttl:
+                pipe.expire(key, ttl)
+            await pipe.execute()
+
+    async def hgetall_json(self, key: str) -> dict[str, Any]:
+        values = await self.client.hgetall(key)
+        return {f: json.loads(v) for f, v in values.items()}
+
+    async def sadd(self, key: str, *members: str) -> None:
+        if members:
+            await self.client.sadd(key, *members)
+
+    async def srem(self, key: str, *members: str) -> None:
+        if members:
+            await self.client.srem(key, *members)
+
+    async def smembers(self, key: str) -> set[str]:
+        return set(await self.client.smembers(key))
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        return await self.client.hincrby(key, field, amount)
+
+    async def hmget(self, key: str, fields: list[str]) -> list[str | None]:
+        if not fields:
+            return []
+        return await self.client.hmget(key, fields)
+
+    async def zincrby(self, key: str, member: str, amount: float) -> float:
+        return await self.client.zincrby(key, amount, member)
+
+    async def zadd(self, key: str, mapping: dict[str, float]) -> None:
+        if mapping:
+            await self.client.zadd(key, mapping)
+
+    async def zrevrange(self, key: str, start: int, stop: int) -> list[tuple[str, float]]:
+        return await self.client.zrevrange(key, start, stop, withscores=True)
+
+    async def zrevrank(self, key: str, member: str) -> int | None:
+        return await self.client.zrevrank(key, member)
+
+    async def zscore(self, key: str, member: str) -> float | None:
+        return await self.client.zscore(key, member)
+
+    async def zcard(self, key: str) -> int:
+        return await self.client.zcard(key)
+
+    def pipeline(self) -> "RedisPipeline":
+        return RedisPipeline(self.client.pipeline(transaction=True))
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class RedisPipeline:
+    """
+    Cache writes sent together in one MULTI/EXEC round trip, with the
+    same signatures as the RedisCache methods.
+    """
+
+    def __init__(self, pipe):
+        self._pipe = pipe
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self._pipe.delete(*keys)
+
+    def expire(self, key: str, ttl: int) -> None:
+        self._pipe.expire(key, ttl)
+
+    def hset_json(self, key: str, mapping: dict[str, Any], ttl: int | None = None) -> None:
+        if mapping:
+            encoded = {f: json.dumps(v, default=str) for f, v in mapping.items()}
+            self._pipe.hset(key, mapping=encoded)
+        if ttl:
+            self._pipe.expire(key, ttl)
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> None:
+        self._pipe.hincrby(key, field, amount)
+
+    def sadd(self, key: str, *members: str) -> None:
+        if members:
+            self._pipe.sadd(key, *members)
+
+    def zadd(self, key: str, mapping: dict[str, float]) -> None:
+        if mapping:
+            self._pipe.zadd(key, mapping)
+
+    def zincrby(self, key: str, member: str, amount: float) -> None:
+        self._pipe.zincrby(key, amount, member)
+
+    async def execute(self) -> None:
+        await self._pipe.execute()
+
+    async def __aenter__(self) -> "RedisPipeline":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                await self.execute()
+        finally:
+            await self._pipe.reset()
+
+
+Cache = MemoryCache | RedisCache
+
+
+class LocalCache:
+    """
+    Small in-process LRU with per-entry TTL, for hot values read on most
+    requests. Not shared between workers, so keep TTLs short enough that
+    another worker's stale copy is harmless.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        _local_caches.append(self)
+
+    def get(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+_local_caches: list[LocalCache] = []
+
+
+def clear_local_caches() -> None:
+    """Empty every LocalCache in this process (tests)."""
+    for local_cache in _local_caches:
+        local_cache.clear()
+
+_cache: Cache | None = None
+_memory_cache = MemoryCache()
+
+
+def create_cache() -> Cache:
+    """New cache client. Celery tasks use this since each task runs its own event loop."""
+    if settings.cache_backend == "memory":
+        # Nothing to connect; share one store so every caller sees the same data
+        return _memory_cache
+    return RedisCache(settings.cache_url or settings.redis_url)
+
+
+def get_cache() -> Cache:
+    """Process-wide cache client for request handlers."""
+    global _cache
+    if _cache is None:
+        _cache = create_cache()
+    return _cache
+
+
+# Per-process locks so concurrent requests in one worker wait on each other
+_compute_locks: dict[str, asyncio.Lock] = {}
+
+# Poll interval while another worker computes a value
+_WAIT_INTERVAL = 0.05
+
+
+async def get_or_compute(
+    cache: Cache,
+    key: str,
+    ttl: int,
+    compute: Callable[[], Awaitable[Any]],
+    lock_timeout: int = 10,
+) -> Any:
+    """
+    Cached JSON value, computed at most once per expiry across all workers.
+
+    Concurrent misses in one process share a lock; across processes a
+    short-lived lock key elects one computer while the others wait for
+    its result. If the holder dies, waiters compute after lock_timeout.
+    """
+    value = await cache.get_json(key)
+    if value is not None:
+        return value
+
+    lock = _compute_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        value = await cache.get_json(key)
+        if value is not None:
+            return value
+
+        lock_key = f"{key}:lock"
+        if await cache.set_nx(lock_key, 1, ttl=lock_timeout):
+            try:
+                value = await compute()
+                await cache.set_json(key, value, ttl=ttl)
+            finally:
+                await cache.delete(lock_key)
+            return value
+
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_WAIT_INTERVAL)
+            value = await cache.get_json(key)
+            if value is not None:
+                return value
+
+        return await compute()
@@ -3,6 +3,7 @@
 import ssl
 
 from celery import Celery
+from celery.schedules import crontab
 
 from app.core.config import settings
 
@@ -27,6 +28,10 @@ celery_app = Celery(
     backend=redis_url,
     include=[
         "app.tasks.ocr_tasks",
+        "app.tasks.analytics_tasks",
+        "app.tasks.attempt_tasks",
+        "app.tasks.organization_tasks",
+        "app.tasks.auth_tasks",
     ],
     broker_use_ssl=broker_use_ssl,
     redis_backend_use_ssl=backend_use_ssl,
@@ -67,7 +72,36 @@ celery_app.conf.update(
     task_reject_on_worker_lost=True,  # Reject tasks if worker dies
 
     # Beat scheduler (for periodic tasks if needed)
-    beat_schedule={},
+    beat_schedule={
+        "calibrate-irt-items": {
+            "task": "app.tasks.analytics_tasks.calibrate_irt_items",
+            "schedule": crontab(hour=3, minute=0),
+        },
+        "rollup-platform-analytics": {
+            "task": "app.tasks.analytics_tasks.rollup_platform_analytics",
+            "schedule": crontab(hour=0, minute=15),
+        },
+        "flush-autosaves": {
+            "task": "app.tasks.attempt_tasks.flush_autosaves",
+            "schedule": settings.autosave_flush_interval_seconds,
+        },
+        "materialize-leaderboards": {
+            "task": "app.tasks.analytics_tasks.materialize_leaderboards",
+            "schedule": settings.leaderboard_materialize_interval_seconds,
+        },
+        "rebuild-leaderboards": {
+            "task": "app.tasks.analytics_tasks.rebuild_leaderboards",
+            "schedule": crontab(hour=2, minute=0),
+        },
+        "refresh-recommendations": {
+            "task": "app.tasks.analytics_tasks.refresh_recommendations",
+            "schedule": settings.recommendation_refresh_interval_seconds,
+        },
+        "purge-refresh-tokens": {
+            "task": "app.tasks.auth_tasks.purge_refresh_tokens",
+            "schedule": crontab(hour=4, minute=0),
+        },
+    },
 )
 
 # Optional: Configure task queues
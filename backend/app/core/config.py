@@ -89,12 +89,53 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379/0"
 
+    # Cache / fast state store (autosave buffers, idempotency keys, leaderboards)
+    # "memory" is per-process and only suitable for tests and single-worker dev
+    cache_backend: Literal["redis", "memory"] = "redis"
+    cache_url: str | None = None  # Defaults to redis_url
+
+    # Autosave buffer for in-progress attempts
+    autosave_ttl_seconds: int = 86400
+    autosave_flush_interval_seconds: int = 60
+
+    # How long a stored response is replayed for a repeated Idempotency-Key
+    idempotency_ttl_seconds: int = 86400
+
+    # How often live leaderboards are copied into the leaderboard table
+    leaderboard_materialize_interval_seconds: int = 900
+
+    # TTL for cached admin/public analytics responses
+    analytics_cache_ttl_seconds: int = 60
+
+    # Per-user practice recommendations (rebuilt after new answers)
+    recommendation_ttl_seconds: int = 604800
+    recommendation_refresh_interval_seconds: int = 300
+
+    # Cached {org_id: role} memberships for permission checks; the shared copy
+    # is invalidated on change, per-process copies just expire
+    membership_cache_ttl_seconds: int = 300
+    membership_local_ttl_seconds: int = 5
+
+    # Cached user rows for authentication; dropped whenever tokens are revoked
+    user_cache_ttl_seconds: int = 60
+
+    # Threads reserved for bcrypt; logins beyond this queue rather than
+    # blocking request handling
+    password_hash_workers: int = 4
+
     # JWT
     jwt_secret_key: str = Field(default="change-me-in-production-use-openssl-rand-hex-32")
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 43200  # 30 days
     refresh_token_expire_days: int = 60  # 60 days
 
+    # Where refresh tokens live: "database" or "cache" (TTL-expired, no purge
+    # needed, but lost if the cache is flushed)
+    refresh_token_store: str = "database"
+    # Revoked tokens are kept this long before the purge deletes them
+    refresh_token_revoked_retention_days: int = 7
+    refresh_token_purge_batch_size: int = 5000
+
     # File Storage (S3-compatible)
     s3_endpoint_url: str | None = None
     s3_access_key_id: str | None = None
@@ -148,6 +189,17 @@ class Settings(BaseSettings):
     ocr_upload_dir: str = "ocr_uploads"  # S3 prefix for PDF uploads
     ocr_cache_dir: str = ".ocr_cache"  # Local cache for intermediate results
 
+    # ===== IRT Settings =====
+
+    # Calibration (offline job)
+    irt_min_responses: int = 200  # Items with fewer responses stay uncalibrated
+    irt_em_iterations: int = 25
+    irt_chunk_size: int = 100_000  # Responses per E-step chunk
+
+    # Module 1 -> Module 2 routing by ability estimate (theta, standard normal scale)
+    irt_harder_theta: float = 0.5
+    irt_easier_theta: float = -0.5
+
 
 @lru_cache
 def get_settings() -> Settings:
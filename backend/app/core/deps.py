@@ -3,12 +3,12 @@ from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.security import decode_token
 from app.models import User, UserRole
+from app.services.user_cache_service import get_user
 
 security = HTTPBearer()
 
@@ -38,12 +38,15 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
+    user = await get_user(db, int(user_id))
 
     if user is None:
         raise credentials_exception
 
+    # Tokens issued before the user's last revocation are no longer valid
+    if payload.get("ver", 0) != user.token_version:
+        raise credentials_exception
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
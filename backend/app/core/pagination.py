@@ -0,0 +1,48 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort key of the last
+row on the previous page. Seeking past it uses the composite index on
+(sort column, id) instead of scanning and discarding OFFSET rows.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(value: datetime | int | None, row_id: int) -> str:
+    """Encode the sort key of the last row on a page."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str | int | None, int]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(row_id, int):
+            raise ValueError
+        return value, row_id
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+
+def decode_datetime_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor whose sort key is a timestamp."""
+    value, row_id = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(value), row_id
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
@@ -1,13 +1,24 @@
+import asyncio
+import logging
+import secrets
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
-from typing import Any
+from typing import Any, TypeVar
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -17,6 +28,72 @@ def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashPool:
+    """
+    Runs bcrypt on a few dedicated threads. Each call takes 100-300 ms of
+    CPU, so running it in a handler stalls every other request on the
+    worker; here the event loop only waits on a future, and a login storm
+    queues behind the pool instead of starving the default executor.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _call(self, submitted: float, func: Callable[..., T], *args: Any) -> T:
+        wait = time.monotonic() - submitted
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+        if wait > 1:
+            logger.warning("Password hashing queued for %.2fs", wait)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            self._queued += 1
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._call, time.monotonic(), func, *args
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and wait times since startup."""
+        with self._lock:
+            started = self._running + self._completed
+            return {
+                "workers": self.workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "avg_wait_ms": round(self._wait_total / started * 1000, 1) if started else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 1),
+            }
+
+
+password_hash_pool = PasswordHashPool(settings.password_hash_workers)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_hash_pool.run(hash_password, password)
+
+
 def create_access_token(
     subject: str | int,
     expires_delta: timedelta | None = None,
@@ -48,6 +125,8 @@ def create_refresh_token(subject: str | int) -> str:
         "exp": expire,
         "iat": datetime.now(UTC),
         "type": "refresh",
+        # Tokens are stored by hash, so two issued in the same second must differ
+        "jti": secrets.token_hex(16),
     }
 
     return jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
@@ -19,9 +19,12 @@ from app.models.enums import (
 from app.models.user import RefreshToken, Subscription, User
 from app.models.test import (
     AttemptAnswer,
+    AttemptSummary,
+    DrillAttempt,
     ModuleResult,
     Passage,
     Question,
+    QuestionSkill,
     Test,
     TestAttempt,
     TestModule,
@@ -34,14 +37,19 @@ from app.models.organization import (
     ClassStudent,
     Organization,
     OrganizationMember,
+    RosterImport,
     StudentAssignment,
 )
 from app.models.analytics import (
     Achievement,
+    ClassAnalytics,
     DomainProgress,
     Leaderboard,
     Notification,
+    OrganizationAnalytics,
     PlatformAnalytics,
+    ReviewItem,
+    ScoreDistribution,
     ScoreHistory,
     StudentAnalytics,
     StudyPlan,
@@ -77,9 +85,12 @@ __all__ = [
     "User",
     # Test models
     "AttemptAnswer",
+    "AttemptSummary",
+    "DrillAttempt",
     "ModuleResult",
     "Passage",
     "Question",
+    "QuestionSkill",
     "Test",
     "TestAttempt",
     "TestModule",
@@ -94,13 +105,18 @@ __all__ = [
     "ClassStudent",
     "Organization",
     "OrganizationMember",
+    "RosterImport",
     "StudentAssignment",
     # Analytics models
     "Achievement",
+    "ClassAnalytics",
     "DomainProgress",
     "Leaderboard",
     "Notification",
+    "OrganizationAnalytics",
     "PlatformAnalytics",
+    "ReviewItem",
+    "ScoreDistribution",
     "ScoreHistory",
     "StudentAnalytics",
     "StudyPlan",
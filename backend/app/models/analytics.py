@@ -2,9 +2,22 @@
 Analytics models for tracking student progress, platform usage, and generating reports.
 """
 
-from datetime import UTC, datetime
-
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, JSON, String, Text
+from datetime import UTC, date, datetime
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -64,6 +77,8 @@ class StudentAnalytics(Base, TimestampMixin):
     current_streak_days: Mapped[int] = mapped_column(Integer, default=0)
     longest_streak_days: Mapped[int] = mapped_column(Integer, default=0)
     last_activity_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Last day with activity, in the user's timezone
+    last_active_day: Mapped[date | None] = mapped_column(Date)
 
     # Predicted score based on trends
     predicted_score: Mapped[int | None] = mapped_column(Integer)
@@ -125,6 +140,97 @@ class DomainProgress(Base, TimestampMixin):
     # Last 10 attempts for trend calculation
     recent_results: Mapped[list[bool] | None] = mapped_column(JSON)
 
+    __table_args__ = (
+        UniqueConstraint("user_id", "domain", name="uq_domain_progress_user_domain"),
+    )
+
+
+class ReviewItem(Base, TimestampMixin):
+    """
+    A missed question in a student's spaced-repetition queue (SM-2).
+    Due items are read with a range scan on (user_id, due_at).
+    """
+
+    __tablename__ = "review_items"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    question_id: Mapped[int] = mapped_column(
+        ForeignKey("questions.id", ondelete="CASCADE"), nullable=False
+    )
+
+    due_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    # SM-2 state
+    interval_days: Mapped[int] = mapped_column(Integer, default=0)
+    ease_factor: Mapped[float] = mapped_column(Float, default=2.5)
+    repetitions: Mapped[int] = mapped_column(Integer, default=0)
+    lapses: Mapped[int] = mapped_column(Integer, default=0)
+    last_reviewed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "question_id", name="uq_review_item_user_question"),
+        Index("ix_review_items_user_due", "user_id", "due_at"),
+    )
+
+
+class OrganizationAnalytics(Base, TimestampMixin):
+    """
+    Rolled-up stats for an organization's dashboard.
+    Updated as members join and students complete tests.
+    """
+
+    __tablename__ = "organization_analytics"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    organization_id: Mapped[int] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), unique=True, nullable=False, index=True
+    )
+
+    # Active members, format: {"student": 120, "teacher": 4, ...}
+    member_counts: Mapped[dict | None] = mapped_column(JSON)
+    class_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    # Completed tests by current students
+    tests_completed: Mapped[int] = mapped_column(Integer, default=0)
+    score_total: Mapped[int] = mapped_column(BigInteger, default=0)
+    scored_tests: Mapped[int] = mapped_column(Integer, default=0)
+
+    # Current week (Monday, UTC); counters reset when it rolls over
+    week_start: Mapped[date | None] = mapped_column(Date)
+    attempts_this_week: Mapped[int] = mapped_column(Integer, default=0)
+    active_students_this_week: Mapped[int] = mapped_column(Integer, default=0)
+
+    # Format: {"algebra": {"accuracy": 0.85, "count": 50, "correct": 42}, ...}
+    domain_performance: Mapped[dict | None] = mapped_column(JSON)
+
+
+class ClassAnalytics(Base, TimestampMixin):
+    """
+    Rolled-up stats for a class, maintained like OrganizationAnalytics.
+    """
+
+    __tablename__ = "class_analytics"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    class_id: Mapped[int] = mapped_column(
+        ForeignKey("classes.id", ondelete="CASCADE"), unique=True, nullable=False, index=True
+    )
+
+    student_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    tests_completed: Mapped[int] = mapped_column(Integer, default=0)
+    score_total: Mapped[int] = mapped_column(BigInteger, default=0)
+    scored_tests: Mapped[int] = mapped_column(Integer, default=0)
+
+    week_start: Mapped[date | None] = mapped_column(Date)
+    attempts_this_week: Mapped[int] = mapped_column(Integer, default=0)
+    active_students_this_week: Mapped[int] = mapped_column(Integer, default=0)
+
+    domain_performance: Mapped[dict | None] = mapped_column(JSON)
+
 
 class StudySession(Base, TimestampMixin):
     """Track study sessions for engagement analytics."""
@@ -198,6 +304,38 @@ class PlatformAnalytics(Base, TimestampMixin):
     # Top performing domains/skills
     domain_accuracy: Mapped[dict | None] = mapped_column(JSON)
 
+    __table_args__ = (
+        Index(
+            "ix_platform_analytics_period",
+            "period_type", "organization_id", "period_start",
+        ),
+    )
+
+
+class ScoreDistribution(Base, TimestampMixin):
+    """
+    Live histogram of completed-attempt scores, one row per scope.
+    Updated incrementally on test completion and used for percentile lookups.
+    """
+
+    __tablename__ = "score_distributions"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+
+    # Scope: total, reading_writing, math
+    scope: Mapped[str] = mapped_column(String(30), unique=True, nullable=False, index=True)
+
+    # Bin layout: counts[i] covers [min_score + i * bin_width, min_score + (i + 1) * bin_width)
+    min_score: Mapped[int] = mapped_column(Integer, nullable=False)
+    bin_width: Mapped[int] = mapped_column(Integer, nullable=False, default=10)
+    counts: Mapped[list[int]] = mapped_column(JSON, nullable=False)
+
+    # Running totals for summary stats
+    total_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    score_sum: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    min_observed: Mapped[int | None] = mapped_column(Integer)
+    max_observed: Mapped[int | None] = mapped_column(Integer)
+
 
 class Leaderboard(Base, TimestampMixin):
     """Leaderboard entries for gamification."""
@@ -227,6 +365,13 @@ class Leaderboard(Base, TimestampMixin):
     period_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     period_end: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
+    __table_args__ = (
+        Index(
+            "ix_leaderboard_board_rank",
+            "scope_type", "scope_id", "period_type", "period_start", "rank",
+        ),
+    )
+
 
 class Achievement(Base, TimestampMixin):
     """Achievement definitions for gamification."""
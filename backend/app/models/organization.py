@@ -203,6 +203,10 @@ class Assignment(Base, TimestampMixin):
 
     is_published: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    # Completion counters for teacher overviews
+    assigned_count: Mapped[int] = mapped_column(Integer, default=0)  # Students fanned out to
+    submitted_count: Mapped[int] = mapped_column(Integer, default=0)  # Students with a submission
+
     # Relationships
     organization: Mapped["Organization"] = relationship("Organization", back_populates="assignments")
     class_: Mapped["Class | None"] = relationship("Class", back_populates="assignments")
@@ -216,7 +220,7 @@ class Assignment(Base, TimestampMixin):
 
 
 class StudentAssignment(Base, TimestampMixin):
-    """For assigning to individual students (not whole class)."""
+    """One row per student an assignment was given to, directly or through their class."""
 
     __tablename__ = "student_assignments"
 
@@ -274,5 +278,50 @@ class AssignmentSubmission(Base, TimestampMixin):
     )
 
 
+
+class RosterImport(Base, TimestampMixin):
+    """
+    A bulk roster upload, processed in chunks by a background task.
+    Uploaded rows are cleared once processed; the error report stays.
+    """
+
+    __tablename__ = "roster_imports"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    organization_id: Mapped[int] = mapped_column(
+        ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    # Optional class to enroll every imported student in
+    class_id: Mapped[int | None] = mapped_column(
+        ForeignKey("classes.id", ondelete="CASCADE"), index=True
+    )
+    created_by_id: Mapped[int | None] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), index=True
+    )
+
+    role: Mapped[str] = mapped_column(String(50), default="student")
+    # pending, processing, completed, failed
+    status: Mapped[str] = mapped_column(String(50), default="pending")
+
+    # Format: [{"row": 2, "email": "...", "grade_level": 10, ...}]
+    rows: Mapped[list[dict] | None] = mapped_column(JSON)
+
+    # Progress
+    total_rows: Mapped[int] = mapped_column(Integer, default=0)
+    processed_rows: Mapped[int] = mapped_column(Integer, default=0)
+    added_count: Mapped[int] = mapped_column(Integer, default=0)  # New or reactivated members
+    # New or reactivated class students
+    enrolled_count: Mapped[int] = mapped_column(Integer, default=0)
+    skipped_count: Mapped[int] = mapped_column(Integer, default=0)  # Already members (and enrolled)
+    error_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    # Format: [{"row": 5, "email": "...", "error": "User not found"}]
+    errors: Mapped[list[dict] | None] = mapped_column(JSON)
+    error_message: Mapped[str | None] = mapped_column(Text)
+
+    celery_task_id: Mapped[str | None] = mapped_column(String(255))
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
 # Import at end to avoid circular imports
 from app.models.user import User  # noqa: E402
@@ -7,13 +7,18 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     String,
     Text,
     UniqueConstraint,
+    delete,
+    event,
+    insert,
+    inspect,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
 from app.models.enums import (
@@ -173,6 +178,13 @@ class Question(Base, TimestampMixin):
     times_answered: Mapped[int] = mapped_column(Integer, default=0)
     times_correct: Mapped[int] = mapped_column(Integer, default=0)
 
+    # IRT item parameters (set by the offline calibration job)
+    irt_discrimination: Mapped[float | None] = mapped_column(Float)  # a
+    irt_difficulty: Mapped[float | None] = mapped_column(Float)  # b
+    irt_guessing: Mapped[float | None] = mapped_column(Float)  # c
+    irt_sample_size: Mapped[int | None] = mapped_column(Integer)
+    irt_calibrated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
     # Relationships
     module: Mapped["TestModule"] = relationship("TestModule", back_populates="questions")
     passage: Mapped["Passage | None"] = relationship("Passage", back_populates="questions")
@@ -182,6 +194,54 @@ class Question(Base, TimestampMixin):
     )
 
 
+class QuestionSkill(Base):
+    """
+    One row per (question, skill tag), mirroring Question.skill_tags so
+    skill analytics can GROUP BY skill in SQL. Kept in sync on flush.
+    """
+
+    __tablename__ = "question_skills"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    question_id: Mapped[int] = mapped_column(
+        ForeignKey("questions.id", ondelete="CASCADE"), nullable=False
+    )
+    skill: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+
+    __table_args__ = (
+        UniqueConstraint("question_id", "skill", name="uq_question_skill"),
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_question_skills(session: Session, flush_context) -> None:
+    """Rewrite question_skills for questions created or retagged in this flush."""
+    created = [obj for obj in session.new if isinstance(obj, Question)]
+    retagged = [
+        obj
+        for obj in session.dirty
+        if isinstance(obj, Question) and inspect(obj).attrs.skill_tags.history.has_changes()
+    ]
+    if not created and not retagged:
+        return
+
+    connection = session.connection()
+    if retagged:
+        connection.execute(
+            delete(QuestionSkill.__table__).where(
+                QuestionSkill.question_id.in_([question.id for question in retagged])
+            )
+        )
+
+    rows = [
+        {"question_id": question.id, "skill": skill}
+        for question in created + retagged
+        for skill in dict.fromkeys(tag[:100] for tag in question.skill_tags or [])
+    ]
+    if rows:
+        connection.execute(insert(QuestionSkill.__table__), rows)
+
+
 class Passage(Base, TimestampMixin):
     """
     Reading passages for Reading/Writing section.
@@ -248,6 +308,21 @@ class TestAttempt(Base, TimestampMixin):
     # Format: {module_id: seconds_spent}
     time_spent_per_module: Mapped[dict[str, int] | None] = mapped_column(JSON)
 
+    # Last flushed autosave buffer for the current module
+    # Format: {"module_id": 1, "answers": {"42": {"answer": "B", ...}}, "saved_at": "..."}
+    autosave_snapshot: Mapped[dict | None] = mapped_column(JSON)
+
+    # Denormalized list columns, maintained as modules are submitted
+    scope: Mapped[str] = mapped_column(
+        String(20), default="full", server_default="full", nullable=False
+    )
+    total_time_seconds: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    question_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
     # Scores
     # Raw scores per section
     reading_writing_raw_score: Mapped[int | None] = mapped_column(Integer)
@@ -276,6 +351,16 @@ class TestAttempt(Base, TimestampMixin):
     module_results: Mapped[list["ModuleResult"]] = relationship(
         "ModuleResult", back_populates="attempt", cascade="all, delete-orphan"
     )
+    summary: Mapped["AttemptSummary | None"] = relationship(
+        "AttemptSummary", back_populates="attempt", cascade="all, delete-orphan", uselist=False
+    )
+
+    __table_args__ = (
+        # Keyset pagination: per-user history and completed-attempt feeds
+        Index("ix_test_attempts_user_started", "user_id", "started_at", "id"),
+        Index("ix_test_attempts_status_completed", "status", "completed_at", "id"),
+        Index("ix_test_attempts_user_status_completed", "user_id", "status", "completed_at"),
+    )
 
 
 class AttemptAnswer(Base, TimestampMixin):
@@ -349,3 +434,73 @@ class ModuleResult(Base, TimestampMixin):
     attempt: Mapped["TestAttempt"] = relationship("TestAttempt", back_populates="module_results")
 
     __table_args__ = (UniqueConstraint("attempt_id", "module_id", name="uq_attempt_module"),)
+
+
+class AttemptSummary(Base, TimestampMixin):
+    """
+    Read-optimized snapshot of a finished attempt.
+    Written once when the attempt completes (or lazily on first read for
+    older attempts) so detail and review pages never recompute it.
+    """
+
+    __tablename__ = "attempt_summaries"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    attempt_id: Mapped[int] = mapped_column(
+        ForeignKey("test_attempts.id", ondelete="CASCADE"), unique=True, nullable=False, index=True
+    )
+
+    # Bumped when the document layout changes so stale rows get rebuilt
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Answered questions only
+    # Format: {"algebra": {"correct": 5, "total": 8}, ...}
+    domain_breakdown: Mapped[dict] = mapped_column(JSON, nullable=False)
+
+    # Format: [{"module_id": 1, "section": "math", "module_type": "module_1",
+    #           "difficulty": "standard", "correct_count": 20, "total_count": 22,
+    #           "time_spent_seconds": 1800, "next_module_difficulty": "harder"}, ...]
+    module_results: Mapped[list[dict]] = mapped_column(JSON, nullable=False)
+
+    # Every question in the modules taken, in review order
+    # Format: [{"id": 10, "module_id": 1, "answered": true, "answer": "B",
+    #           "is_correct": true, "time_spent_seconds": 30, "domain": "algebra"}, ...]
+    questions: Mapped[list[dict]] = mapped_column(JSON, nullable=False)
+
+    # Review totals over all questions (unanswered count as wrong)
+    total_correct: Mapped[int] = mapped_column(Integer, default=0)
+    total_questions: Mapped[int] = mapped_column(Integer, default=0)
+    total_time_seconds: Mapped[int] = mapped_column(Integer, default=0)
+
+    # Relationships
+    attempt: Mapped["TestAttempt"] = relationship("TestAttempt", back_populates="summary")
+
+
+class DrillAttempt(Base, TimestampMixin):
+    """
+    A submitted practice drill, written as a single row.
+    Answers are packed into one array instead of a row per question.
+    """
+
+    __tablename__ = "drill_attempts"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+
+    question_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    correct_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    time_spent_seconds: Mapped[int] = mapped_column(Integer, default=0)
+
+    # Format: [[question_id, answer, is_correct], ...] in drill order
+    responses: Mapped[list[list]] = mapped_column(JSON, nullable=False)
+
+    # Deltas folded into StudentAnalytics
+    # Format: {"algebra": [answered, correct], ...}
+    domain_stats: Mapped[dict] = mapped_column(JSON, nullable=False)
+    skill_stats: Mapped[dict] = mapped_column(JSON, nullable=False)
+
+    __table_args__ = (
+        Index("ix_drill_attempts_user_created", "user_id", "created_at"),
+    )
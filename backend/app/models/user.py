@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -30,6 +30,14 @@ class User(Base, TimestampMixin):
 
     last_login_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
+    # Carried in access tokens; bumping it invalidates every token issued before
+    token_version: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+
+    # IANA timezone name; sets the day boundary for study streaks
+    timezone: Mapped[str] = mapped_column(
+        String(64), default="UTC", server_default="UTC", nullable=False
+    )
+
     # Gamification
     total_points: Mapped[int] = mapped_column(default=0)
     level: Mapped[int] = mapped_column(default=1)
@@ -94,12 +102,24 @@ class RefreshToken(Base, TimestampMixin):
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
     token_hash: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
     revoked: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     user_agent: Mapped[str | None] = mapped_column(Text)
     ip_address: Mapped[str | None] = mapped_column(String(45))
 
+    # Finds revoked tokens for the purge; active tokens are left out
+    __table_args__ = (
+        Index(
+            "ix_refresh_tokens_revoked_at",
+            "revoked_at",
+            postgresql_where=text("revoked"),
+            sqlite_where=text("revoked"),
+        ),
+    )
+
 
 # Import at bottom to avoid circular imports
 from app.models.test import TestAttempt  # noqa: E402, F401
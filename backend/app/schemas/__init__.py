@@ -17,6 +17,8 @@ from app.schemas.test import (
     AnswerConstraints,
     AttemptAnswerResponse,
     AttemptListResponse,
+    AutosaveRequest,
+    AutosaveResponse,
     DomainBreakdown,
     ModuleResultResponse,
     PassageCreate,
@@ -85,6 +87,8 @@ __all__ = [
     "AnswerConstraints",
     "AttemptAnswerResponse",
     "AttemptListResponse",
+    "AutosaveRequest",
+    "AutosaveResponse",
     "DomainBreakdown",
     "ModuleResultResponse",
     "PassageCreate",
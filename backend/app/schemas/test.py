@@ -301,6 +301,20 @@ class SubmitModuleRequest(BaseSchema):
     time_spent_seconds: int
 
 
+class AutosaveRequest(BaseSchema):
+    """Schema for autosaving answers in the current module."""
+
+    module_id: int
+    answers: list[SubmitAnswerRequest]
+
+
+class AutosaveResponse(BaseSchema):
+    """Schema for buffered answers of an in-progress attempt."""
+
+    module_id: int | None = None
+    answers: list[SubmitAnswerRequest] = []
+
+
 class AttemptAnswerResponse(BaseSchema):
     """Schema for an answer in attempt response."""
 
@@ -371,3 +385,7 @@ class AttemptListResponse(PaginatedResponse):
     """Paginated list of attempts."""
 
     items: list[TestAttemptResponse]
+    # Cursor mode: totals are only computed on request
+    total: int | None = None
+    total_pages: int | None = None
+    next_cursor: str | None = None
@@ -1,4 +1,5 @@
 from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from pydantic import EmailStr, Field, field_validator
 
@@ -95,6 +96,19 @@ class UserUpdate(BaseSchema):
     full_name: str | None = Field(default=None, max_length=255)
     phone: str | None = Field(default=None, max_length=50)
     avatar_url: str | None = Field(default=None, max_length=500)
+    timezone: str | None = Field(default=None, max_length=64)
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, v: str | None) -> str:
+        # null resets to UTC
+        if v is None:
+            return "UTC"
+        try:
+            ZoneInfo(v)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError("Unknown timezone")
+        return v
 
 
 class UserAdminUpdate(UserUpdate):
@@ -113,6 +127,7 @@ class UserResponse(UserBase, TimestampSchema):
     role: UserRole
     is_active: bool
     is_verified: bool
+    timezone: str = "UTC"
     last_login_at: datetime | None = None
 
 
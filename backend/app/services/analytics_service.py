@@ -2,17 +2,21 @@
 Analytics service for calculating and updating student/platform analytics.
 """
 
-from datetime import UTC, datetime, timedelta
-from collections import defaultdict
+from datetime import UTC, date, datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from sqlalchemy import func, select
+from sqlalchemy import Float, Integer, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.database import dialect_insert
 from app.models import (
     AttemptAnswer,
+    ContentProgress,
     DomainProgress,
+    DrillAttempt,
     Question,
+    QuestionSkill,
     ScoreHistory,
     StudentAnalytics,
     StudySession,
@@ -21,6 +25,55 @@ from app.models import (
 )
 from app.models.enums import AttemptStatus
 
+# Answers kept per domain for trend calculation
+RECENT_RESULTS_WINDOW = 10
+
+
+def local_day(at: datetime, timezone: str | None) -> date:
+    """Calendar day of `at` in the given IANA timezone (UTC if unknown)."""
+    if at.tzinfo is None:
+        # Naive values (SQLite) are stored in UTC
+        at = at.replace(tzinfo=UTC)
+    try:
+        zone = ZoneInfo(timezone or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        zone = UTC
+    return at.astimezone(zone).date()
+
+
+def current_streak(analytics: StudentAnalytics, today: date) -> int:
+    """Stored streak as of `today`; a streak lapses after a full day without activity."""
+    last = analytics.last_active_day
+    if last is None or last < today - timedelta(days=1):
+        return 0
+    return analytics.current_streak_days or 0
+
+
+def accuracy_trend(recent: list[bool]) -> str | None:
+    """Compare the two halves of the recent results window."""
+    if len(recent) < 5:
+        return None
+
+    first_half = sum(recent[:len(recent)//2]) / (len(recent)//2)
+    second_half = sum(recent[len(recent)//2:]) / (len(recent) - len(recent)//2)
+
+    if second_half > first_half + 0.1:
+        return "improving"
+    if second_half < first_half - 0.1:
+        return "declining"
+    return "stable"
+
+
+def merge_performance(performance: dict | None, deltas: dict[str, list[int]]) -> dict:
+    """Add {key: [answered, correct]} deltas to a {key: {count, correct, accuracy}} map."""
+    merged = {key: dict(stats) for key, stats in (performance or {}).items()}
+    for key, (answered, correct) in deltas.items():
+        stats = merged.setdefault(key, {"count": 0, "correct": 0})
+        stats["count"] += answered
+        stats["correct"] += correct
+        stats["accuracy"] = stats["correct"] / stats["count"] if stats["count"] > 0 else 0
+    return merged
+
 
 class AnalyticsService:
     def __init__(self, db: AsyncSession):
@@ -41,23 +94,18 @@ class AnalyticsService:
             analytics = StudentAnalytics(user_id=user_id)
             self.db.add(analytics)
 
-        # Get all completed attempts
+        # Get completed full tests only for aggregate analytics
         result = await self.db.execute(
             select(TestAttempt)
             .where(
                 TestAttempt.user_id == user_id,
                 TestAttempt.status == AttemptStatus.COMPLETED,
+                TestAttempt.scope == "full",
             )
             .options(selectinload(TestAttempt.answers))
             .order_by(TestAttempt.completed_at)
         )
-        all_attempts = result.scalars().all()
-        
-        # Filter for full tests only for aggregate analytics
-        attempts = [
-            a for a in all_attempts 
-            if (not a.domain_breakdown) or (a.domain_breakdown.get("_config", {}).get("scope", "full") == "full")
-        ]
+        attempts = result.scalars().all()
 
         if not attempts:
             return analytics
@@ -86,33 +134,18 @@ class AnalyticsService:
         # Get valid active attempt IDs for filtering nested calculations
         attempt_ids = [a.id for a in attempts]
 
-        # Calculate domain performance
-        domain_stats = await self._calculate_domain_performance(user_id, attempt_ids)
-        analytics.domain_performance = domain_stats
-
-        # Identify weak and strong areas
-        sorted_domains = sorted(
-            domain_stats.items(),
-            key=lambda x: x[1].get("accuracy", 0)
-        )
+        # Domain and skill performance: full tests plus drills
+        drill_domains, drill_skills, drill_questions = await self._drill_totals(user_id)
 
-        analytics.weak_domains = [d[0] for d in sorted_domains[:3] if d[1].get("count", 0) >= 5]
-        analytics.strong_domains = [d[0] for d in sorted_domains[-3:] if d[1].get("count", 0) >= 5]
+        domain_stats = await self._calculate_domain_performance(user_id, attempt_ids)
+        self._set_domain_performance(analytics, merge_performance(domain_stats, drill_domains))
 
-        # Calculate skill performance
         skill_stats = await self._calculate_skill_performance(user_id, attempt_ids)
-        analytics.skill_performance = skill_stats
-
-        sorted_skills = sorted(
-            skill_stats.items(),
-            key=lambda x: x[1].get("accuracy", 0)
-        )
-        analytics.weak_skills = [s[0] for s in sorted_skills[:5] if s[1].get("count", 0) >= 3]
-        analytics.strong_skills = [s[0] for s in sorted_skills[-5:] if s[1].get("count", 0) >= 3]
+        self._set_skill_performance(analytics, merge_performance(skill_stats, drill_skills))
 
         # Time analytics
         total_questions = sum(len(a.answers) if hasattr(a, 'answers') else 0 for a in attempts)
-        analytics.total_questions_answered = total_questions
+        analytics.total_questions_answered = total_questions + drill_questions
 
         # Study time from sessions
         result = await self.db.execute(
@@ -122,15 +155,7 @@ class AnalyticsService:
         total_study_time = result.scalar() or 0
         analytics.total_study_time_minutes = total_study_time
 
-        # Calculate streak
-        analytics.current_streak_days = await self._calculate_current_streak(user_id)
-        analytics.longest_streak_days = max(
-            analytics.longest_streak_days or 0,
-            analytics.current_streak_days
-        )
-
-        # Last activity
-        analytics.last_activity_date = attempts[-1].completed_at if attempts else None
+        # Streaks and last activity are maintained by record_activity
 
         # Predicted score (simple linear regression)
         if len(scores) >= 3:
@@ -146,8 +171,88 @@ class AnalyticsService:
 
         return analytics
 
-    async def _calculate_domain_performance(self, user_id: int, attempt_ids: list[int] | None = None) -> dict:
+    def _set_domain_performance(self, analytics: StudentAnalytics, domain_stats: dict) -> None:
+        analytics.domain_performance = domain_stats
+
+        # Identify weak and strong areas
+        sorted_domains = sorted(
+            domain_stats.items(),
+            key=lambda x: x[1].get("accuracy", 0)
+        )
+        analytics.weak_domains = [d[0] for d in sorted_domains[:3] if d[1].get("count", 0) >= 5]
+        analytics.strong_domains = [d[0] for d in sorted_domains[-3:] if d[1].get("count", 0) >= 5]
+
+    def _set_skill_performance(self, analytics: StudentAnalytics, skill_stats: dict) -> None:
+        analytics.skill_performance = skill_stats
+
+        sorted_skills = sorted(
+            skill_stats.items(),
+            key=lambda x: x[1].get("accuracy", 0)
+        )
+        analytics.weak_skills = [s[0] for s in sorted_skills[:5] if s[1].get("count", 0) >= 3]
+        analytics.strong_skills = [s[0] for s in sorted_skills[-5:] if s[1].get("count", 0) >= 3]
+
+    async def _drill_totals(self, user_id: int) -> tuple[dict, dict, int]:
+        """Summed domain/skill deltas and question count over all of a user's drills."""
+        result = await self.db.execute(
+            select(
+                DrillAttempt.domain_stats, DrillAttempt.skill_stats, DrillAttempt.question_count
+            ).where(DrillAttempt.user_id == user_id)
+        )
+        domains: dict[str, list[int]] = {}
+        skills: dict[str, list[int]] = {}
+        questions = 0
+        for domain_stats, skill_stats, question_count in result:
+            for totals, stats in ((domains, domain_stats), (skills, skill_stats)):
+                for key, (answered, correct) in stats.items():
+                    total = totals.setdefault(key, [0, 0])
+                    total[0] += answered
+                    total[1] += correct
+            questions += question_count
+        return domains, skills, questions
+
+    async def record_drill(
+        self,
+        user_id: int,
+        responses: list[list],
+        domain_stats: dict[str, list[int]],
+        skill_stats: dict[str, list[int]],
+        time_spent_seconds: int = 0,
+    ) -> DrillAttempt:
+        """
+        Store a drill as one row and fold its deltas into the student's
+        analytics, instead of recomputing them.
+        """
+        drill = DrillAttempt(
+            user_id=user_id,
+            question_count=len(responses),
+            correct_count=sum(1 for _, _, is_correct in responses if is_correct),
+            time_spent_seconds=time_spent_seconds,
+            responses=responses,
+            domain_stats=domain_stats,
+            skill_stats=skill_stats,
+        )
+        self.db.add(drill)
+
+        analytics = await self._get_or_create_analytics(user_id)
+        self._set_domain_performance(
+            analytics, merge_performance(analytics.domain_performance, domain_stats)
+        )
+        self._set_skill_performance(
+            analytics, merge_performance(analytics.skill_performance, skill_stats)
+        )
+        analytics.total_questions_answered = (
+            (analytics.total_questions_answered or 0) + drill.question_count
+        )
+        return drill
+
+    async def _calculate_domain_performance(
+        self, user_id: int, attempt_ids: list[int] | None = None
+    ) -> dict:
         """Calculate accuracy per domain."""
+        if attempt_ids == []:
+            return {}
+
         query = select(
             Question.domain,
             func.count(AttemptAnswer.id).label("total"),
@@ -161,8 +266,6 @@ class AnalyticsService:
 
         if attempt_ids is not None:
             query = query.where(TestAttempt.id.in_(attempt_ids))
-        elif attempt_ids == []:
-            return {}
 
         result = await self.db.execute(query.group_by(Question.domain))
 
@@ -179,63 +282,117 @@ class AnalyticsService:
 
     async def _calculate_skill_performance(self, user_id: int, attempt_ids: list[int] | None = None) -> dict:
         """Calculate accuracy per skill tag."""
-        query = select(Question, AttemptAnswer.is_correct).join(
-            AttemptAnswer, AttemptAnswer.question_id == Question.id
+        if attempt_ids == []:
+            return {}
+
+        query = select(
+            QuestionSkill.skill,
+            func.count().label("count"),
+            func.count().filter(AttemptAnswer.is_correct == True).label("correct"),  # noqa: E712
+        ).join(
+            AttemptAnswer, AttemptAnswer.question_id == QuestionSkill.question_id
         ).join(
             TestAttempt, TestAttempt.id == AttemptAnswer.attempt_id
         ).where(
-            TestAttempt.user_id == user_id,
-            Question.skill_tags.isnot(None)
-        )
+            TestAttempt.user_id == user_id
+        ).group_by(QuestionSkill.skill)
 
         if attempt_ids is not None:
             query = query.where(TestAttempt.id.in_(attempt_ids))
-        elif attempt_ids == []:
-            return {}
 
         result = await self.db.execute(query)
 
-        skill_stats = defaultdict(lambda: {"count": 0, "correct": 0})
-
-        for question, is_correct in result:
-            if question.skill_tags:
-                for skill in question.skill_tags:
-                    skill_stats[skill]["count"] += 1
-                    if is_correct:
-                        skill_stats[skill]["correct"] += 1
-
-        # Calculate accuracy
-        for skill in skill_stats:
-            count = skill_stats[skill]["count"]
-            correct = skill_stats[skill]["correct"]
-            skill_stats[skill]["accuracy"] = correct / count if count > 0 else 0
-
-        return dict(skill_stats)
+        return {
+            row.skill: {
+                "count": row.count,
+                "correct": row.correct,
+                "accuracy": row.correct / row.count if row.count > 0 else 0,
+            }
+            for row in result
+        }
 
-    async def _calculate_current_streak(self, user_id: int) -> int:
-        """Calculate current consecutive days with activity."""
+    async def _get_or_create_analytics(self, user_id: int) -> StudentAnalytics:
         result = await self.db.execute(
-            select(func.date(StudySession.started_at).distinct())
-            .where(StudySession.user_id == user_id)
-            .order_by(func.date(StudySession.started_at).desc())
+            select(StudentAnalytics)
+            .where(StudentAnalytics.user_id == user_id)
+            .with_for_update()
         )
-        dates = [row[0] for row in result]
-
-        if not dates:
-            return 0
-
-        today = datetime.now(UTC).date()
-        if dates[0] < today - timedelta(days=1):
-            return 0  # Streak broken
+        analytics = result.scalar_one_or_none()
+        if not analytics:
+            analytics = StudentAnalytics(
+                user_id=user_id, current_streak_days=0, longest_streak_days=0
+            )
+            self.db.add(analytics)
+            await self.db.flush()
+        return analytics
 
-        streak = 1
-        for i in range(len(dates) - 1):
-            if dates[i] - dates[i + 1] == timedelta(days=1):
-                streak += 1
+    async def record_activity(self, user_id: int, at: datetime | None = None) -> StudentAnalytics:
+        """
+        Count activity toward the user's study streak.
+        Advances the stored streak from its last active day, so this is two
+        indexed lookups regardless of history. Days follow the user's timezone.
+        """
+        at = at or datetime.now(UTC)
+        timezone = (await self.db.execute(
+            select(User.timezone).where(User.id == user_id)
+        )).scalar()
+        day = local_day(at, timezone)
+
+        analytics = await self._get_or_create_analytics(user_id)
+        last = analytics.last_active_day
+
+        if last is None or day > last:
+            if last == day - timedelta(days=1):
+                analytics.current_streak_days = (analytics.current_streak_days or 0) + 1
             else:
-                break
+                analytics.current_streak_days = 1
+            analytics.longest_streak_days = max(
+                analytics.longest_streak_days or 0, analytics.current_streak_days
+            )
+            analytics.last_active_day = day
+
+        analytics.last_activity_date = at
+        return analytics
 
-        return streak
+    async def repair_streak(self, user_id: int) -> StudentAnalytics:
+        """
+        Rebuild streak state from the full activity history.
+        Repair job only; live updates go through record_activity.
+        """
+        timezone = (await self.db.execute(
+            select(User.timezone).where(User.id == user_id)
+        )).scalar()
+
+        timestamps = []
+        for query in (
+            select(StudySession.started_at).where(StudySession.user_id == user_id),
+            select(TestAttempt.completed_at).where(
+                TestAttempt.user_id == user_id, TestAttempt.completed_at.isnot(None)
+            ),
+            select(ContentProgress.updated_at).where(ContentProgress.user_id == user_id),
+            select(DrillAttempt.created_at).where(DrillAttempt.user_id == user_id),
+        ):
+            timestamps += (await self.db.execute(query)).scalars().all()
+
+        analytics = await self._get_or_create_analytics(user_id)
+        days = sorted({local_day(at, timezone) for at in timestamps})
+
+        longest = run = 0
+        previous = None
+        for day in days:
+            run = run + 1 if previous == day - timedelta(days=1) else 1
+            longest = max(longest, run)
+            previous = day
+
+        analytics.current_streak_days = run
+        analytics.longest_streak_days = longest
+        analytics.last_active_day = previous
+        if timestamps:
+            latest = max(
+                at if at.tzinfo else at.replace(tzinfo=UTC) for at in timestamps
+            )
+            analytics.last_activity_date = latest
+        return analytics
 
     async def record_study_session(
         self,
@@ -260,6 +417,7 @@ class AnalyticsService:
             questions_correct=questions_correct,
         )
         self.db.add(session)
+        await self.record_activity(user_id, session.ended_at)
         return session
 
     async def record_score_history(self, attempt: TestAttempt) -> ScoreHistory:
@@ -274,49 +432,89 @@ class AnalyticsService:
         self.db.add(history)
         return history
 
-    async def update_domain_progress(self, user_id: int, domain: str, section: str, is_correct: bool):
-        """Update rolling domain progress."""
+    async def record_domain_results(
+        self, user_id: int, results: list[tuple[str, str, bool]]
+    ) -> None:
+        """
+        Apply a whole submission to DomainProgress. results are (domain,
+        section, is_correct) in answer order. Missing rows are created
+        first, then the rows are locked in domain order and read, since
+        recent_results is appended in Python; an upsert then adds the
+        counters in SQL and writes the new recent_results. Concurrent
+        submissions for the user wait on the lock instead of losing updates.
+        """
+        if not results:
+            return
+
+        deltas: dict[str, dict] = {}
+        for domain, section, is_correct in results:
+            delta = deltas.setdefault(
+                domain, {"section": section, "total": 0, "correct": 0, "results": []}
+            )
+            delta["total"] += 1
+            delta["correct"] += int(is_correct)
+            delta["results"].append(is_correct)
+
+        await self.db.execute(
+            dialect_insert(self.db, DomainProgress)
+            .values([
+                {
+                    "user_id": user_id,
+                    "domain": domain,
+                    "section": delta["section"],
+                    "total_questions": 0,
+                    "correct_answers": 0,
+                    "accuracy": 0.0,
+                    "recent_results": [],
+                }
+                for domain, delta in deltas.items()
+            ])
+            .on_conflict_do_nothing(index_elements=["user_id", "domain"])
+        )
         result = await self.db.execute(
-            select(DomainProgress).where(
+            select(DomainProgress.domain, DomainProgress.recent_results)
+            .where(
                 DomainProgress.user_id == user_id,
-                DomainProgress.domain == domain
+                DomainProgress.domain.in_(deltas),
             )
+            .order_by(DomainProgress.domain)
+            .with_for_update()
         )
-        progress = result.scalar_one_or_none()
-
-        if not progress:
-            progress = DomainProgress(
-                user_id=user_id,
-                domain=domain,
-                section=section,
-                recent_results=[]
-            )
-            self.db.add(progress)
-
-        progress.total_questions += 1
-        if is_correct:
-            progress.correct_answers += 1
-
-        progress.accuracy = progress.correct_answers / progress.total_questions
-
-        # Update recent results (keep last 10)
-        recent = progress.recent_results or []
-        recent.append(is_correct)
-        progress.recent_results = recent[-10:]
-
-        # Calculate trend
-        if len(recent) >= 5:
-            first_half = sum(recent[:len(recent)//2]) / (len(recent)//2)
-            second_half = sum(recent[len(recent)//2:]) / (len(recent) - len(recent)//2)
-
-            if second_half > first_half + 0.1:
-                progress.accuracy_trend = "improving"
-            elif second_half < first_half - 0.1:
-                progress.accuracy_trend = "declining"
-            else:
-                progress.accuracy_trend = "stable"
+        existing = dict(result.all())
+
+        rows = []
+        for domain, delta in deltas.items():
+            recent = ((existing.get(domain) or []) + delta["results"])[-RECENT_RESULTS_WINDOW:]
+            rows.append({
+                "user_id": user_id,
+                "domain": domain,
+                "section": delta["section"],
+                "total_questions": delta["total"],
+                "correct_answers": delta["correct"],
+                "accuracy": delta["correct"] / delta["total"],
+                "accuracy_trend": accuracy_trend(recent),
+                "recent_results": recent,
+            })
+
+        stmt = dialect_insert(self.db, DomainProgress).values(rows)
+        total = DomainProgress.total_questions + stmt.excluded.total_questions
+        correct = DomainProgress.correct_answers + stmt.excluded.correct_answers
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "domain"],
+            set_={
+                "total_questions": total,
+                "correct_answers": correct,
+                "accuracy": cast(correct, Float) / total,
+                "accuracy_trend": stmt.excluded.accuracy_trend,
+                "recent_results": stmt.excluded.recent_results,
+                "updated_at": datetime.now(UTC),
+            },
+        )
+        await self.db.execute(stmt)
 
-        return progress
+    async def update_domain_progress(self, user_id: int, domain: str, section: str, is_correct: bool):
+        """Update rolling domain progress for a single answer."""
+        await self.record_domain_results(user_id, [(domain, section, is_correct)])
 
     async def get_student_dashboard_stats(self, user_id: int) -> dict:
         """Get stats for student dashboard."""
@@ -345,8 +543,27 @@ class AnalyticsService:
         )
         recent_sessions = sessions_result.scalars().all()
 
+        timezone = (await self.db.execute(
+            select(User.timezone).where(User.id == user_id)
+        )).scalar()
+        today = local_day(datetime.now(UTC), timezone)
+
+        exposed = None
+        if analytics:
+            # The stored counter is only rewritten on activity, so it goes
+            # stale once a day is missed; expose the streak as of today
+            exposed = {
+                column.key: getattr(analytics, column.key)
+                for column in StudentAnalytics.__table__.columns
+            }
+            exposed["current_streak_days"] = current_streak(analytics, today)
+
         return {
-            "analytics": analytics,
+            "analytics": exposed,
+            "streak": {
+                "current": exposed["current_streak_days"] if exposed else 0,
+                "longest": (analytics.longest_streak_days or 0) if analytics else 0,
+            },
             "score_history": [
                 {
                     "date": s.recorded_at.isoformat(),
@@ -363,7 +580,3 @@ class AnalyticsService:
                 "questions_correct": sum(s.questions_correct for s in recent_sessions),
             }
         }
-
-
-# Need to import Integer for SQL casting
-from sqlalchemy import Integer  # noqa: E402
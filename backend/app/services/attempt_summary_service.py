@@ -0,0 +1,162 @@
+"""
+Attempt summary service.
+
+Finished attempts never change, so everything the detail and review
+pages derive from answers and module results is computed once and
+stored as a single AttemptSummary row.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    AttemptAnswer,
+    AttemptSummary,
+    ModuleResult,
+    Question,
+    TestAttempt,
+    TestModule,
+)
+from app.models.enums import AttemptStatus
+
+# Bump when the stored document layout changes; older rows are rebuilt on read
+SUMMARY_VERSION = 1
+
+SECTION_ORDER = {"reading_writing": 0, "math": 1}
+
+FINISHED_STATUSES = (AttemptStatus.COMPLETED, AttemptStatus.ABANDONED)
+
+
+class AttemptSummaryService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def build(self, attempt: TestAttempt) -> AttemptSummary:
+        """Compute the summary document for an attempt and store it."""
+        # Pending answers/results from the current request must be visible
+        await self.db.flush()
+
+        result = await self.db.execute(
+            select(ModuleResult).where(ModuleResult.attempt_id == attempt.id)
+        )
+        module_results = {mr.module_id: mr for mr in result.scalars().all()}
+
+        result = await self.db.execute(
+            select(TestModule).where(TestModule.id.in_(module_results))
+        )
+        modules = sorted(
+            result.scalars().all(),
+            key=lambda m: (SECTION_ORDER.get(m.section.value, 99), m.order_index),
+        )
+
+        result = await self.db.execute(
+            select(Question.id, Question.module_id, Question.question_number, Question.domain)
+            .where(Question.module_id.in_(module_results))
+        )
+        questions_by_module: dict[int, list] = {}
+        for row in result.all():
+            questions_by_module.setdefault(row.module_id, []).append(row)
+
+        result = await self.db.execute(
+            select(
+                AttemptAnswer.question_id,
+                AttemptAnswer.answer,
+                AttemptAnswer.is_correct,
+                AttemptAnswer.time_spent_seconds,
+            ).where(AttemptAnswer.attempt_id == attempt.id)
+        )
+        answers = {row.question_id: row for row in result.all()}
+
+        module_entries = []
+        question_entries = []
+        domain_breakdown: dict[str, dict] = {}
+        total_correct = 0
+
+        for module in modules:
+            mr = module_results[module.id]
+            module_entries.append({
+                "module_id": module.id,
+                "section": module.section.value,
+                "module_type": module.module.value,
+                "difficulty": module.difficulty.value,
+                "correct_count": mr.correct_count,
+                "total_count": mr.total_count,
+                "time_spent_seconds": mr.time_spent_seconds,
+                "next_module_difficulty": (
+                    mr.next_module_difficulty.value if mr.next_module_difficulty else None
+                ),
+            })
+
+            for question in sorted(
+                questions_by_module.get(module.id, []), key=lambda q: q.question_number
+            ):
+                answer = answers.get(question.id)
+                domain = question.domain.value if question.domain else None
+                question_entries.append({
+                    "id": question.id,
+                    "module_id": module.id,
+                    "answered": answer is not None,
+                    "answer": answer.answer if answer else None,
+                    "is_correct": answer.is_correct if answer else None,
+                    "time_spent_seconds": answer.time_spent_seconds if answer else None,
+                    "domain": domain,
+                })
+
+                if answer and answer.is_correct:
+                    total_correct += 1
+                if answer and domain:
+                    stats = domain_breakdown.setdefault(domain, {"correct": 0, "total": 0})
+                    stats["total"] += 1
+                    if answer.is_correct:
+                        stats["correct"] += 1
+
+        values = {
+            "version": SUMMARY_VERSION,
+            "domain_breakdown": domain_breakdown,
+            "module_results": module_entries,
+            "questions": question_entries,
+            "total_correct": total_correct,
+            "total_questions": len(question_entries),
+            "total_time_seconds": sum(
+                (mr.time_spent_seconds or 0) for mr in module_results.values()
+            ),
+        }
+
+        result = await self.db.execute(
+            select(AttemptSummary).where(AttemptSummary.attempt_id == attempt.id)
+        )
+        summary = result.scalar_one_or_none()
+        if summary:
+            for key, value in values.items():
+                setattr(summary, key, value)
+            return summary
+
+        summary = AttemptSummary(attempt_id=attempt.id, **values)
+        try:
+            async with self.db.begin_nested():
+                self.db.add(summary)
+        except IntegrityError:
+            # Another request materialized it first
+            result = await self.db.execute(
+                select(AttemptSummary).where(AttemptSummary.attempt_id == attempt.id)
+            )
+            summary = result.scalar_one()
+        return summary
+
+    async def get_or_build(self, attempt: TestAttempt) -> AttemptSummary | None:
+        """
+        Stored summary for a finished attempt, building it on first read.
+        Returns None while the attempt is still in progress.
+        """
+        if attempt.status not in FINISHED_STATUSES:
+            return None
+
+        result = await self.db.execute(
+            select(AttemptSummary).where(AttemptSummary.attempt_id == attempt.id)
+        )
+        summary = result.scalar_one_or_none()
+        if summary and summary.version == SUMMARY_VERSION:
+            return summary
+
+        return await self.build(attempt)
@@ -1,7 +1,7 @@
 import hashlib
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -9,16 +9,18 @@ from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
 )
-from app.models import RefreshToken, Subscription, SubscriptionPlan, SubscriptionStatus, User
+from app.models import Subscription, SubscriptionPlan, SubscriptionStatus, User
 from app.schemas import TokenResponse, UserRegister
+from app.services.refresh_token_store import get_token_store
 
 
 class AuthService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.tokens = get_token_store(db)
 
     async def register_user(self, data: UserRegister) -> User:
         """Register a new user."""
@@ -30,7 +32,7 @@ class AuthService:
         # Create user
         user = User(
             email=data.email,
-            password_hash=hash_password(data.password),
+            password_hash=await hash_password_async(data.password),
             full_name=data.full_name,
             phone=data.phone,
         )
@@ -55,7 +57,7 @@ class AuthService:
         if not user:
             return None
 
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             return None
 
         # Update last login
@@ -73,22 +75,20 @@ class AuthService:
         # Create access token
         access_token = create_access_token(
             subject=user.id,
-            additional_claims={"role": user.role.value},
+            additional_claims={"role": user.role.value, "ver": user.token_version},
         )
 
         # Create refresh token
         refresh_token = create_refresh_token(subject=user.id)
 
-        # Store refresh token hash in database
-        token_hash = hashlib.sha256(refresh_token.encode()).hexdigest()
-        refresh_token_record = RefreshToken(
-            user_id=user.id,
-            token_hash=token_hash,
+        # Store refresh token hash
+        await self.tokens.add(
+            user.id,
+            hashlib.sha256(refresh_token.encode()).hexdigest(),
             expires_at=datetime.now(UTC) + timedelta(days=settings.refresh_token_expire_days),
             user_agent=user_agent,
             ip_address=ip_address,
         )
-        self.db.add(refresh_token_record)
 
         token_response = TokenResponse(
             access_token=access_token,
@@ -113,18 +113,10 @@ class AuthService:
         except Exception:
             return None
 
-        # Verify token exists and is not revoked
+        # Revoke the old token if it is still valid (token rotation); a
+        # token used twice only succeeds once
         token_hash = hashlib.sha256(refresh_token.encode()).hexdigest()
-        result = await self.db.execute(
-            select(RefreshToken).where(
-                RefreshToken.token_hash == token_hash,
-                RefreshToken.revoked == False,  # noqa: E712
-                RefreshToken.expires_at > datetime.now(UTC),
-            )
-        )
-        stored_token = result.scalar_one_or_none()
-
-        if not stored_token:
+        if await self.tokens.consume(token_hash) != user_id:
             return None
 
         # Get user
@@ -134,54 +126,37 @@ class AuthService:
         if not user or not user.is_active:
             return None
 
-        # Revoke old token (token rotation)
-        stored_token.revoked = True
-        stored_token.revoked_at = datetime.now(UTC)
-
         # Create new tokens
         return await self.create_tokens(user, user_agent, ip_address)
 
     async def revoke_refresh_token(self, refresh_token: str) -> bool:
         """Revoke a specific refresh token."""
         token_hash = hashlib.sha256(refresh_token.encode()).hexdigest()
-        result = await self.db.execute(
-            select(RefreshToken).where(RefreshToken.token_hash == token_hash)
-        )
-        stored_token = result.scalar_one_or_none()
-
-        if stored_token:
-            stored_token.revoked = True
-            stored_token.revoked_at = datetime.now(UTC)
-            return True
-
-        return False
+        return await self.tokens.revoke(token_hash)
 
     async def revoke_all_user_tokens(self, user_id: int) -> int:
-        """Revoke all refresh tokens for a user. Returns count of revoked tokens."""
-        result = await self.db.execute(
-            select(RefreshToken).where(
-                RefreshToken.user_id == user_id,
-                RefreshToken.revoked == False,  # noqa: E712
-            )
+        """
+        Revoke all refresh tokens for a user and invalidate their access
+        tokens by bumping the token version. Returns count of revoked
+        refresh tokens. Callers drop the cached user once committed.
+        """
+        await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(token_version=User.token_version + 1)
         )
-        tokens = result.scalars().all()
-
-        count = 0
-        for token in tokens:
-            token.revoked = True
-            token.revoked_at = datetime.now(UTC)
-            count += 1
-
-        return count
+        return await self.tokens.revoke_all(user_id)
 
     async def change_password(
         self, user: User, current_password: str, new_password: str
     ) -> bool:
         """Change user's password."""
-        if not verify_password(current_password, user.password_hash):
+        # Authenticated users come from the cache without their hash
+        await self.db.refresh(user, ["password_hash"])
+        if not await verify_password_async(current_password, user.password_hash):
             return False
 
-        user.password_hash = hash_password(new_password)
+        user.password_hash = await hash_password_async(new_password)
 
         # Revoke all refresh tokens on password change
         await self.revoke_all_user_tokens(user.id)
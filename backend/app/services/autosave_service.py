@@ -0,0 +1,109 @@
+"""
+Autosave buffer for in-progress attempts.
+
+Answers saved mid-module go to a cache hash per attempt instead of the
+database (write-behind). A periodic task copies dirty buffers into
+TestAttempt.autosave_snapshot so progress survives a cache flush, and
+submit_module merges whatever is buffered into the submitted answers.
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import Cache
+from app.core.config import settings
+from app.models import TestAttempt
+from app.models.enums import AttemptStatus
+
+DIRTY_KEY = "autosave:dirty"
+META_FIELD = "_meta"
+
+
+def _buffer_key(attempt_id: int) -> str:
+    return f"attempt:{attempt_id}:autosave"
+
+
+class AutosaveService:
+    def __init__(self, cache: Cache):
+        self.cache = cache
+
+    async def get_meta(self, attempt_id: int) -> dict | None:
+        """Owner and module the buffer was validated for, if buffered."""
+        buffer = await self.cache.hgetall_json(_buffer_key(attempt_id))
+        return buffer.get(META_FIELD)
+
+    async def save(self, attempt_id: int, meta: dict, answers: list[dict]) -> None:
+        """Merge answer deltas into the buffer and mark it for flushing."""
+        mapping: dict[str, Any] = {META_FIELD: meta}
+        for answer in answers:
+            mapping[str(answer["question_id"])] = {
+                "answer": answer.get("answer"),
+                "time_spent_seconds": answer.get("time_spent_seconds"),
+                "is_flagged": answer.get("is_flagged", False),
+            }
+        await self.cache.hset_json(
+            _buffer_key(attempt_id), mapping, ttl=settings.autosave_ttl_seconds
+        )
+        await self.cache.sadd(DIRTY_KEY, str(attempt_id))
+
+    async def load(self, attempt_id: int) -> dict | None:
+        """
+        Buffered state as {"user_id", "module_id", "answers": {question_id: {...}}},
+        or None when nothing is buffered.
+        """
+        buffer = await self.cache.hgetall_json(_buffer_key(attempt_id))
+        meta = buffer.pop(META_FIELD, None)
+        if not meta:
+            return None
+        return {
+            "user_id": meta["user_id"],
+            "module_id": meta["module_id"],
+            "answers": {int(qid): value for qid, value in buffer.items()},
+        }
+
+    async def clear(self, attempt_id: int) -> None:
+        await self.cache.delete(_buffer_key(attempt_id))
+        await self.cache.srem(DIRTY_KEY, str(attempt_id))
+
+    async def flush_to_database(self, db: AsyncSession) -> int:
+        """Persist dirty buffers as attempt snapshots. Returns attempts written."""
+        snapshots = []
+        for attempt_id in await self.cache.smembers(DIRTY_KEY):
+            # Unmark first; a save racing with this flush re-marks the attempt
+            await self.cache.srem(DIRTY_KEY, attempt_id)
+            state = await self.load(int(attempt_id))
+            if not state:
+                continue
+            snapshots.append({
+                "id": int(attempt_id),
+                "autosave_snapshot": {
+                    "module_id": state["module_id"],
+                    "answers": {str(qid): value for qid, value in state["answers"].items()},
+                    "saved_at": datetime.now(UTC).isoformat(),
+                },
+            })
+
+        if snapshots:
+            # Finished attempts are skipped; their buffer was merged at submit
+            await db.execute(
+                update(TestAttempt)
+                .where(TestAttempt.status == AttemptStatus.IN_PROGRESS)
+                .execution_options(synchronize_session=None),
+                snapshots,
+            )
+        return len(snapshots)
+
+
+def snapshot_state(attempt: TestAttempt) -> dict | None:
+    """Autosave state from the database snapshot, in the same shape as load()."""
+    snapshot = attempt.autosave_snapshot
+    if not snapshot:
+        return None
+    return {
+        "user_id": attempt.user_id,
+        "module_id": snapshot["module_id"],
+        "answers": {int(qid): value for qid, value in snapshot["answers"].items()},
+    }
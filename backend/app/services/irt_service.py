@@ -0,0 +1,370 @@
+"""
+Item Response Theory (IRT) service.
+
+Two halves with very different cost profiles:
+
+1. Ability estimation (request path) - pure Python EAP over a fixed
+   quadrature grid, with per-item likelihood curves cached. A module's
+   worth of responses takes around a hundred microseconds.
+2. Item calibration (offline) - marginal maximum likelihood via EM
+   (Bock-Aitkin) over AttemptAnswer response data, vectorized with NumPy.
+   Responses are grouped by attempt and packed into compact NumPy chunks
+   (9 bytes per response), which are kept for every EM cycle. The E-step
+   works one chunk at a time, so its temporary arrays are
+   O(chunk x quadrature points); total memory grows with the packed
+   responses, not with their ORM rows.
+
+Item model is 3PL with a fixed guessing parameter: c = 1/options for
+multiple choice (0.25) and c = 0 for grid-in, which reduces to 2PL.
+"""
+
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import AttemptAnswer, Question, TestAttempt
+from app.models.enums import AttemptStatus, QuestionType
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Quadrature grid for ability: 41 points on [-4, 4] with a standard normal prior
+QUADRATURE_POINTS = [-4.0 + 0.2 * i for i in range(41)]
+_PRIOR = [math.exp(-0.5 * t * t) for t in QUADRATURE_POINTS]
+PRIOR_WEIGHTS = [w / sum(_PRIOR) for w in _PRIOR]
+_LOG_PRIOR = tuple(math.log(w) for w in PRIOR_WEIGHTS)
+
+# Parameter bounds keep badly-behaved items from diverging
+MIN_DISCRIMINATION = 0.2
+MAX_DISCRIMINATION = 4.0
+MAX_ABS_DIFFICULTY = 4.0
+
+# Ridge priors used in the M-step: a ~ N(1, 1), intercept ~ N(0, 3^2)
+DISCRIMINATION_PRIOR_VAR = 1.0
+INTERCEPT_PRIOR_VAR = 9.0
+
+
+@dataclass
+class ItemParameters:
+    discrimination: float  # a
+    difficulty: float  # b
+    guessing: float = 0.0  # c
+
+
+@dataclass
+class AbilityEstimate:
+    theta: float
+    standard_error: float
+
+
+def guessing_for_type(question_type: QuestionType) -> float:
+    """Fixed lower asymptote by question format."""
+    if question_type == QuestionType.STUDENT_PRODUCED_RESPONSE:
+        return 0.0
+    return 0.25
+
+
+def item_parameters(question: Question) -> ItemParameters | None:
+    """Calibrated parameters for a question, or None if it has not been calibrated."""
+    if question.irt_discrimination is None or question.irt_difficulty is None:
+        return None
+    return ItemParameters(
+        discrimination=question.irt_discrimination,
+        difficulty=question.irt_difficulty,
+        guessing=question.irt_guessing or 0.0,
+    )
+
+
+def probability_correct(theta: float, item: ItemParameters) -> float:
+    """3PL probability of a correct response at ability theta."""
+    z = item.discrimination * (theta - item.difficulty)
+    return item.guessing + (1.0 - item.guessing) / (1.0 + math.exp(-z))
+
+
+@lru_cache(maxsize=8192)
+def _log_curves(a: float, b: float, c: float) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    """Log P(correct) and log P(incorrect) over the quadrature grid, cached per item."""
+    item = ItemParameters(discrimination=a, difficulty=b, guessing=c)
+    probabilities = [
+        min(max(probability_correct(theta, item), 1e-9), 1.0 - 1e-9)
+        for theta in QUADRATURE_POINTS
+    ]
+    return (
+        tuple(math.log(p) for p in probabilities),
+        tuple(math.log(1.0 - p) for p in probabilities),
+    )
+
+
+def estimate_ability(responses: Iterable[tuple[ItemParameters, bool]]) -> AbilityEstimate:
+    """
+    Expected a posteriori (EAP) ability estimate.
+
+    Args:
+        responses: (item parameters, is_correct) pairs
+
+    Returns:
+        Posterior mean and standard deviation of theta
+    """
+    log_posterior = list(_LOG_PRIOR)
+
+    for item, is_correct in responses:
+        log_p, log_q = _log_curves(item.discrimination, item.difficulty, item.guessing)
+        curve = log_p if is_correct else log_q
+        log_posterior = [lp + c for lp, c in zip(log_posterior, curve)]
+
+    peak = max(log_posterior)
+    weights = [math.exp(lp - peak) for lp in log_posterior]
+    total = sum(weights)
+
+    mean = sum(w * t for w, t in zip(weights, QUADRATURE_POINTS)) / total
+    variance = sum(w * (t - mean) ** 2 for w, t in zip(weights, QUADRATURE_POINTS)) / total
+    return AbilityEstimate(theta=mean, standard_error=math.sqrt(variance))
+
+
+# === Calibration ===
+
+
+@dataclass
+class ResponseChunk:
+    """
+    A block of responses covering whole attempts.
+
+    All arrays have one entry per response and are sorted by attempt.
+    `attempt` holds chunk-local attempt indices (0..n-1), `item` holds
+    indices into the calibration item list.
+    """
+
+    attempt: "np.ndarray"  # int32
+    item: "np.ndarray"  # int32
+    correct: "np.ndarray"  # int8
+
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError as e:  # pragma: no cover - depends on environment
+        raise RuntimeError(
+            "IRT calibration requires NumPy. Install with: pip install -e '.[irt]'"
+        ) from e
+    return np
+
+
+class ResponsePacker:
+    """
+    Packs (attempt_id, question_id, is_correct) rows into NumPy chunks.
+
+    Rows must arrive ordered by attempt_id. Chunks close on attempt
+    boundaries, so a chunk may slightly exceed chunk_size. Rows for
+    questions outside the item index are skipped.
+    """
+
+    def __init__(self, item_index: dict[int, int], chunk_size: int):
+        self.np = _require_numpy()
+        self.item_index = item_index
+        self.chunk_size = chunk_size
+        self._reset()
+
+    def _reset(self) -> None:
+        self.attempts: list[int] = []
+        self.items: list[int] = []
+        self.correct: list[bool] = []
+        self.local = -1
+        self.last_attempt: int | None = None
+
+    def add(self, attempt_id: int, question_id: int, is_correct: bool) -> ResponseChunk | None:
+        """Add a row, returning a finished chunk when one is ready."""
+        index = self.item_index.get(question_id)
+        if index is None:
+            return None
+
+        chunk = None
+        if attempt_id != self.last_attempt:
+            if len(self.items) >= self.chunk_size:
+                chunk = self.flush()
+            self.local += 1
+            self.last_attempt = attempt_id
+
+        self.attempts.append(self.local)
+        self.items.append(index)
+        self.correct.append(bool(is_correct))
+        return chunk
+
+    def flush(self) -> ResponseChunk | None:
+        """Return whatever is buffered as a chunk."""
+        if not self.items:
+            return None
+        np = self.np
+        chunk = ResponseChunk(
+            attempt=np.asarray(self.attempts, dtype=np.int32),
+            item=np.asarray(self.items, dtype=np.int32),
+            correct=np.asarray(self.correct, dtype=np.int8),
+        )
+        self._reset()
+        return chunk
+
+
+def build_chunks(
+    rows: Iterable[tuple[int, int, bool]],
+    item_index: dict[int, int],
+    chunk_size: int,
+) -> list[ResponseChunk]:
+    """Pack already-materialized rows (ordered by attempt) into chunks."""
+    packer = ResponsePacker(item_index, chunk_size)
+    chunks = [chunk for row in rows if (chunk := packer.add(*row)) is not None]
+    if (chunk := packer.flush()) is not None:
+        chunks.append(chunk)
+    return chunks
+
+
+def calibrate_items(
+    chunks: list[ResponseChunk],
+    guessing: "np.ndarray",
+    iterations: int = 25,
+    tolerance: float = 1e-3,
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Fit item discrimination and difficulty with Bock-Aitkin EM.
+
+    Args:
+        chunks: Response data grouped by attempt (see build_chunks)
+        guessing: Fixed guessing parameter per item
+        iterations: Maximum EM cycles
+        tolerance: Stop when no parameter moves more than this
+
+    Returns:
+        (discrimination, difficulty) arrays, one entry per item
+    """
+    np = _require_numpy()
+
+    n_items = len(guessing)
+    theta = np.asarray(QUADRATURE_POINTS)
+    log_prior = np.log(np.asarray(PRIOR_WEIGHTS))
+    c = np.asarray(guessing, dtype=np.float64)[:, None]
+
+    a = np.ones(n_items)
+    d = np.zeros(n_items)  # intercept, d = -a * b
+
+    for _ in range(iterations):
+        # P[item, q]
+        s = 1.0 / (1.0 + np.exp(-(a[:, None] * theta[None, :] + d[:, None])))
+        p = np.clip(c + (1.0 - c) * s, 1e-9, 1.0 - 1e-9)
+        log_p, log_q = np.log(p), np.log1p(-p)
+
+        # E-step: expected responses (n) and corrects (r) at each quadrature point
+        n = np.zeros((n_items, len(theta)))
+        r = np.zeros((n_items, len(theta)))
+        for chunk in chunks:
+            contributions = np.where(
+                chunk.correct[:, None] > 0, log_p[chunk.item], log_q[chunk.item]
+            )
+            starts = np.flatnonzero(np.r_[True, np.diff(chunk.attempt) != 0])
+            log_like = np.add.reduceat(contributions, starts, axis=0) + log_prior
+            log_like -= log_like.max(axis=1, keepdims=True)
+            posterior = np.exp(log_like)
+            posterior /= posterior.sum(axis=1, keepdims=True)
+
+            # Spread each response's posterior onto its item
+            response_posterior = posterior[chunk.attempt]
+            for q in range(len(theta)):
+                weights = response_posterior[:, q]
+                n[:, q] += np.bincount(chunk.item, weights=weights, minlength=n_items)
+                r[:, q] += np.bincount(
+                    chunk.item, weights=weights * chunk.correct, minlength=n_items
+                )
+
+        # M-step: one Fisher scoring step per item on (a, d), all items at once
+        dp_dz = (1.0 - c) * s * (1.0 - s)
+        gradient_z = (r / p - (n - r) / (1.0 - p)) * dp_dz
+        info_z = n * dp_dz**2 / (p * (1.0 - p))
+
+        grad_a = (gradient_z * theta).sum(axis=1) - (a - 1.0) / DISCRIMINATION_PRIOR_VAR
+        grad_d = gradient_z.sum(axis=1) - d / INTERCEPT_PRIOR_VAR
+        info_aa = (info_z * theta**2).sum(axis=1) + 1.0 / DISCRIMINATION_PRIOR_VAR
+        info_ad = (info_z * theta).sum(axis=1)
+        info_dd = info_z.sum(axis=1) + 1.0 / INTERCEPT_PRIOR_VAR
+
+        det = info_aa * info_dd - info_ad**2
+        step_a = (info_dd * grad_a - info_ad * grad_d) / det
+        step_d = (info_aa * grad_d - info_ad * grad_a) / det
+
+        new_a = np.clip(a + step_a, MIN_DISCRIMINATION, MAX_DISCRIMINATION)
+        new_d = np.clip(d + step_d, -MAX_ABS_DIFFICULTY * new_a, MAX_ABS_DIFFICULTY * new_a)
+
+        converged = max(np.abs(new_a - a).max(initial=0.0), np.abs(new_d - d).max(initial=0.0))
+        a, d = new_a, new_d
+        if converged < tolerance:
+            break
+
+    return a, -d / a
+
+
+async def calibrate_question_bank(db: AsyncSession) -> int:
+    """
+    Calibrate every question with enough responses and store its parameters.
+
+    Only answers from completed attempts are used. Returns the number of
+    questions updated.
+    """
+    result = await db.execute(
+        select(AttemptAnswer.question_id, func.count())
+        .join(TestAttempt, TestAttempt.id == AttemptAnswer.attempt_id)
+        .where(TestAttempt.status == AttemptStatus.COMPLETED)
+        .group_by(AttemptAnswer.question_id)
+        .having(func.count() >= settings.irt_min_responses)
+    )
+    sample_sizes = dict(result.all())
+    if not sample_sizes:
+        return 0
+
+    result = await db.execute(
+        select(Question.id, Question.question_type).where(Question.id.in_(sample_sizes))
+    )
+    questions = result.all()
+    item_index = {question_id: i for i, (question_id, _) in enumerate(questions)}
+
+    np = _require_numpy()
+    guessing = np.asarray([guessing_for_type(qtype) for _, qtype in questions])
+
+    # Responses ordered by attempt so chunks hold whole attempts
+    stream = await db.stream(
+        select(AttemptAnswer.attempt_id, AttemptAnswer.question_id, AttemptAnswer.is_correct)
+        .join(TestAttempt, TestAttempt.id == AttemptAnswer.attempt_id)
+        .where(TestAttempt.status == AttemptStatus.COMPLETED)
+        .order_by(AttemptAnswer.attempt_id)
+        .execution_options(yield_per=10_000)
+    )
+    packer = ResponsePacker(item_index, settings.irt_chunk_size)
+    chunks = []
+    async for attempt_id, question_id, is_correct in stream:
+        if (chunk := packer.add(attempt_id, question_id, is_correct)) is not None:
+            chunks.append(chunk)
+    if (chunk := packer.flush()) is not None:
+        chunks.append(chunk)
+
+    discrimination, difficulty = calibrate_items(
+        chunks, guessing, iterations=settings.irt_em_iterations
+    )
+
+    calibrated_at = datetime.now(UTC)
+    await db.execute(
+        update(Question),
+        [
+            {
+                "id": question_id,
+                "irt_discrimination": float(discrimination[i]),
+                "irt_difficulty": float(difficulty[i]),
+                "irt_guessing": float(guessing[i]),
+                "irt_sample_size": sample_sizes[question_id],
+                "irt_calibrated_at": calibrated_at,
+            }
+            for question_id, i in item_index.items()
+        ],
+    )
+    return len(item_index)
@@ -0,0 +1,367 @@
+"""
+Leaderboard service.
+
+Live rankings are Redis sorted sets, one per (scope, period), updated as
+attempts complete, so top-N and "my rank" lookups are O(log n). A
+periodic task copies each board into the Leaderboard table, which keeps
+history after the weekly/monthly sets expire and serves reads if the
+cache is lost.
+
+Completed attempts are the source of truth: rebuild() recomputes the
+current boards from them, so increments lost to a cache failure or a
+flushed Redis are repaired. Materialization never lets a board with
+less than its stored snapshot overwrite it; it rebuilds that board
+first.
+
+Score is XP: one point per correct answer on completed attempts.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import Cache
+from app.models import ClassStudent, Leaderboard, OrganizationMember, TestAttempt
+from app.models.enums import AttemptStatus
+from app.services.membership_service import get_memberships
+
+PERIOD_TYPES = ("weekly", "monthly", "alltime")
+
+ALLTIME_START = datetime(1970, 1, 1, tzinfo=UTC)
+ALLTIME_END = datetime(9999, 12, 31, tzinfo=UTC)
+
+BOARDS_KEY = "leaderboard:boards"
+
+# Finished weekly/monthly boards stay in the cache this long after the
+# period ends so the final materialization cannot miss them
+FINISHED_BOARD_RETENTION = timedelta(days=7)
+
+MATERIALIZE_PAGE_SIZE = 1000
+
+SCOPE_TYPES = ("global", "org", "class")
+
+# (tests, correct, answered, seconds) per user, as kept in a board's stats hash
+STAT_FIELDS = ("tests", "correct", "answered", "seconds")
+
+
+def period_bounds(period_type: str, now: datetime) -> tuple[datetime, datetime]:
+    """Start (inclusive) and end (exclusive) of the period containing now."""
+    if period_type == "alltime":
+        return ALLTIME_START, ALLTIME_END
+
+    day = now.astimezone(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    if period_type == "weekly":
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=7)
+
+    start = day.replace(day=1)
+    if start.month == 12:
+        return start, start.replace(year=start.year + 1, month=1)
+    return start, start.replace(month=start.month + 1)
+
+
+def board_key(
+    scope_type: str, scope_id: int | None, period_type: str, period_start: datetime
+) -> str:
+    return f"leaderboard:{scope_type}:{scope_id or 0}:{period_type}:{period_start:%Y%m%d}"
+
+
+def parse_board_key(key: str) -> tuple[str, int | None, str, datetime]:
+    _, scope_type, scope_id, period_type, start = key.split(":")
+    return (
+        scope_type,
+        int(scope_id) or None,
+        period_type,
+        datetime.strptime(start, "%Y%m%d").replace(tzinfo=UTC),
+    )
+
+
+class LeaderboardService:
+    def __init__(self, db: AsyncSession, cache: Cache):
+        self.db = db
+        self.cache = cache
+
+    async def _scopes_for_user(self, user_id: int) -> list[tuple[str, int | None]]:
+        scopes: list[tuple[str, int | None]] = [("global", None)]
+        scopes += [
+            ("org", org_id) for org_id in await get_memberships(self.db, user_id, self.cache)
+        ]
+
+        result = await self.db.execute(
+            select(ClassStudent.class_id).where(
+                ClassStudent.student_id == user_id,
+                ClassStudent.is_active == True,  # noqa: E712
+            )
+        )
+        scopes += [("class", class_id) for class_id in result.scalars().all()]
+        return scopes
+
+    async def record_attempt(self, attempt: TestAttempt) -> None:
+        """Add a completed attempt to every board the student appears on."""
+        now = attempt.completed_at or datetime.now(UTC)
+        points = (attempt.reading_writing_raw_score or 0) + (attempt.math_raw_score or 0)
+        member = str(attempt.user_id)
+        stats = {
+            "tests": 1,
+            "correct": points,
+            "answered": attempt.question_count,
+            "seconds": attempt.total_time_seconds,
+        }
+
+        keys = []
+        # Every board in one round trip
+        async with self.cache.pipeline() as pipe:
+            for scope_type, scope_id in await self._scopes_for_user(attempt.user_id):
+                for period_type in PERIOD_TYPES:
+                    start, end = period_bounds(period_type, now)
+                    key = board_key(scope_type, scope_id, period_type, start)
+                    stats_key = f"{key}:stats"
+
+                    pipe.zincrby(key, member, points)
+                    for name, amount in stats.items():
+                        pipe.hincrby(stats_key, f"{member}:{name}", amount or 0)
+
+                    if period_type != "alltime":
+                        ttl = int((end - now + FINISHED_BOARD_RETENTION).total_seconds())
+                        pipe.expire(key, ttl)
+                        pipe.expire(stats_key, ttl)
+                    keys.append(key)
+            pipe.sadd(BOARDS_KEY, *keys)
+
+    def _attempts(self, columns, scope_type: str, period_type: str, period_start: datetime):
+        """
+        Select `columns` over completed attempts on a board's period, with
+        the board's scope id as the first column. Org and class boards use
+        current memberships.
+        """
+        _, period_end = period_bounds(period_type, period_start)
+        if scope_type == "org":
+            scope_column = OrganizationMember.organization_id
+        elif scope_type == "class":
+            scope_column = ClassStudent.class_id
+        else:
+            scope_column = literal(None)
+
+        query = select(scope_column, *columns).where(
+            TestAttempt.status == AttemptStatus.COMPLETED,
+            TestAttempt.completed_at >= period_start,
+            TestAttempt.completed_at < period_end,
+        )
+        if scope_type == "org":
+            query = query.join(
+                OrganizationMember, OrganizationMember.user_id == TestAttempt.user_id
+            ).where(OrganizationMember.is_active == True)  # noqa: E712
+        elif scope_type == "class":
+            query = query.join(
+                ClassStudent, ClassStudent.student_id == TestAttempt.user_id
+            ).where(ClassStudent.is_active == True)  # noqa: E712
+        return query, scope_column
+
+    async def _totals(
+        self,
+        scope_type: str,
+        period_type: str,
+        period_start: datetime,
+        scope_id: int | None = None,
+    ) -> dict[int | None, dict[int, tuple[int, int, int, int]]]:
+        """
+        Per-user totals from completed attempts, grouped by board:
+        {scope_id: {user_id: (tests, correct, answered, seconds)}}, where
+        correct answers are also the user's points.
+        """
+        points = func.coalesce(TestAttempt.reading_writing_raw_score, 0) + func.coalesce(
+            TestAttempt.math_raw_score, 0
+        )
+        query, scope_column = self._attempts(
+            (
+                TestAttempt.user_id,
+                func.count(),
+                func.sum(points),
+                func.sum(func.coalesce(TestAttempt.question_count, 0)),
+                func.sum(func.coalesce(TestAttempt.total_time_seconds, 0)),
+            ),
+            scope_type,
+            period_type,
+            period_start,
+        )
+        if scope_id is not None:
+            query = query.where(scope_column == scope_id)
+
+        totals: dict[int | None, dict[int, tuple[int, int, int, int]]] = {}
+        result = await self.db.execute(query.group_by(scope_column, TestAttempt.user_id))
+        for board_scope_id, user_id, *values in result.all():
+            totals.setdefault(board_scope_id, {})[user_id] = tuple(int(v or 0) for v in values)
+        return totals
+
+    async def _attempt_count(
+        self, scope_type: str, scope_id: int | None, period_type: str, period_start: datetime
+    ) -> int:
+        """Completed attempts a board should hold, from the database."""
+        query, scope_column = self._attempts((), scope_type, period_type, period_start)
+        if scope_id is not None:
+            query = query.where(scope_column == scope_id)
+        result = await self.db.execute(
+            select(func.count()).select_from(query.with_only_columns(TestAttempt.id).subquery())
+        )
+        return result.scalar() or 0
+
+    async def _replace_board(
+        self,
+        key: str,
+        period_type: str,
+        period_start: datetime,
+        now: datetime,
+        entries: dict[int, tuple[int, int, int, int]],
+    ) -> None:
+        """Swap a live board for the given totals in one MULTI."""
+        _, end = period_bounds(period_type, period_start)
+        stats_key = f"{key}:stats"
+        async with self.cache.pipeline() as pipe:
+            pipe.delete(key, stats_key)
+            if entries:
+                pipe.zadd(key, {str(user_id): values[1] for user_id, values in entries.items()})
+                pipe.hset_json(stats_key, {
+                    f"{user_id}:{name}": value
+                    for user_id, values in entries.items()
+                    for name, value in zip(STAT_FIELDS, values, strict=True)
+                })
+                if period_type != "alltime":
+                    ttl = int((end - now + FINISHED_BOARD_RETENTION).total_seconds())
+                    pipe.expire(key, ttl)
+                    pipe.expire(stats_key, ttl)
+                pipe.sadd(BOARDS_KEY, key)
+
+    async def rebuild_board(self, key: str, now: datetime | None = None) -> None:
+        """Recompute one live board from completed attempts."""
+        scope_type, scope_id, period_type, period_start = parse_board_key(key)
+        now = now or datetime.now(UTC)
+        totals = await self._totals(scope_type, period_type, period_start, scope_id)
+        await self._replace_board(key, period_type, period_start, now, totals.get(scope_id, {}))
+
+    async def rebuild(self, now: datetime | None = None) -> int:
+        """
+        Recompute every current board from completed attempts, repairing
+        increments lost by the cache. Attempts completing while a board is
+        replaced may be missed until the next rebuild. Returns the number
+        of boards written.
+        """
+        now = now or datetime.now(UTC)
+        boards = 0
+        for scope_type in SCOPE_TYPES:
+            for period_type in PERIOD_TYPES:
+                start, _ = period_bounds(period_type, now)
+                totals = await self._totals(scope_type, period_type, start)
+                for scope_id, entries in totals.items():
+                    key = board_key(scope_type, scope_id, period_type, start)
+                    await self._replace_board(key, period_type, start, now, entries)
+                    boards += 1
+        return boards
+
+    async def _stats(self, key: str, user_ids: list[str]) -> dict[str, dict]:
+        fields = [
+            f"{user_id}:{name}"
+            for user_id in user_ids
+            for name in STAT_FIELDS
+        ]
+        values = iter(await self.cache.hmget(f"{key}:stats", fields))
+
+        stats = {}
+        for user_id in user_ids:
+            tests, correct, answered, seconds = (int(next(values) or 0) for _ in range(4))
+            stats[user_id] = {
+                "tests_completed": tests,
+                "average_accuracy": round(correct / answered * 100, 1) if answered else None,
+                "study_time_minutes": seconds // 60,
+            }
+        return stats
+
+    async def top(self, key: str, limit: int) -> list[dict]:
+        """Top entries of a live board, best first."""
+        entries = await self.cache.zrevrange(key, 0, limit - 1)
+        stats = await self._stats(key, [user_id for user_id, _ in entries])
+        return [
+            {"rank": index + 1, "user_id": int(user_id), "score": int(score), **stats[user_id]}
+            for index, (user_id, score) in enumerate(entries)
+        ]
+
+    async def rank_of(self, key: str, user_id: int) -> int | None:
+        """1-based rank of a user on a live board, or None if not on it."""
+        rank = await self.cache.zrevrank(key, str(user_id))
+        return rank + 1 if rank is not None else None
+
+    async def _read_board(
+        self,
+        key: str,
+        scope_type: str,
+        scope_id: int | None,
+        period_type: str,
+        period_start: datetime,
+        period_end: datetime,
+    ) -> list[dict]:
+        """A live board as Leaderboard rows, best first."""
+        rows = []
+        offset = 0
+        while True:
+            page = await self.cache.zrevrange(key, offset, offset + MATERIALIZE_PAGE_SIZE - 1)
+            if not page:
+                return rows
+            stats = await self._stats(key, [user_id for user_id, _ in page])
+            for index, (user_id, score) in enumerate(page):
+                rows.append({
+                    "user_id": int(user_id),
+                    "scope_type": scope_type,
+                    "scope_id": scope_id,
+                    "period_type": period_type,
+                    "rank": offset + index + 1,
+                    "score": int(score),
+                    "period_start": period_start,
+                    "period_end": period_end,
+                    **stats[user_id],
+                })
+            offset += len(page)
+
+    async def materialize(self, now: datetime | None = None) -> int:
+        """
+        Copy every live board into the Leaderboard table.
+        Boards whose period has ended are written one last time and dropped
+        from the registry. A board holding fewer tests than completed
+        attempts in the database lost data in the cache (or was restarted
+        from nothing after a flush), so it is rebuilt from attempts before
+        it may replace the stored snapshot.
+        Returns the number of boards written.
+        """
+        now = now or datetime.now(UTC)
+        written = 0
+
+        for key in await self.cache.smembers(BOARDS_KEY):
+            scope_type, scope_id, period_type, period_start = parse_board_key(key)
+            _, period_end = period_bounds(period_type, period_start)
+            board = (
+                Leaderboard.scope_type == scope_type,
+                Leaderboard.scope_id == scope_id if scope_id else Leaderboard.scope_id.is_(None),
+                Leaderboard.period_type == period_type,
+                Leaderboard.period_start == period_start,
+            )
+
+            args = (key, scope_type, scope_id, period_type, period_start, period_end)
+            rows = await self._read_board(*args)
+            if not rows:
+                # Expired from the cache; its last materialization stands
+                await self.cache.srem(BOARDS_KEY, key)
+                continue
+
+            expected = await self._attempt_count(scope_type, scope_id, period_type, period_start)
+            if sum(row["tests_completed"] for row in rows) < expected:
+                await self.rebuild_board(key, now)
+                rows = await self._read_board(*args)
+
+            if rows:
+                await self.db.execute(delete(Leaderboard).where(*board))
+                await self.db.execute(insert(Leaderboard), rows)
+                written += 1
+
+            if period_end <= now:
+                await self.cache.srem(BOARDS_KEY, key)
+
+        return written
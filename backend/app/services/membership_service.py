@@ -0,0 +1,76 @@
+"""
+Cached organization memberships.
+
+Permission checks on organization endpoints read the caller's
+{org_id: role} map rather than querying organization_members each
+time. A lookup tries the request's own session, then a short-lived
+in-process LRU, then the shared cache, and only queries the database
+when all three miss. Membership changes drop the shared entry and this
+process's copy; other processes' copies expire within
+membership_local_ttl_seconds.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import Cache, LocalCache, get_cache
+from app.core.config import settings
+from app.models import OrganizationMember
+
+_local = LocalCache(maxsize=10_000)
+
+
+def _key(user_id: int) -> str:
+    return f"memberships:{user_id}"
+
+
+async def get_memberships(
+    db: AsyncSession, user_id: int, cache: Cache | None = None
+) -> dict[int, str]:
+    """The user's active memberships as {organization_id: role}."""
+    # Sessions live for one request, so this is the per-request layer
+    per_request = db.info.setdefault("memberships", {})
+    if user_id in per_request:
+        return per_request[user_id]
+
+    key = _key(user_id)
+    memberships = _local.get(key)
+    if memberships is None:
+        cache = cache or get_cache()
+        stored = await cache.get_json(key)
+        if stored is None:
+            result = await db.execute(
+                select(OrganizationMember.organization_id, OrganizationMember.role).where(
+                    OrganizationMember.user_id == user_id,
+                    OrganizationMember.is_active == True,  # noqa: E712
+                )
+            )
+            memberships = dict(result.all())
+            await cache.set_json(
+                key,
+                {str(org_id): role for org_id, role in memberships.items()},
+                ttl=settings.membership_cache_ttl_seconds,
+            )
+        else:
+            memberships = {int(org_id): role for org_id, role in stored.items()}
+        _local.set(key, memberships, ttl=settings.membership_local_ttl_seconds)
+
+    per_request[user_id] = memberships
+    return memberships
+
+
+async def invalidate_memberships(
+    db: AsyncSession, *user_ids: int, cache: Cache | None = None
+) -> None:
+    """
+    Drop cached memberships after a change. Call it once the change is
+    committed, or a concurrent request could cache the old state again.
+    """
+    if not user_ids:
+        return
+    keys = [_key(user_id) for user_id in user_ids]
+    _local.delete(*keys)
+    per_request = db.info.get("memberships", {})
+    for user_id in user_ids:
+        per_request.pop(user_id, None)
+    await (cache or get_cache()).delete(*keys)
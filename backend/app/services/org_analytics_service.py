@@ -0,0 +1,394 @@
+"""
+Organization and class dashboard rollups.
+
+Each organization has one OrganizationAnalytics row and each class one
+ClassAnalytics row holding its dashboard numbers. Membership changes and
+completed tests add deltas to the affected rows, so a dashboard reads a
+single row however many students it covers.
+
+Rows are created with their organization or class. One that is missing
+anyway (data from before the rollups) is built from the source tables
+when its dashboard is read, never on the test submit path. Completed
+tests add to every affected row in one UPDATE per table, so completions
+in a school do not wait on each other.
+"""
+
+from datetime import UTC, date, datetime, time, timedelta
+
+from sqlalchemy import JSON, Float, case, cast, distinct, func, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import dialect_insert
+from app.models import (
+    AttemptAnswer,
+    Class,
+    ClassAnalytics,
+    ClassStudent,
+    OrganizationAnalytics,
+    OrganizationMember,
+    Question,
+    TestAttempt,
+)
+from app.models.enums import AttemptStatus
+from app.services.analytics_service import merge_performance
+
+# Counters shared by both rollups, added as plain integers
+ROLLUP_FIELDS = (
+    "tests_completed",
+    "score_total",
+    "scored_tests",
+    "attempts_this_week",
+    "active_students_this_week",
+)
+
+
+def current_week_start(today: date | None = None) -> date:
+    """Monday of the current week in UTC."""
+    today = today or datetime.now(UTC).date()
+    return today - timedelta(days=today.weekday())
+
+
+def _org_students(organization_id: int):
+    return select(OrganizationMember.user_id).where(
+        OrganizationMember.organization_id == organization_id,
+        OrganizationMember.role == "student",
+        OrganizationMember.is_active == True,  # noqa: E712
+    )
+
+
+def _class_students(class_id: int):
+    return select(ClassStudent.student_id).where(
+        ClassStudent.class_id == class_id,
+        ClassStudent.is_active == True,  # noqa: E712
+    )
+
+
+def _apply(row: OrganizationAnalytics | ClassAnalytics, delta: dict, week: date) -> None:
+    if row.week_start != week:
+        row.week_start = week
+        row.attempts_this_week = 0
+        row.active_students_this_week = 0
+    for field in ROLLUP_FIELDS:
+        setattr(row, field, (getattr(row, field) or 0) + delta[field])
+    row.domain_performance = merge_performance(row.domain_performance, delta["domains"])
+
+
+def _domains_sql(db: AsyncSession, column, deltas: dict[str, list[int]]):
+    """SQL for a domain_performance column with deltas added, as merge_performance does."""
+    if not deltas:
+        return column
+
+    patches = {}
+    for domain, (answered, correct) in deltas.items():
+        count = func.coalesce(column[(domain, "count")].as_integer(), 0) + answered
+        right = func.coalesce(column[(domain, "correct")].as_integer(), 0) + correct
+        patches[domain] = (
+            count,
+            right,
+            func.coalesce(cast(right, Float) / func.nullif(count, 0), 0),
+        )
+
+    if db.bind.dialect.name == "postgresql":
+        merged = func.coalesce(cast(column, JSONB), cast(literal("{}"), JSONB))
+        for domain, (count, right, accuracy) in patches.items():
+            merged = merged.op("||")(func.jsonb_build_object(
+                domain,
+                func.jsonb_build_object("count", count, "correct", right, "accuracy", accuracy),
+            ))
+        return cast(merged, JSON)
+
+    arguments = []
+    for domain, (count, right, accuracy) in patches.items():
+        arguments += [
+            f'$."{domain}"',
+            func.json_object("count", count, "correct", right, "accuracy", accuracy),
+        ]
+    return func.json_set(func.coalesce(column, "{}"), *arguments)
+
+
+def _delta_values(db: AsyncSession, model, delta: dict, week: date) -> dict:
+    """UPDATE values adding a delta to rollup rows, as _apply does."""
+    same_week = model.week_start == week
+    values = {
+        field: func.coalesce(getattr(model, field), 0) + delta[field]
+        for field in ("tests_completed", "score_total", "scored_tests")
+    }
+    for field in ("attempts_this_week", "active_students_this_week"):
+        column = getattr(model, field)
+        values[field] = case(
+            (same_week, func.coalesce(column, 0) + delta[field]), else_=delta[field]
+        )
+    values["week_start"] = week
+    values["domain_performance"] = _domains_sql(db, model.domain_performance, delta["domains"])
+    return values
+
+
+def _summary(row: OrganizationAnalytics | ClassAnalytics, week: date) -> dict:
+    this_week = row.week_start == week
+    return {
+        "tests_completed": row.tests_completed,
+        "average_score": row.score_total / row.scored_tests if row.scored_tests else None,
+        "attempts_this_week": row.attempts_this_week if this_week else 0,
+        "active_students_this_week": row.active_students_this_week if this_week else 0,
+        "domain_performance": row.domain_performance or {},
+    }
+
+
+class OrgAnalyticsService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _totals(self, *conditions, week: date) -> dict:
+        """Rollup counters over the completed attempts matching `conditions`."""
+        since = datetime.combine(week, time.min, tzinfo=UTC)
+        completed = (TestAttempt.status == AttemptStatus.COMPLETED, *conditions)
+
+        row = (await self.db.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(TestAttempt.total_score), 0),
+                func.count(TestAttempt.total_score),
+                func.count().filter(TestAttempt.completed_at >= since),
+                func.count(distinct(TestAttempt.user_id)).filter(TestAttempt.completed_at >= since),
+            ).where(*completed)
+        )).one()
+
+        domains = await self.db.execute(
+            select(
+                Question.domain,
+                func.count(),
+                func.count().filter(AttemptAnswer.is_correct == True),  # noqa: E712
+            )
+            .select_from(AttemptAnswer)
+            .join(TestAttempt, TestAttempt.id == AttemptAnswer.attempt_id)
+            .join(Question, Question.id == AttemptAnswer.question_id)
+            .where(*completed, Question.domain.is_not(None))
+            .group_by(Question.domain)
+        )
+
+        return {
+            "tests_completed": row[0],
+            "score_total": int(row[1]),
+            "scored_tests": row[2],
+            "attempts_this_week": row[3],
+            "active_students_this_week": row[4],
+            "domains": {domain.value: [answered, correct] for domain, answered, correct in domains},
+        }
+
+    async def rebuild_organization(self, organization_id: int) -> OrganizationAnalytics:
+        """Recompute an organization's rollup from the source tables."""
+        week = current_week_start()
+
+        result = await self.db.execute(
+            select(OrganizationMember.role, func.count())
+            .where(
+                OrganizationMember.organization_id == organization_id,
+                OrganizationMember.is_active == True,  # noqa: E712
+            )
+            .group_by(OrganizationMember.role)
+        )
+        member_counts = dict(result.all())
+
+        result = await self.db.execute(
+            select(func.count()).where(
+                Class.organization_id == organization_id,
+                Class.is_active == True,  # noqa: E712
+            )
+        )
+        class_count = result.scalar() or 0
+
+        totals = await self._totals(
+            TestAttempt.user_id.in_(_org_students(organization_id)), week=week
+        )
+
+        await self._create_rows(OrganizationAnalytics, "organization_id", [organization_id])
+        rollup = (await self._locked_organizations([organization_id]))[organization_id]
+        rollup.member_counts = member_counts
+        rollup.class_count = class_count
+        rollup.week_start = week
+        for field in ROLLUP_FIELDS:
+            setattr(rollup, field, totals[field])
+        rollup.domain_performance = merge_performance(None, totals["domains"])
+        await self.db.flush()
+        return rollup
+
+    async def rebuild_class(self, class_id: int) -> ClassAnalytics:
+        """Recompute a class's rollup from the source tables."""
+        week = current_week_start()
+
+        result = await self.db.execute(
+            select(func.count()).select_from(_class_students(class_id).subquery())
+        )
+        student_count = result.scalar() or 0
+
+        totals = await self._totals(TestAttempt.user_id.in_(_class_students(class_id)), week=week)
+
+        await self._create_rows(ClassAnalytics, "class_id", [class_id])
+        rollup = (await self._locked_classes([class_id]))[class_id]
+        rollup.student_count = student_count
+        rollup.week_start = week
+        for field in ROLLUP_FIELDS:
+            setattr(rollup, field, totals[field])
+        rollup.domain_performance = merge_performance(None, totals["domains"])
+        await self.db.flush()
+        return rollup
+
+    async def _create_rows(self, model, key: str, ids: list[int]) -> None:
+        """Insert empty rollups; rows that already exist are left alone."""
+        week = current_week_start()
+        await self.db.execute(
+            dialect_insert(self.db, model)
+            .values([{key: id_, "week_start": week} for id_ in ids])
+            .on_conflict_do_nothing(index_elements=[key])
+        )
+
+    async def _locked_organizations(
+        self, organization_ids: list[int]
+    ) -> dict[int, OrganizationAnalytics]:
+        result = await self.db.execute(
+            select(OrganizationAnalytics)
+            .where(OrganizationAnalytics.organization_id.in_(organization_ids))
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return {row.organization_id: row for row in result.scalars().all()}
+
+    async def _locked_classes(self, class_ids: list[int]) -> dict[int, ClassAnalytics]:
+        result = await self.db.execute(
+            select(ClassAnalytics)
+            .where(ClassAnalytics.class_id.in_(class_ids))
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return {row.class_id: row for row in result.scalars().all()}
+
+    # Deltas. Each flushes first so a rollup rebuilt from scratch already
+    # includes the change, and only existing rows get the delta added.
+
+    async def record_member(self, organization_id: int, user_id: int, role: str) -> None:
+        """A member joined (or rejoined) an organization."""
+        await self.db.flush()
+        rollup = (await self._locked_organizations([organization_id])).get(organization_id)
+        if not rollup:
+            await self.rebuild_organization(organization_id)
+            return
+
+        counts = dict(rollup.member_counts or {})
+        counts[role] = counts.get(role, 0) + 1
+        rollup.member_counts = counts
+        if role == "student":
+            week = current_week_start()
+            _apply(rollup, await self._totals(TestAttempt.user_id == user_id, week=week), week)
+
+    async def record_class(self, organization_id: int, class_id: int) -> None:
+        """A class was created in an organization; it starts with an empty rollup."""
+        await self.db.flush()
+        await self._create_rows(ClassAnalytics, "class_id", [class_id])
+        rollup = (await self._locked_organizations([organization_id])).get(organization_id)
+        if not rollup:
+            await self.rebuild_organization(organization_id)
+            return
+        rollup.class_count += 1
+
+    async def record_enrollment(self, class_id: int, student_id: int) -> None:
+        """A student joined (or rejoined) a class; their history joins its totals."""
+        await self.db.flush()
+        rollup = (await self._locked_classes([class_id])).get(class_id)
+        if not rollup:
+            await self.rebuild_class(class_id)
+            return
+
+        week = current_week_start()
+        rollup.student_count += 1
+        _apply(rollup, await self._totals(TestAttempt.user_id == student_id, week=week), week)
+
+    async def record_attempt(self, attempt: TestAttempt) -> None:
+        """Count a completed attempt for every organization and class of its student."""
+        await self.db.flush()
+
+        result = await self.db.execute(
+            select(OrganizationMember.organization_id).where(
+                OrganizationMember.user_id == attempt.user_id,
+                OrganizationMember.role == "student",
+                OrganizationMember.is_active == True,  # noqa: E712
+            )
+        )
+        organization_ids = list(result.scalars().all())
+        result = await self.db.execute(
+            select(ClassStudent.class_id)
+            .join(Class, Class.id == ClassStudent.class_id)
+            .where(
+                ClassStudent.student_id == attempt.user_id,
+                ClassStudent.is_active == True,  # noqa: E712
+                Class.is_active == True,  # noqa: E712
+            )
+        )
+        class_ids = list(result.scalars().all())
+        if not organization_ids and not class_ids:
+            return
+
+        week = current_week_start()
+        delta = await self._totals(TestAttempt.id == attempt.id, week=week)
+
+        # Only the student's first test this week makes them newly active
+        result = await self.db.execute(
+            select(TestAttempt.id)
+            .where(
+                TestAttempt.user_id == attempt.user_id,
+                TestAttempt.status == AttemptStatus.COMPLETED,
+                TestAttempt.completed_at >= datetime.combine(week, time.min, tzinfo=UTC),
+                TestAttempt.id != attempt.id,
+            )
+            .limit(1)
+        )
+        if result.first():
+            delta["active_students_this_week"] = 0
+
+        # Missing rows are skipped: they are built, with this attempt, when read
+        if organization_ids:
+            await self.db.execute(
+                update(OrganizationAnalytics)
+                .where(OrganizationAnalytics.organization_id.in_(organization_ids))
+                .values(_delta_values(self.db, OrganizationAnalytics, delta, week))
+                .execution_options(synchronize_session=False)
+            )
+        if class_ids:
+            await self.db.execute(
+                update(ClassAnalytics)
+                .where(ClassAnalytics.class_id.in_(class_ids))
+                .values(_delta_values(self.db, ClassAnalytics, delta, week))
+                .execution_options(synchronize_session=False)
+            )
+
+    # Reads
+
+    async def organization_dashboard(self, organization_id: int) -> dict:
+        result = await self.db.execute(
+            select(OrganizationAnalytics)
+            .where(OrganizationAnalytics.organization_id == organization_id)
+            .execution_options(populate_existing=True)
+        )
+        rollup = result.scalar_one_or_none() or await self.rebuild_organization(organization_id)
+        member_counts = rollup.member_counts or {}
+
+        return {
+            "member_counts": member_counts,
+            "class_count": rollup.class_count,
+            "student_count": member_counts.get("student", 0),
+            **_summary(rollup, current_week_start()),
+        }
+
+    async def class_dashboard(self, class_id: int) -> dict:
+        result = await self.db.execute(
+            select(ClassAnalytics)
+            .where(ClassAnalytics.class_id == class_id)
+            .execution_options(populate_existing=True)
+        )
+        rollup = result.scalar_one_or_none() or await self.rebuild_class(class_id)
+
+        return {
+            "student_count": rollup.student_count,
+            **_summary(rollup, current_week_start()),
+        }
+
@@ -0,0 +1,261 @@
+"""
+Platform analytics rollups.
+
+One PlatformAnalytics row per day (platform-wide) is written by a nightly
+task, so admin trend charts read a handful of rows instead of counting
+users and attempts day by day. Only the current day is computed live.
+"""
+
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_cache
+from app.models import (
+    AttemptAnswer,
+    ContentProgress,
+    PlatformAnalytics,
+    Question,
+    TestAttempt,
+    User,
+)
+from app.models.enums import AttemptStatus
+
+DAILY = "daily"
+
+# Total-score buckets stored in score_distribution
+SCORE_BUCKET_WIDTH = 200
+SCORE_MIN = 400
+SCORE_MAX = 1600
+
+SERIES_FIELDS = ("period_start", "total_users", "new_users", "tests_completed", "average_score")
+
+# Held while a request stores rollups for days the nightly job missed
+BACKFILL_LOCK_KEY = "platform-analytics:backfill"
+BACKFILL_LOCK_TIMEOUT = 300
+
+
+def day_start(value: datetime | date) -> datetime:
+    """Midnight UTC of the day containing value."""
+    if isinstance(value, datetime):
+        # Naive values (SQLite) are stored in UTC
+        value = value.astimezone(UTC).date() if value.tzinfo else value.date()
+    return datetime(value.year, value.month, value.day, tzinfo=UTC)
+
+
+class PlatformAnalyticsService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def compute_day(self, start: datetime) -> dict:
+        """Aggregate platform activity for the UTC day beginning at start."""
+        end = start + timedelta(days=1)
+
+        users = (await self.db.execute(
+            select(
+                func.count().filter(User.created_at < end).label("total"),
+                func.count().filter(User.created_at >= start, User.created_at < end).label("new"),
+                # last_login_at only keeps the latest login, so backfilled
+                # days undercount this
+                func.count().filter(
+                    User.last_login_at >= start, User.last_login_at < end
+                ).label("active"),
+            )
+        )).one()
+
+        started = (TestAttempt.started_at >= start) & (TestAttempt.started_at < end)
+        completed = (
+            (TestAttempt.status == AttemptStatus.COMPLETED)
+            & (TestAttempt.completed_at >= start)
+            & (TestAttempt.completed_at < end)
+        )
+        attempts = (await self.db.execute(
+            select(
+                func.count().filter(started).label("started"),
+                func.count().filter(completed).label("completed"),
+                func.avg(TestAttempt.total_score).filter(completed).label("average_score"),
+                func.sum(TestAttempt.total_time_seconds).filter(completed).label("study_seconds"),
+                func.count(distinct(TestAttempt.user_id)).filter(started).label("engaged"),
+            ).where(
+                (TestAttempt.started_at >= start) | (TestAttempt.completed_at >= start),
+                TestAttempt.started_at < end,
+            )
+        )).one()
+
+        content = (await self.db.execute(
+            select(
+                func.count().filter(
+                    ContentProgress.created_at >= start, ContentProgress.created_at < end
+                ).label("views"),
+                func.count().filter(
+                    ContentProgress.completed_at >= start, ContentProgress.completed_at < end
+                ).label("completions"),
+            )
+        )).one()
+
+        bucket = (TestAttempt.total_score - SCORE_MIN) // SCORE_BUCKET_WIDTH
+        result = await self.db.execute(
+            select(bucket.label("bucket"), func.count())
+            .where(completed, TestAttempt.total_score.isnot(None))
+            .group_by(bucket)
+        )
+        score_distribution: dict[str, int] = {}
+        last_bucket = (SCORE_MAX - SCORE_MIN) // SCORE_BUCKET_WIDTH - 1
+        for index, count in result.all():
+            low = SCORE_MIN + min(max(int(index), 0), last_bucket) * SCORE_BUCKET_WIDTH
+            key = f"{low}-{low + SCORE_BUCKET_WIDTH}"
+            score_distribution[key] = score_distribution.get(key, 0) + count
+
+        result = await self.db.execute(
+            select(
+                Question.domain,
+                func.count(),
+                func.count().filter(AttemptAnswer.is_correct == True),  # noqa: E712
+            )
+            .join(Question, Question.id == AttemptAnswer.question_id)
+            .where(
+                AttemptAnswer.created_at >= start,
+                AttemptAnswer.created_at < end,
+                Question.domain.isnot(None),
+            )
+            .group_by(Question.domain)
+        )
+        domain_accuracy = {}
+        for domain, total, correct in result.all():
+            domain_accuracy[domain.value] = {
+                "correct": correct,
+                "total": total,
+                "accuracy": round(correct / total * 100, 1) if total else 0,
+            }
+
+        total_answers = (await self.db.execute(
+            select(func.count()).select_from(AttemptAnswer).where(
+                AttemptAnswer.created_at >= start, AttemptAnswer.created_at < end
+            )
+        )).scalar() or 0
+
+        return {
+            "period_type": DAILY,
+            "period_start": start,
+            "period_end": end,
+            "total_users": users.total,
+            "new_users": users.new,
+            "active_users": users.active,
+            "engaged_users": attempts.engaged,
+            "tests_started": attempts.started,
+            "tests_completed": attempts.completed,
+            "average_score": (
+                float(attempts.average_score) if attempts.average_score is not None else None
+            ),
+            "content_views": content.views,
+            "content_completions": content.completions,
+            "total_study_minutes": (attempts.study_seconds or 0) // 60,
+            "total_questions_answered": total_answers,
+            "score_distribution": score_distribution,
+            "domain_accuracy": domain_accuracy,
+        }
+
+    async def rollup_day(self, start: datetime) -> PlatformAnalytics:
+        """Compute and store (or overwrite) the rollup row for one day."""
+        values = await self.compute_day(start)
+
+        result = await self.db.execute(
+            select(PlatformAnalytics).where(
+                PlatformAnalytics.period_type == DAILY,
+                PlatformAnalytics.period_start == start,
+                PlatformAnalytics.organization_id.is_(None),
+            )
+        )
+        row = result.scalar_one_or_none()
+        if row:
+            for key, value in values.items():
+                setattr(row, key, value)
+        else:
+            row = PlatformAnalytics(**values)
+            self.db.add(row)
+
+        await self.db.flush()
+        return row
+
+    async def backfill(self, first_day: date, last_day: date) -> int:
+        """Roll up every day in [first_day, last_day]. Returns days written."""
+        start = day_start(first_day)
+        days = 0
+        while start <= day_start(last_day):
+            await self.rollup_day(start)
+            start += timedelta(days=1)
+            days += 1
+        return days
+
+    async def rollup_recent(self, days: int = 7, now: datetime | None = None) -> int:
+        """
+        Roll up yesterday, plus any day in the last `days` without a row
+        (e.g. the task did not run). Returns days written.
+        """
+        today = day_start(now or datetime.now(UTC))
+        first = today - timedelta(days=days)
+
+        result = await self.db.execute(
+            select(PlatformAnalytics.period_start).where(
+                PlatformAnalytics.period_type == DAILY,
+                PlatformAnalytics.organization_id.is_(None),
+                PlatformAnalytics.period_start >= first,
+            )
+        )
+        existing = {day_start(value) for value in result.scalars().all()}
+
+        written = 0
+        for offset in range(days, 0, -1):
+            start = today - timedelta(days=offset)
+            if offset == 1 or start not in existing:
+                await self.rollup_day(start)
+                written += 1
+        return written
+
+    async def daily_series(self, days: int, now: datetime | None = None) -> list[dict]:
+        """
+        Per-day metrics for the last `days` days, oldest first, ending today.
+        Past days come from rollups; only today is computed live. Past days
+        without a rollup (the job missed them, or predate it) are rolled up
+        and stored here, once, by whichever request takes the backfill lock.
+        """
+        today = day_start(now or datetime.now(UTC))
+        first = today - timedelta(days=days - 1)
+
+        result = await self.db.execute(
+            select(PlatformAnalytics).where(
+                PlatformAnalytics.period_type == DAILY,
+                PlatformAnalytics.organization_id.is_(None),
+                PlatformAnalytics.period_start >= first,
+                PlatformAnalytics.period_start < today,
+            )
+        )
+        rollups = {
+            day_start(row.period_start): {field: getattr(row, field) for field in SERIES_FIELDS}
+            for row in result.scalars().all()
+        }
+
+        missing = [
+            first + timedelta(days=offset)
+            for offset in range(days - 1)
+            if first + timedelta(days=offset) not in rollups
+        ]
+        cache = get_cache()
+        if missing and await cache.set_nx(BACKFILL_LOCK_KEY, 1, ttl=BACKFILL_LOCK_TIMEOUT):
+            try:
+                for start in missing:
+                    row = await self.rollup_day(start)
+                    rollups[start] = {field: getattr(row, field) for field in SERIES_FIELDS}
+            finally:
+                await cache.delete(BACKFILL_LOCK_KEY)
+        else:
+            # Another request is storing them; don't write duplicate rows
+            for start in missing:
+                rollups[start] = await self.compute_day(start)
+
+        rollups[today] = await self.compute_day(today)
+        return [
+            {**{field: rollups[start][field] for field in SERIES_FIELDS}, "period_start": start}
+            for start in (first + timedelta(days=offset) for offset in range(days))
+        ]
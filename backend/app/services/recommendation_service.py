@@ -0,0 +1,175 @@
+"""
+Per-user practice recommendations.
+
+Each student has a ranked list of question IDs in the cache, best
+practice targets first. Ranking favours weak domains and skills, items
+at a difficulty that matches the student's accuracy, and questions not
+seen recently. Submissions only mark the list stale; a periodic task
+rebuilds stale lists, so weak-area drills cost one list read plus one
+query to load the questions.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import Cache
+from app.core.config import settings
+from app.models import AttemptAnswer, DrillAttempt, Question, StudentAnalytics, TestAttempt
+from app.models.enums import QuestionDifficulty, QuestionDomain
+
+STALE_KEY = "recommendations:stale"
+
+# Questions kept per user
+POOL_SIZE = 200
+
+# Unseen questions from the weak domains that are scored to fill the pool
+CANDIDATE_LIMIT = 2000
+
+# Answered within this window counts as recently seen
+RECENTLY_SEEN = timedelta(days=14)
+
+# Domains below this accuracy are drilled; if none are, the weakest three are
+WEAK_ACCURACY = 0.7
+WEAKEST_DOMAINS = 3
+
+# Accuracy assumed for domains/skills with no answers yet
+UNKNOWN_ACCURACY = 0.5
+
+DOMAIN_WEIGHT = 0.5
+SKILL_WEIGHT = 0.3
+DIFFICULTY_WEIGHT = 0.2
+
+DOMAINS = {domain.value for domain in QuestionDomain}
+
+DIFFICULTY_RANK = {
+    QuestionDifficulty.EASY: 0,
+    QuestionDifficulty.MEDIUM: 1,
+    QuestionDifficulty.HARD: 2,
+}
+
+
+def _list_key(user_id: int) -> str:
+    return f"recommendations:{user_id}"
+
+
+class RecommendationService:
+    def __init__(self, db: AsyncSession, cache: Cache):
+        self.db = db
+        self.cache = cache
+
+    async def mark_stale(self, user_id: int) -> None:
+        """Queue the user's list for rebuilding; the current list keeps serving."""
+        await self.cache.sadd(STALE_KEY, str(user_id))
+
+    async def _recently_seen(self, user_id: int, now: datetime) -> set[int]:
+        since = now - RECENTLY_SEEN
+        result = await self.db.execute(
+            select(AttemptAnswer.question_id)
+            .join(TestAttempt, TestAttempt.id == AttemptAnswer.attempt_id)
+            .where(TestAttempt.user_id == user_id, AttemptAnswer.created_at >= since)
+        )
+        seen = set(result.scalars().all())
+
+        result = await self.db.execute(
+            select(DrillAttempt.responses).where(
+                DrillAttempt.user_id == user_id, DrillAttempt.created_at >= since
+            )
+        )
+        for responses in result.scalars().all():
+            seen.update(question_id for question_id, _, _ in responses)
+        return seen
+
+    async def compute(self, user_id: int, now: datetime | None = None) -> list[int]:
+        """
+        Rank unseen questions in the user's weak domains. Returns up to
+        POOL_SIZE question IDs; none for a user without answer history.
+        """
+        now = now or datetime.now(UTC)
+
+        result = await self.db.execute(
+            select(StudentAnalytics.domain_performance, StudentAnalytics.skill_performance)
+            .where(StudentAnalytics.user_id == user_id)
+        )
+        row = result.one_or_none()
+        domain_accuracy = {
+            domain: stats.get("accuracy", UNKNOWN_ACCURACY)
+            for domain, stats in ((row and row.domain_performance) or {}).items()
+        }
+        skill_accuracy = {
+            skill: stats.get("accuracy", UNKNOWN_ACCURACY)
+            for skill, stats in ((row and row.skill_performance) or {}).items()
+        }
+
+        if not domain_accuracy:
+            # No history to rank by: drills use the general mix instead
+            return []
+
+        ranked = sorted(domain_accuracy, key=domain_accuracy.get)
+        weak = [d for d in ranked if domain_accuracy[d] < WEAK_ACCURACY] or ranked[:WEAKEST_DOMAINS]
+        seen = await self._recently_seen(user_id, now)
+
+        query = select(
+            Question.id, Question.domain, Question.difficulty, Question.skill_tags
+        ).where(Question.domain.in_([QuestionDomain(d) for d in weak if d in DOMAINS]))
+        if seen:
+            query = query.where(Question.id.not_in(seen))
+        candidates = (await self.db.execute(query.limit(CANDIDATE_LIMIT))).all()
+
+        scored = []
+        for question_id, domain, difficulty, skill_tags in candidates:
+            accuracy = domain_accuracy.get(domain.value, UNKNOWN_ACCURACY)
+            skills = [skill_accuracy.get(skill, UNKNOWN_ACCURACY) for skill in skill_tags or []]
+            skill = sum(skills) / len(skills) if skills else UNKNOWN_ACCURACY
+
+            # Stronger students get harder items: easy below 1/3 accuracy, hard above 2/3
+            target = min(int(accuracy * 3), 2)
+            rank = DIFFICULTY_RANK.get(difficulty, 1)
+            difficulty_fit = 1 - abs(rank - target) / 2
+
+            score = (
+                DOMAIN_WEIGHT * (1 - accuracy)
+                + SKILL_WEIGHT * (1 - skill)
+                + DIFFICULTY_WEIGHT * difficulty_fit
+            )
+            scored.append((-score, question_id))
+
+        scored.sort()
+        return [question_id for _, question_id in scored[:POOL_SIZE]]
+
+    async def refresh(self, user_id: int) -> list[int]:
+        """Recompute and store a user's list."""
+        question_ids = await self.compute(user_id)
+        await self.cache.set_json(
+            _list_key(user_id), question_ids, ttl=settings.recommendation_ttl_seconds
+        )
+        return question_ids
+
+    async def refresh_stale(self) -> int:
+        """Rebuild every list marked stale. Returns the number rebuilt."""
+        refreshed = 0
+        for member in await self.cache.smembers(STALE_KEY):
+            # Drop the mark first so a submission during the rebuild re-marks it
+            await self.cache.srem(STALE_KEY, member)
+            await self.refresh(int(member))
+            refreshed += 1
+        return refreshed
+
+    async def take(self, user_id: int, count: int) -> list[int]:
+        """
+        Next `count` recommended question IDs. Served IDs rotate to the back
+        of the list so consecutive drills differ until the list is rebuilt.
+        """
+        question_ids = await self.cache.get_json(_list_key(user_id))
+        if question_ids is None:
+            # First drill, or the cache was lost
+            question_ids = await self.compute(user_id)
+
+        served = question_ids[:count]
+        await self.cache.set_json(
+            _list_key(user_id),
+            question_ids[count:] + served,
+            ttl=settings.recommendation_ttl_seconds,
+        )
+        return served
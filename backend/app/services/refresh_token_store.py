@@ -0,0 +1,173 @@
+"""
+Refresh token storage.
+
+Tokens are stored by SHA-256 hash, in the refresh_tokens table by
+default. Every change is a single set-based statement, and using a token
+revokes it in the same UPDATE that checks it, so a token cannot be
+rotated twice by concurrent requests. Expired and long-revoked rows are
+deleted in batches by a periodic task.
+
+With refresh_token_store = "cache", tokens live in the shared cache
+instead and expire with their TTL, which keeps refresh traffic off the
+database entirely. Sessions are then lost if the cache is flushed.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import Cache, get_cache
+from app.core.config import settings
+from app.models import RefreshToken
+
+
+class DatabaseTokenStore:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add(
+        self,
+        user_id: int,
+        token_hash: str,
+        expires_at: datetime,
+        user_agent: str | None = None,
+        ip_address: str | None = None,
+    ) -> None:
+        await self.db.execute(
+            insert(RefreshToken).values(
+                user_id=user_id,
+                token_hash=token_hash,
+                expires_at=expires_at,
+                user_agent=user_agent,
+                ip_address=ip_address,
+            )
+        )
+
+    async def consume(self, token_hash: str) -> int | None:
+        """Revoke a valid token for rotation. Returns its user, or None."""
+        now = datetime.now(UTC)
+        result = await self.db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked == False,  # noqa: E712
+                RefreshToken.expires_at > now,
+            )
+            .values(revoked=True, revoked_at=now)
+            .returning(RefreshToken.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none()
+
+    async def revoke(self, token_hash: str) -> bool:
+        result = await self.db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked == False,  # noqa: E712
+            )
+            .values(revoked=True, revoked_at=datetime.now(UTC))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+    async def revoke_all(self, user_id: int) -> int:
+        result = await self.db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.revoked == False,  # noqa: E712
+            )
+            .values(revoked=True, revoked_at=datetime.now(UTC))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def purge(self, batch_size: int) -> int:
+        """
+        Delete expired tokens, and revoked ones past the retention period,
+        committing after each batch so no single statement holds locks on
+        a large part of the table. Returns the number of rows deleted.
+        """
+        now = datetime.now(UTC)
+        revoked_before = now - timedelta(days=settings.refresh_token_revoked_retention_days)
+        stale = or_(
+            RefreshToken.expires_at <= now,
+            and_(
+                RefreshToken.revoked == True,  # noqa: E712
+                RefreshToken.revoked_at < revoked_before,
+            ),
+        )
+
+        deleted = 0
+        while True:
+            batch = select(RefreshToken.id).where(stale).limit(batch_size).scalar_subquery()
+            result = await self.db.execute(
+                delete(RefreshToken)
+                .where(RefreshToken.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+
+
+class CacheTokenStore:
+    def __init__(self, cache: Cache):
+        self.cache = cache
+
+    @staticmethod
+    def _token_key(token_hash: str) -> str:
+        return f"refresh_token:{token_hash}"
+
+    @staticmethod
+    def _user_key(user_id: int) -> str:
+        return f"refresh_tokens:{user_id}"
+
+    async def add(
+        self,
+        user_id: int,
+        token_hash: str,
+        expires_at: datetime,
+        user_agent: str | None = None,
+        ip_address: str | None = None,
+    ) -> None:
+        ttl = max(1, int((expires_at - datetime.now(UTC)).total_seconds()))
+        await self.cache.set_json(
+            self._token_key(token_hash),
+            {"user_id": user_id, "user_agent": user_agent, "ip_address": ip_address},
+            ttl=ttl,
+        )
+        # The user's index lives as long as their newest token
+        await self.cache.sadd(self._user_key(user_id), token_hash)
+        await self.cache.expire(self._user_key(user_id), ttl)
+
+    async def consume(self, token_hash: str) -> int | None:
+        stored = await self.cache.pop_json(self._token_key(token_hash))
+        if stored is None:
+            return None
+        await self.cache.srem(self._user_key(stored["user_id"]), token_hash)
+        return stored["user_id"]
+
+    async def revoke(self, token_hash: str) -> bool:
+        return await self.consume(token_hash) is not None
+
+    async def revoke_all(self, user_id: int) -> int:
+        count = 0
+        for token_hash in await self.cache.smembers(self._user_key(user_id)):
+            if await self.cache.pop_json(self._token_key(token_hash)) is not None:
+                count += 1
+        await self.cache.delete(self._user_key(user_id))
+        return count
+
+
+TokenStore = DatabaseTokenStore | CacheTokenStore
+
+
+def get_token_store(db: AsyncSession) -> TokenStore:
+    """The configured refresh token store."""
+    if settings.refresh_token_store == "cache":
+        return CacheTokenStore(get_cache())
+    return DatabaseTokenStore(db)
@@ -0,0 +1,133 @@
+"""
+Spaced-repetition review queue.
+
+Questions a student misses on a test go into review_items, one row per
+(user, question), and come back on an SM-2 schedule: each correct review
+stretches the interval by the item's ease factor, each miss resets it.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import dialect_insert
+from app.models import ReviewItem
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+# SM-2 quality grades for a plain right/wrong review
+CORRECT_QUALITY = 4
+MISSED_QUALITY = 1
+
+
+def schedule(item: ReviewItem, quality: int, now: datetime) -> dict:
+    """Next SM-2 state for an item reviewed with the given quality (0-5)."""
+    ease = max(
+        MIN_EASE,
+        (item.ease_factor or DEFAULT_EASE) + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02),
+    )
+    repetitions = item.repetitions or 0
+    lapses = item.lapses or 0
+
+    if quality < 3:
+        repetitions = 0
+        interval = 1
+        lapses += 1
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval = 1
+        elif repetitions == 2:
+            interval = 6
+        else:
+            interval = round((item.interval_days or 1) * ease)
+
+    return {
+        "id": item.id,
+        "ease_factor": ease,
+        "repetitions": repetitions,
+        "interval_days": interval,
+        "lapses": lapses,
+        "due_at": now + timedelta(days=interval),
+        "last_reviewed_at": now,
+    }
+
+
+class ReviewService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue_missed(
+        self, user_id: int, question_ids: list[int], now: datetime | None = None
+    ) -> None:
+        """
+        Queue missed questions for review, due now, with one upsert.
+        A question already in the queue is treated as a lapse.
+        """
+        if not question_ids:
+            return
+        now = now or datetime.now(UTC)
+
+        stmt = dialect_insert(self.db, ReviewItem).values([
+            {
+                "user_id": user_id,
+                "question_id": question_id,
+                "due_at": now,
+                "interval_days": 0,
+                "ease_factor": DEFAULT_EASE,
+                "repetitions": 0,
+                "lapses": 1,
+            }
+            for question_id in dict.fromkeys(question_ids)
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "question_id"],
+            set_={
+                "due_at": now,
+                "interval_days": 0,
+                "repetitions": 0,
+                "lapses": ReviewItem.lapses + 1,
+                "updated_at": now,
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def due(
+        self, user_id: int, limit: int, now: datetime | None = None
+    ) -> list[ReviewItem]:
+        """Items due for review, most overdue first."""
+        result = await self.db.execute(
+            select(ReviewItem)
+            .where(ReviewItem.user_id == user_id, ReviewItem.due_at <= (now or datetime.now(UTC)))
+            .order_by(ReviewItem.due_at)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def record_reviews(
+        self, user_id: int, results: dict[int, bool], now: datetime | None = None
+    ) -> int:
+        """
+        Reschedule reviewed items from {question_id: is_correct} with one
+        batched UPDATE. Questions not in the queue are ignored.
+        Returns the number of items rescheduled.
+        """
+        if not results:
+            return 0
+        now = now or datetime.now(UTC)
+
+        result = await self.db.execute(
+            select(ReviewItem).where(
+                ReviewItem.user_id == user_id,
+                ReviewItem.question_id.in_(results),
+            )
+        )
+        rows = [
+            schedule(item, CORRECT_QUALITY if results[item.question_id] else MISSED_QUALITY, now)
+            for item in result.scalars().all()
+        ]
+        if rows:
+            await self.db.execute(update(ReviewItem), rows)
+        return len(rows)
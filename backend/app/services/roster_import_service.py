@@ -0,0 +1,182 @@
+"""
+Bulk roster imports.
+
+An upload is parsed into rows up front and stored on a RosterImport; a
+background task then works through them in chunks. Each chunk resolves
+its emails with one IN query and adds memberships and class enrollments
+with one upsert each, so onboarding a whole school is a few statements
+per chunk instead of thousands of requests. Bad rows go into the
+import's error report and the rest of the chunk still goes in.
+"""
+
+import csv
+import io
+from datetime import UTC, datetime
+from typing import BinaryIO
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import Cache
+from app.core.database import dialect_insert
+from app.models import ClassStudent, OrganizationMember, RosterImport, User
+from app.services.membership_service import invalidate_memberships
+from app.services.org_analytics_service import OrgAnalyticsService
+
+CHUNK_SIZE = 500
+MAX_ROWS = 10_000
+
+INTEGER_FIELDS = ("grade_level", "target_score")
+TEXT_FIELDS = ("parent_name", "parent_email", "parent_phone")
+ROW_FIELDS = ("email", *INTEGER_FIELDS, *TEXT_FIELDS)
+
+
+def parse_csv(stream: BinaryIO) -> list[dict]:
+    """
+    Read roster rows from a CSV upload with an `email` column, streaming
+    it line by line. Rows are numbered as in the file (header is row 1).
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    columns = [(name or "").strip().lower() for name in reader.fieldnames or []]
+    if "email" not in columns:
+        raise ValueError("CSV must have an email column")
+    reader.fieldnames = columns
+
+    rows = []
+    for number, record in enumerate(reader, 2):
+        if len(rows) == MAX_ROWS:
+            raise ValueError(f"Too many rows. Max: {MAX_ROWS}")
+        values = {
+            field: value.strip()
+            for field in ROW_FIELDS
+            if isinstance(value := record.get(field), str) and value.strip()
+        }
+        if values:
+            rows.append({"row": number, **values})
+    return rows
+
+
+def _error(row: dict, message: str) -> dict:
+    return {"row": row["row"], "email": row.get("email"), "error": message}
+
+
+class RosterImportService:
+    def __init__(self, db: AsyncSession, cache: Cache | None = None):
+        self.db = db
+        self.cache = cache
+
+    async def _process_chunk(self, roster_import: RosterImport, rows: list[dict]) -> set[int]:
+        """Import one chunk. Returns the users whose memberships changed."""
+        errors = []
+        valid: dict[str, dict] = {}
+        for row in rows:
+            email = row.get("email")
+            if not email:
+                errors.append(_error(row, "Missing email"))
+                continue
+            if email in valid:
+                errors.append(_error(row, "Duplicate email"))
+                continue
+            try:
+                fields = {
+                    field: int(row[field]) if row.get(field) not in (None, "") else None
+                    for field in INTEGER_FIELDS
+                }
+            except (TypeError, ValueError):
+                errors.append(_error(row, "grade_level and target_score must be whole numbers"))
+                continue
+            fields.update({field: row.get(field) or None for field in TEXT_FIELDS})
+            valid[email] = {"row": row, "fields": fields}
+
+        user_ids = {}
+        if valid:
+            result = await self.db.execute(
+                select(User.email, User.id).where(User.email.in_(valid))
+            )
+            user_ids = dict(result.all())
+        for email, entry in valid.items():
+            if email not in user_ids:
+                errors.append(_error(entry["row"], "User not found"))
+
+        added: set[int] = set()
+        enrolled: set[int] = set()
+        if user_ids:
+            now = datetime.now(UTC)
+
+            # Inactive members are reactivated, active ones left alone
+            stmt = dialect_insert(self.db, OrganizationMember).values([
+                {
+                    "organization_id": roster_import.organization_id,
+                    "user_id": user_id,
+                    "role": roster_import.role,
+                    "is_active": True,
+                    **valid[email]["fields"],
+                }
+                for email, user_id in user_ids.items()
+            ])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["organization_id", "user_id"],
+                set_={"is_active": True, "role": stmt.excluded.role, "updated_at": now},
+                where=OrganizationMember.is_active == False,  # noqa: E712
+            ).returning(OrganizationMember.user_id)
+            added = set((await self.db.execute(stmt)).scalars().all())
+
+            if roster_import.class_id:
+                stmt = dialect_insert(self.db, ClassStudent).values([
+                    {
+                        "class_id": roster_import.class_id,
+                        "student_id": user_id,
+                        "enrolled_at": now,
+                        "is_active": True,
+                    }
+                    for user_id in user_ids.values()
+                ])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["class_id", "student_id"],
+                    set_={"is_active": True, "updated_at": now},
+                    where=ClassStudent.is_active == False,  # noqa: E712
+                ).returning(ClassStudent.student_id)
+                enrolled = set((await self.db.execute(stmt)).scalars().all())
+
+        roster_import.processed_rows += len(rows)
+        roster_import.added_count += len(added)
+        roster_import.enrolled_count += len(enrolled)
+        roster_import.skipped_count += len(set(user_ids.values()) - added - enrolled)
+        roster_import.error_count += len(errors)
+        if errors:
+            roster_import.errors = (
+                (roster_import.errors or []) + sorted(errors, key=lambda e: e["row"])
+            )
+        return added
+
+    async def run(self, import_id: int) -> RosterImport | None:
+        """
+        Process an import, committing after each chunk so progress is
+        visible while it runs. A retried import resumes after the last
+        committed chunk.
+        """
+        roster_import = await self.db.get(RosterImport, import_id)
+        if not roster_import or roster_import.status not in ("pending", "processing"):
+            return roster_import
+
+        roster_import.status = "processing"
+        roster_import.started_at = roster_import.started_at or datetime.now(UTC)
+        await self.db.commit()
+
+        rows = roster_import.rows or []
+        for start in range(roster_import.processed_rows, len(rows), CHUNK_SIZE):
+            added = await self._process_chunk(roster_import, rows[start:start + CHUNK_SIZE])
+            await self.db.commit()
+            await invalidate_memberships(self.db, *added, cache=self.cache)
+
+        # Rebuild the dashboards once rather than per imported member
+        analytics = OrgAnalyticsService(self.db)
+        await analytics.rebuild_organization(roster_import.organization_id)
+        if roster_import.class_id:
+            await analytics.rebuild_class(roster_import.class_id)
+
+        roster_import.status = "completed"
+        roster_import.completed_at = datetime.now(UTC)
+        roster_import.rows = None
+        await self.db.commit()
+        return roster_import
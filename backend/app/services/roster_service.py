@@ -0,0 +1,107 @@
+"""
+Class roster statistics.
+
+One round trip for the whole class: per-student attempt aggregates and
+the latest score come from a grouped subquery and a ROW_NUMBER window
+over completed attempts, joined to the roster and StudentAnalytics.
+"""
+
+from datetime import UTC
+
+from sqlalchemy import Select, and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Class, ClassStudent, StudentAnalytics, TestAttempt, User
+from app.models.enums import AttemptStatus
+
+
+def class_roster_query(organization_id: int, class_id: int) -> Select:
+    """Active students of an organization's class with their test stats, one row each."""
+    roster = (
+        select(ClassStudent.student_id)
+        .where(ClassStudent.class_id == class_id, ClassStudent.is_active == True)  # noqa: E712
+        .scalar_subquery()
+    )
+    completed = and_(
+        TestAttempt.user_id.in_(roster),
+        TestAttempt.status == AttemptStatus.COMPLETED,
+    )
+
+    stats = (
+        select(
+            TestAttempt.user_id,
+            func.count().label("tests_completed"),
+            func.avg(TestAttempt.total_score).label("average_score"),
+            func.max(TestAttempt.total_score).label("best_score"),
+            func.max(TestAttempt.completed_at).label("last_completed_at"),
+        )
+        .where(completed)
+        .group_by(TestAttempt.user_id)
+        .subquery()
+    )
+
+    ranked = (
+        select(
+            TestAttempt.user_id,
+            TestAttempt.total_score,
+            func.row_number().over(
+                partition_by=TestAttempt.user_id,
+                order_by=(TestAttempt.completed_at.desc(), TestAttempt.id.desc()),
+            ).label("recency"),
+        )
+        .where(completed)
+        .subquery()
+    )
+
+    return (
+        select(
+            User.id,
+            User.email,
+            User.full_name,
+            ClassStudent.enrolled_at,
+            ranked.c.total_score.label("latest_score"),
+            stats.c.tests_completed,
+            stats.c.average_score,
+            stats.c.best_score,
+            stats.c.last_completed_at,
+            StudentAnalytics.last_activity_date,
+            StudentAnalytics.weak_domains,
+        )
+        .select_from(ClassStudent)
+        .join(
+            Class,
+            and_(Class.id == ClassStudent.class_id, Class.organization_id == organization_id),
+        )
+        .join(User, User.id == ClassStudent.student_id)
+        .outerjoin(stats, stats.c.user_id == User.id)
+        .outerjoin(ranked, and_(ranked.c.user_id == User.id, ranked.c.recency == 1))
+        .outerjoin(StudentAnalytics, StudentAnalytics.user_id == User.id)
+        .where(ClassStudent.class_id == class_id, ClassStudent.is_active == True)  # noqa: E712
+        .order_by(User.full_name, User.id)
+    )
+
+
+async def get_class_roster(db: AsyncSession, organization_id: int, class_id: int) -> list[dict]:
+    result = await db.execute(class_roster_query(organization_id, class_id))
+
+    students = []
+    for row in result.all():
+        last_activity = max(
+            (value for value in (row.last_activity_date, row.last_completed_at) if value),
+            default=None,
+            # Naive values (SQLite) are stored in UTC
+            key=lambda value: value.astimezone(UTC) if value.tzinfo else value.replace(tzinfo=UTC),
+        )
+        students.append({
+            "user_id": row.id,
+            "email": row.email,
+            "full_name": row.full_name,
+            "enrolled_at": row.enrolled_at.isoformat(),
+            "latest_score": row.latest_score,
+            "tests_completed": row.tests_completed or 0,
+            "average_score": round(float(row.average_score)) if row.average_score else None,
+            "best_score": row.best_score,
+            "last_activity_at": last_activity.isoformat() if last_activity else None,
+            "weak_domains": row.weak_domains or [],
+        })
+    return students
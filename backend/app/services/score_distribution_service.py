@@ -0,0 +1,345 @@
+"""
+Platform score distribution service.
+
+Keeps a 10-point histogram of completed-attempt scores per scope
+(total, reading_writing, math) so percentiles can be looked up without
+scanning every attempt. Histograms are updated incrementally when an
+attempt completes and can be rebuilt from scratch as a repair path.
+
+The rows are shared by every completion on the platform, so they are
+never locked while an attempt is scored: the percentile is read without
+a lock, and the increment is a single UPDATE issued just before the
+submit commits (see add_attempt).
+
+Scaled scores are multiples of 10, so each bin holds a single score and
+statistics read from the histogram are exact.
+"""
+
+import math
+
+from sqlalchemy import case, func, literal_column, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import Cache
+from app.core.config import settings
+from app.core.database import dialect_insert
+from app.models import ScoreDistribution, TestAttempt
+from app.models.enums import AttemptStatus
+from app.services.scoring_service import get_percentile
+
+BIN_WIDTH = 10
+
+# Bucket width for admin-facing distributions unless one is requested
+DEFAULT_BUCKET_WIDTH = 200
+
+# scope -> (min_score, max_score)
+SCORE_RANGES = {
+    "total": (400, 1600),
+    "reading_writing": (200, 800),
+    "math": (200, 800),
+}
+
+# Below this many samples the live distribution is too noisy,
+# so percentiles fall back to the static reference table.
+MIN_SAMPLES = 100
+
+# Which histograms an attempt feeds, by test scope.
+# Single-module attempts are not comparable to section scores and are excluded.
+SCOPE_SOURCES = {
+    "full": ("total", "reading_writing", "math"),
+    "rw_only": ("reading_writing",),
+    "math_only": ("math",),
+}
+
+# Which histogram the attempt's own percentile is read from.
+PERCENTILE_SCOPE = {
+    "full": "total",
+    "rw_only": "reading_writing",
+    "math_only": "math",
+}
+
+
+def _bin_count(scope: str) -> int:
+    low, high = SCORE_RANGES[scope]
+    return (high - low) // BIN_WIDTH + 1
+
+
+def _bin_index(scope: str, score: int) -> int:
+    low, _ = SCORE_RANGES[scope]
+    index = (score - low) // BIN_WIDTH
+    return max(0, min(index, _bin_count(scope) - 1))
+
+
+def percentile_from_counts(counts: list[int], index: int) -> float:
+    """
+    Percentile rank of a score falling in bin `index`.
+
+    Uses the midpoint convention: everyone below, plus half of the
+    people who share the same bin.
+    """
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    below = sum(counts[:index])
+    return round((below + 0.5 * counts[index]) / total * 100, 1)
+
+
+def quantile_from_counts(
+    counts: list[int], min_score: int, bin_width: int, q: float
+) -> float | None:
+    """Quantile of the binned scores, interpolated like percentile_cont."""
+    total = sum(counts)
+    if total == 0:
+        return None
+
+    position = q * (total - 1)
+    wanted = (math.floor(position), math.ceil(position))
+    values: list[int] = []
+    cumulative = 0
+    for index, count in enumerate(counts):
+        cumulative += count
+        # Rank k (0-based) falls in the first bin whose cumulative count exceeds k
+        while len(values) < 2 and wanted[len(values)] < cumulative:
+            values.append(min_score + index * bin_width)
+        if len(values) == 2:
+            break
+
+    low, high = values
+    return low + (high - low) * (position - wanted[0])
+
+
+def summarize_distribution(distribution: ScoreDistribution, scope: str, bucket_width: int) -> dict:
+    """Bucketed counts and summary statistics for one histogram."""
+    low, high = SCORE_RANGES[scope]
+    buckets = {
+        f"{start}-{min(start + bucket_width, high)}": 0
+        for start in range(low, high, bucket_width)
+    }
+    last_bucket = list(buckets)[-1]
+
+    for index, count in enumerate(distribution.counts):
+        score = distribution.min_score + index * distribution.bin_width
+        start = low + (score - low) // bucket_width * bucket_width
+        key = f"{start}-{min(start + bucket_width, high)}" if score < high else last_bucket
+        buckets[key] += count
+
+    def quantile(q: float) -> float | None:
+        return quantile_from_counts(
+            distribution.counts, distribution.min_score, distribution.bin_width, q
+        )
+
+    return {
+        "distribution": buckets,
+        "stats": {
+            "count": distribution.total_count,
+            "average": distribution.score_sum / distribution.total_count,
+            "min": distribution.min_observed,
+            "max": distribution.max_observed,
+            "median": quantile(0.5),
+            "p25": quantile(0.25),
+            "p75": quantile(0.75),
+        },
+    }
+
+
+def _attempt_scores(attempt: TestAttempt) -> dict[str, int]:
+    """Scores an attempt contributes, keyed by histogram scope."""
+    values = {
+        "total": attempt.total_score,
+        "reading_writing": attempt.reading_writing_scaled_score,
+        "math": attempt.math_scaled_score,
+    }
+    return {
+        scope: values[scope]
+        for scope in SCOPE_SOURCES.get(attempt.scope, ())
+        if values[scope] is not None
+    }
+
+
+class ScoreDistributionService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _ensure_rows(self, scopes) -> None:
+        """Create missing histogram rows; concurrent creators do not conflict."""
+        await self.db.execute(
+            dialect_insert(self.db, ScoreDistribution)
+            .values([
+                {
+                    "scope": scope,
+                    "min_score": SCORE_RANGES[scope][0],
+                    "bin_width": BIN_WIDTH,
+                    "counts": [0] * _bin_count(scope),
+                    "total_count": 0,
+                    "score_sum": 0,
+                }
+                for scope in scopes
+            ])
+            .on_conflict_do_nothing(index_elements=["scope"])
+        )
+
+    def _increment_bin(self, index: int):
+        """SQL for `counts` with one bin incremented in place."""
+        if self.db.bind.dialect.name == "postgresql":
+            return literal_column(
+                f"jsonb_set(counts::jsonb, '{{{index}}}', "
+                f"to_jsonb((counts->>{index})::int + 1))::json"
+            )
+        return literal_column(
+            f"json_set(counts, '$[{index}]', json_extract(counts, '$[{index}]') + 1)"
+        )
+
+    async def get_distribution(self, scope: str) -> ScoreDistribution | None:
+        result = await self.db.execute(
+            select(ScoreDistribution)
+            .where(ScoreDistribution.scope == scope)
+            # Increments bypass the session, so never trust a loaded copy
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_summary(self, scope: str, bucket_width: int, cache: Cache) -> dict:
+        """
+        Bucketed distribution and stats for a scope, cached for
+        analytics_cache_ttl_seconds. Empty dicts when there is no data yet.
+        """
+        key = f"score-distribution:{scope}:{bucket_width}"
+        summary = await cache.get_json(key)
+        if summary is not None:
+            return summary
+
+        distribution = await self.get_distribution(scope)
+        if not distribution or not distribution.total_count:
+            summary = {"distribution": {}, "stats": {}}
+        else:
+            summary = summarize_distribution(distribution, scope, bucket_width)
+
+        await cache.set_json(key, summary, ttl=settings.analytics_cache_ttl_seconds)
+        return summary
+
+    async def get_attempt_percentile(self, attempt: TestAttempt) -> float | None:
+        """
+        Percentile of a completed attempt, counting the attempt itself.
+        Reads the histogram without locking it. Returns None for attempts
+        that have no comparable score.
+        """
+        scope = PERCENTILE_SCOPE.get(attempt.scope)
+        score = _attempt_scores(attempt).get(scope)
+        if score is None:
+            return None
+
+        result = await self.db.execute(
+            select(ScoreDistribution.counts).where(ScoreDistribution.scope == scope)
+        )
+        counts = list(result.scalar_one_or_none() or [0] * _bin_count(scope))
+        counts[_bin_index(scope, score)] += 1
+        return self._lookup(scope, score, counts)
+
+    async def add_attempt(self, attempt: TestAttempt) -> None:
+        """
+        Add a completed attempt to the histograms, one atomic UPDATE per
+        scope. The rows stay locked until commit, so call this as the last
+        write before committing.
+        """
+        scores = _attempt_scores(attempt)
+        # Update in a fixed order so concurrent completions cannot deadlock
+        for scope, score in sorted(scores.items()):
+            statement = (
+                update(ScoreDistribution)
+                .where(ScoreDistribution.scope == scope)
+                .values(
+                    counts=self._increment_bin(_bin_index(scope, score)),
+                    total_count=ScoreDistribution.total_count + 1,
+                    score_sum=ScoreDistribution.score_sum + score,
+                    min_observed=case(
+                        (ScoreDistribution.min_observed <= score, ScoreDistribution.min_observed),
+                        else_=score,
+                    ),
+                    max_observed=case(
+                        (ScoreDistribution.max_observed >= score, ScoreDistribution.max_observed),
+                        else_=score,
+                    ),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if (await self.db.execute(statement)).rowcount == 0:
+                # Rows are seeded by migration an001; recreate one if it was removed
+                await self._ensure_rows([scope])
+                await self.db.execute(statement)
+
+    async def record_attempt(self, attempt: TestAttempt) -> float | None:
+        """Add a completed attempt to the histograms and return its percentile."""
+        percentile = await self.get_attempt_percentile(attempt)
+        await self.add_attempt(attempt)
+        return percentile
+
+    async def get_percentile(self, scope: str, score: int) -> float:
+        """Percentile of a score against the live distribution."""
+        distribution = await self.get_distribution(scope)
+        counts = distribution.counts if distribution else []
+        return self._lookup(scope, score, counts)
+
+    def _lookup(self, scope: str, score: int, counts: list[int]) -> float:
+        if sum(counts) < MIN_SAMPLES:
+            # Static table is for totals; sections are scaled onto it
+            return get_percentile(score if scope == "total" else score * 2)
+        return percentile_from_counts(counts, _bin_index(scope, score))
+
+    async def rebuild(self) -> dict[str, int]:
+        """
+        Recompute all histograms from completed attempts.
+        Repair path for drift or after bulk imports; not on the request path.
+        """
+        columns = {
+            "total": TestAttempt.total_score,
+            "reading_writing": TestAttempt.reading_writing_scaled_score,
+            "math": TestAttempt.math_scaled_score,
+        }
+        counts = {scope: [0] * _bin_count(scope) for scope in SCORE_RANGES}
+        sums = dict.fromkeys(SCORE_RANGES, 0)
+        mins: dict[str, int | None] = dict.fromkeys(SCORE_RANGES)
+        maxs: dict[str, int | None] = dict.fromkeys(SCORE_RANGES)
+
+        # Bin in the database; only one row per occupied bin comes back
+        for scope, column in columns.items():
+            test_scopes = [ts for ts, sources in SCOPE_SOURCES.items() if scope in sources]
+            low, _ = SCORE_RANGES[scope]
+            bin_index = (column - low) // BIN_WIDTH
+            result = await self.db.execute(
+                select(
+                    bin_index,
+                    func.count(),
+                    func.sum(column),
+                    func.min(column),
+                    func.max(column),
+                )
+                .where(
+                    TestAttempt.status == AttemptStatus.COMPLETED,
+                    TestAttempt.scope.in_(test_scopes),
+                    column.isnot(None),
+                )
+                .group_by(bin_index)
+            )
+            for index, count, total, lowest, highest in result.all():
+                index = max(0, min(int(index), _bin_count(scope) - 1))
+                counts[scope][index] += count
+                sums[scope] += int(total)
+                mins[scope] = lowest if mins[scope] is None else min(mins[scope], lowest)
+                maxs[scope] = highest if maxs[scope] is None else max(maxs[scope], highest)
+
+        await self._ensure_rows(sorted(SCORE_RANGES))
+        result = await self.db.execute(
+            select(ScoreDistribution)
+            .order_by(ScoreDistribution.scope)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        for distribution in result.scalars():
+            scope = distribution.scope
+            distribution.counts = counts[scope]
+            distribution.total_count = sum(counts[scope])
+            distribution.score_sum = sums[scope]
+            distribution.min_observed = mins[scope]
+            distribution.max_observed = maxs[scope]
+
+        return {scope: sum(c) for scope, c in counts.items()}
@@ -5,7 +5,7 @@ The SAT uses a complex equating process to convert raw scores to scaled scores.
 This is a simplified implementation. For production, you would need:
 1. Official College Board equating tables
 2. Historical test data for calibration
-3. IRT (Item Response Theory) models for adaptive testing
+3. IRT (Item Response Theory) models for adaptive testing (see irt_service)
 """
 
 from dataclasses import dataclass
@@ -0,0 +1,207 @@
+"""
+Full-text search over the question bank and passages.
+
+On PostgreSQL each searchable model has a GIN index on the tsvector of
+its text fields (migration an019), matched with websearch_to_tsquery,
+plus a pg_trgm index on its main field so misspelt terms still find
+something. Results are ranked and come with a highlighted snippet
+(ts_headline, computed for the returned page only).
+
+Other databases (SQLite in tests) get the same results shape from an
+in-memory inverted index built over the filtered rows: terms must all
+match, by word prefix rather than stem, and hits are ranked by TF-IDF.
+"""
+
+import json
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import JSON, Select, func, literal, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Passage, Question
+
+TEXT_SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+@dataclass(frozen=True)
+class SearchTarget:
+    fields: tuple[str, ...]
+    # Matched by trigram word similarity as well, for typos
+    fuzzy_field: str
+
+
+TARGETS = {
+    Question: SearchTarget(
+        fields=("question_text", "explanation", "options"), fuzzy_field="question_text"
+    ),
+    Passage: SearchTarget(fields=("title", "content", "source", "author"), fuzzy_field="title"),
+}
+
+
+@dataclass
+class SearchHit:
+    item: Any
+    rank: float
+    highlight: str | None
+
+
+def document_sql(model) -> str:
+    """
+    The text a model is searched by, as SQL. The an019 indexes are built
+    on this expression, so change both together.
+    """
+    table = model.__table__
+    parts = []
+    for field in TARGETS[model].fields:
+        column = f"{table.name}.{field}"
+        if isinstance(table.c[field].type, JSON):
+            column += "::text"
+        parts.append(f"coalesce({column}, '')")
+    return " || ' ' || ".join(parts)
+
+
+def _document_text(item) -> str:
+    values = []
+    for field in TARGETS[type(item)].fields:
+        value = getattr(item, field)
+        if value is not None:
+            values.append(value if isinstance(value, str) else json.dumps(value))
+    return " ".join(values)
+
+
+TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return [token.lower() for token in TOKEN.findall(text)]
+
+
+class InvertedIndex:
+    """Token postings for databases without full-text search."""
+
+    def __init__(self):
+        self._postings: dict[str, dict[Any, int]] = defaultdict(dict)
+        self._size = 0
+
+    def add(self, key: Any, text: str) -> None:
+        self._size += 1
+        for token in tokenize(text):
+            postings = self._postings[token]
+            postings[key] = postings.get(key, 0) + 1
+
+    def search(self, term: str) -> dict[Any, float]:
+        """Keys matching every term (as a word or word prefix), with TF-IDF scores."""
+        scores: dict[Any, float] | None = None
+        for query_token in set(tokenize(term)):
+            matches: dict[Any, float] = defaultdict(float)
+            for token, postings in self._postings.items():
+                if token.startswith(query_token):
+                    idf = math.log(1 + self._size / len(postings))
+                    for key, count in postings.items():
+                        matches[key] += count * idf
+            if scores is None:
+                scores = dict(matches)
+            else:
+                scores = {
+                    key: score + matches[key] for key, score in scores.items() if key in matches
+                }
+            if not scores:
+                return {}
+        return scores or {}
+
+
+def highlight(text: str, term: str, width: int = 200) -> str | None:
+    """A snippet around the first match with matching words in <mark>."""
+    tokens = set(tokenize(term))
+    words = [
+        m for m in TOKEN.finditer(text)
+        if any(m.group().lower().startswith(t) for t in tokens)
+    ]
+    if not words:
+        return None
+    start = max(0, words[0].start() - width // 4)
+    end = min(len(text), start + width)
+    snippet = []
+    position = start
+    for word in words:
+        if word.end() > end:
+            break
+        if word.start() >= position:
+            snippet += [text[position:word.start()], f"<mark>{word.group()}</mark>"]
+            position = word.end()
+    snippet.append(text[position:end])
+    return ("..." if start else "") + "".join(snippet).strip() + ("..." if end < len(text) else "")
+
+
+class SearchService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search(
+        self, query: Select, model, term: str, offset: int = 0, limit: int | None = None
+    ) -> tuple[int, list[SearchHit]]:
+        """
+        Run `query` (a select of `model` with any other filters applied)
+        restricted to rows matching `term`, best matches first. Returns
+        the total match count and the requested page of hits.
+        """
+        if self.db.bind.dialect.name == "postgresql":
+            return await self._search_postgresql(query, model, term, offset, limit)
+        return await self._search_in_memory(query, model, term, offset, limit)
+
+    async def _search_postgresql(
+        self, query: Select, model, term: str, offset: int, limit: int | None
+    ) -> tuple[int, list[SearchHit]]:
+        target = TARGETS[model]
+        config = literal_column(f"'{TEXT_SEARCH_CONFIG}'")
+        document = literal_column(document_sql(model))
+        vector = func.to_tsvector(config, document)
+        ts_query = func.websearch_to_tsquery(config, literal(term))
+        fuzzy_field = getattr(model, target.fuzzy_field)
+
+        query = query.where(or_(
+            vector.op("@@")(ts_query),
+            literal(term).op("<%")(fuzzy_field),
+        ))
+        total = (await self.db.execute(
+            select(func.count()).select_from(query.subquery())
+        )).scalar() or 0
+
+        rank = func.ts_rank_cd(vector, ts_query) + func.word_similarity(literal(term), fuzzy_field)
+        query = (
+            query.add_columns(
+                rank.label("rank"),
+                func.ts_headline(config, document, ts_query, HEADLINE_OPTIONS).label("highlight"),
+            )
+            .order_by(None)
+            .order_by(rank.desc(), model.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        result = await self.db.execute(query)
+        return total, [
+            # ts_headline returns the start of the text when only the trigram matched
+            SearchHit(item, float(score), snippet if "<mark>" in (snippet or "") else None)
+            for item, score, snippet in result.all()
+        ]
+
+    async def _search_in_memory(
+        self, query: Select, model, term: str, offset: int, limit: int | None
+    ) -> tuple[int, list[SearchHit]]:
+        items = {item.id: item for item in (await self.db.execute(query)).scalars().all()}
+        index = InvertedIndex()
+        for item in items.values():
+            index.add(item.id, _document_text(item))
+
+        scores = index.search(term)
+        ranked = sorted(scores, key=lambda key: (-scores[key], -key))
+        page = ranked[offset:offset + limit if limit is not None else None]
+        return len(ranked), [
+            SearchHit(items[key], scores[key], highlight(_document_text(items[key]), term))
+            for key in page
+        ]
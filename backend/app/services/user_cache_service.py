@@ -0,0 +1,82 @@
+"""
+Cached users for authentication.
+
+Every authenticated request needs the caller's User, so its columns are
+kept in the shared cache for user_cache_ttl_seconds and attached to the
+request's session without a query. The password hash is never cached;
+it is loaded on demand by the few places that need it.
+
+Every write to a User must be followed, once committed, by
+invalidate_user; login's last_login_at update included.
+
+Access tokens carry the user's token_version. Revoking tokens bumps the
+version and drops the cached entry, so older tokens stop working on
+their next request rather than when the cache expires. There is
+deliberately no per-process layer, which would delay that.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from app.core.cache import Cache, get_cache
+from app.core.config import settings
+from app.models import User
+
+CACHED_FIELDS = tuple(
+    column.key for column in User.__table__.columns if column.key != "password_hash"
+)
+# JSON round-trips these as strings
+CONVERTERS = {
+    column.key: datetime.fromisoformat
+    if isinstance(column.type, DateTime)
+    else column.type.enum_class
+    for column in User.__table__.columns
+    if isinstance(column.type, DateTime | Enum)
+}
+
+
+def _key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def _attach(db: AsyncSession, stored: dict) -> User:
+    fields = {
+        field: CONVERTERS[field](value) if field in CONVERTERS and value is not None else value
+        for field, value in stored.items()
+    }
+    user = User(**fields)
+    # The password hash stays unloaded; refresh it before use
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+
+async def get_user(db: AsyncSession, user_id: int, cache: Cache | None = None) -> User | None:
+    """The user attached to this session, from the cache when possible."""
+    user = db.identity_map.get(identity_key(User, user_id))
+    if user is not None:
+        return user
+
+    cache = cache or get_cache()
+    stored = await cache.get_json(_key(user_id))
+    if stored is not None and set(stored) == set(CACHED_FIELDS):
+        return _attach(db, stored)
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is not None:
+        await cache.set_json(
+            _key(user_id),
+            {field: getattr(user, field) for field in CACHED_FIELDS},
+            ttl=settings.user_cache_ttl_seconds,
+        )
+    return user
+
+
+async def invalidate_user(user_id: int, cache: Cache | None = None) -> None:
+    """Drop a cached user. Call it once the change is committed."""
+    await (cache or get_cache()).delete(_key(user_id))
@@ -0,0 +1,161 @@
+"""
+Celery tasks for analytics maintenance.
+
+These are repair and rollup jobs; request handlers keep the
+analytics tables up to date incrementally.
+"""
+
+from sqlalchemy import select
+
+from app.core.cache import create_cache
+from app.core.celery_config import celery_app
+from app.models import Class, Organization, User
+from app.services.analytics_service import AnalyticsService
+from app.services.irt_service import calibrate_question_bank
+from app.services.leaderboard_service import LeaderboardService
+from app.services.org_analytics_service import OrgAnalyticsService
+from app.services.platform_analytics_service import PlatformAnalyticsService
+from app.services.recommendation_service import RecommendationService
+from app.services.score_distribution_service import ScoreDistributionService
+from app.tasks.ocr_tasks import get_task_session_maker, run_async
+
+
+@celery_app.task(bind=True)
+def rebuild_score_distributions(self):
+    """Recompute the platform score histograms from all completed attempts."""
+    return run_async(_rebuild_score_distributions_async())
+
+
+async def _rebuild_score_distributions_async():
+    """Async implementation of rebuild_score_distributions."""
+    async with get_task_session_maker()() as db:
+        totals = await ScoreDistributionService(db).rebuild()
+        await db.commit()
+        return totals
+
+
+@celery_app.task(bind=True)
+def calibrate_irt_items(self):
+    """Fit IRT parameters for every question with enough responses."""
+    return run_async(_calibrate_irt_items_async())
+
+
+async def _calibrate_irt_items_async():
+    """Async implementation of calibrate_irt_items."""
+    async with get_task_session_maker()() as db:
+        calibrated = await calibrate_question_bank(db)
+        await db.commit()
+        return {"calibrated": calibrated}
+
+
+@celery_app.task(bind=True)
+def materialize_leaderboards(self):
+    """Copy the live leaderboards into the leaderboard table."""
+    return run_async(_materialize_leaderboards_async())
+
+
+async def _materialize_leaderboards_async():
+    """Async implementation of materialize_leaderboards."""
+    cache = create_cache()
+    try:
+        async with get_task_session_maker()() as db:
+            boards = await LeaderboardService(db, cache).materialize()
+            await db.commit()
+            return {"boards": boards}
+    finally:
+        await cache.close()
+
+
+@celery_app.task(bind=True)
+def rebuild_leaderboards(self):
+    """Recompute the current live leaderboards from completed attempts."""
+    return run_async(_rebuild_leaderboards_async())
+
+
+async def _rebuild_leaderboards_async():
+    """Async implementation of rebuild_leaderboards."""
+    cache = create_cache()
+    try:
+        async with get_task_session_maker()() as db:
+            boards = await LeaderboardService(db, cache).rebuild()
+            return {"boards": boards}
+    finally:
+        await cache.close()
+
+
+@celery_app.task(bind=True)
+def rollup_platform_analytics(self):
+    """Write yesterday's platform rollup and fill any recently missed days."""
+    return run_async(_rollup_platform_analytics_async())
+
+
+async def _rollup_platform_analytics_async():
+    """Async implementation of rollup_platform_analytics."""
+    async with get_task_session_maker()() as db:
+        days = await PlatformAnalyticsService(db).rollup_recent()
+        await db.commit()
+        return {"days": days}
+
+
+@celery_app.task(bind=True)
+def repair_streaks(self, user_ids: list[int] | None = None):
+    """Rebuild study streaks from full activity history (all users by default)."""
+    return run_async(_repair_streaks_async(user_ids))
+
+
+async def _repair_streaks_async(user_ids: list[int] | None):
+    """Async implementation of repair_streaks."""
+    async with get_task_session_maker()() as db:
+        if user_ids is None:
+            user_ids = (await db.execute(select(User.id))).scalars().all()
+
+        service = AnalyticsService(db)
+        for index, user_id in enumerate(user_ids, 1):
+            await service.repair_streak(user_id)
+            if index % 500 == 0:
+                await db.commit()
+        await db.commit()
+        return {"users": len(user_ids)}
+
+
+@celery_app.task(bind=True)
+def refresh_recommendations(self):
+    """Rebuild practice recommendations for users with new answers."""
+    return run_async(_refresh_recommendations_async())
+
+
+async def _refresh_recommendations_async():
+    """Async implementation of refresh_recommendations."""
+    cache = create_cache()
+    try:
+        async with get_task_session_maker()() as db:
+            users = await RecommendationService(db, cache).refresh_stale()
+            return {"users": users}
+    finally:
+        await cache.close()
+
+
+@celery_app.task(bind=True)
+def rebuild_org_analytics(self, organization_ids: list[int] | None = None):
+    """Recompute organization and class rollups (all organizations by default)."""
+    return run_async(_rebuild_org_analytics_async(organization_ids))
+
+
+async def _rebuild_org_analytics_async(organization_ids: list[int] | None):
+    """Async implementation of rebuild_org_analytics."""
+    async with get_task_session_maker()() as db:
+        if organization_ids is None:
+            organization_ids = (await db.execute(select(Organization.id))).scalars().all()
+
+        service = OrgAnalyticsService(db)
+        classes = 0
+        for organization_id in organization_ids:
+            await service.rebuild_organization(organization_id)
+            class_ids = (await db.execute(
+                select(Class.id).where(Class.organization_id == organization_id)
+            )).scalars().all()
+            for class_id in class_ids:
+                await service.rebuild_class(class_id)
+            classes += len(class_ids)
+            await db.commit()
+        return {"organizations": len(organization_ids), "classes": classes}
@@ -0,0 +1,26 @@
+"""
+Celery tasks for in-progress test attempts.
+"""
+
+from app.core.cache import create_cache
+from app.core.celery_config import celery_app
+from app.services.autosave_service import AutosaveService
+from app.tasks.ocr_tasks import get_task_session_maker, run_async
+
+
+@celery_app.task(bind=True)
+def flush_autosaves(self):
+    """Persist dirty autosave buffers as attempt snapshots."""
+    return run_async(_flush_autosaves_async())
+
+
+async def _flush_autosaves_async():
+    """Async implementation of flush_autosaves."""
+    cache = create_cache()
+    try:
+        async with get_task_session_maker()() as db:
+            flushed = await AutosaveService(cache).flush_to_database(db)
+            await db.commit()
+            return {"flushed": flushed}
+    finally:
+        await cache.close()
@@ -0,0 +1,21 @@
+"""
+Celery tasks for authentication housekeeping.
+"""
+
+from app.core.celery_config import celery_app
+from app.core.config import settings
+from app.services.refresh_token_store import DatabaseTokenStore
+from app.tasks.ocr_tasks import get_task_session_maker, run_async
+
+
+@celery_app.task(bind=True)
+def purge_refresh_tokens(self):
+    """Delete expired and long-revoked refresh tokens."""
+    return run_async(_purge_refresh_tokens_async())
+
+
+async def _purge_refresh_tokens_async():
+    """Async implementation of purge_refresh_tokens."""
+    async with get_task_session_maker()() as db:
+        deleted = await DatabaseTokenStore(db).purge(settings.refresh_token_purge_batch_size)
+        return {"deleted": deleted}
@@ -0,0 +1,44 @@
+"""
+Celery tasks for organization management.
+"""
+
+from app.core.cache import create_cache
+from app.core.celery_config import celery_app
+from app.models import RosterImport
+from app.services.roster_import_service import RosterImportService
+from app.tasks.ocr_tasks import get_task_session_maker, run_async
+
+
+@celery_app.task(bind=True)
+def process_roster_import(self, import_id: int):
+    """Add the members and class students of a bulk roster import."""
+    return run_async(_process_roster_import_async(import_id))
+
+
+async def _process_roster_import_async(import_id: int):
+    """Async implementation of process_roster_import."""
+    cache = create_cache()
+    try:
+        async with get_task_session_maker()() as db:
+            try:
+                roster_import = await RosterImportService(db, cache).run(import_id)
+            except Exception as e:
+                # Chunks committed before the error stay in the report
+                await db.rollback()
+                roster_import = await db.get(RosterImport, import_id)
+                if roster_import:
+                    roster_import.status = "failed"
+                    roster_import.error_message = str(e)
+                    await db.commit()
+                return {"error": str(e), "import_id": import_id}
+
+            if not roster_import:
+                return {"error": "Import not found", "import_id": import_id}
+            return {
+                "import_id": import_id,
+                "status": roster_import.status,
+                "processed_rows": roster_import.processed_rows,
+                "error_count": roster_import.error_count,
+            }
+    finally:
+        await cache.close()
@@ -0,0 +1,30 @@
+import asyncio
+import sys
+from datetime import UTC, date, datetime, timedelta
+
+from app.core.database import async_session_maker
+
+# Import OCR models to resolve relationship
+from app.models.ocr import ExtractedQuestion, OCRJob, OCRJobPage  # noqa: F401
+from app.services.platform_analytics_service import PlatformAnalyticsService
+
+
+async def backfill(first_day: date, last_day: date):
+    async with async_session_maker() as session:
+        days = await PlatformAnalyticsService(session).backfill(first_day, last_day)
+        await session.commit()
+        print(f"Rolled up {days} days ({first_day} to {last_day}).")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python backfill_platform_analytics.py <start YYYY-MM-DD> [end YYYY-MM-DD]")
+        print("End defaults to yesterday (UTC).")
+        sys.exit(1)
+
+    start = date.fromisoformat(sys.argv[1])
+    end = (
+        date.fromisoformat(sys.argv[2]) if len(sys.argv) == 3
+        else datetime.now(UTC).date() - timedelta(days=1)
+    )
+    asyncio.run(backfill(start, end))
@@ -16,21 +16,29 @@ from app.models import (  # noqa: F401
     Assignment,
     AssignmentSubmission,
     AttemptAnswer,
+    AttemptSummary,
     Class,
+    ClassAnalytics,
     ClassStudent,
     Content,
     ContentCategory,
     ContentProgress,
     DomainProgress,
+    DrillAttempt,
     Leaderboard,
     ModuleResult,
     Notification,
     Organization,
+    OrganizationAnalytics,
     OrganizationMember,
     Passage,
     PlatformAnalytics,
     Question,
+    QuestionSkill,
     RefreshToken,
+    ReviewItem,
+    RosterImport,
+    ScoreDistribution,
     ScoreHistory,
     StudentAnalytics,
     StudentAssignment,
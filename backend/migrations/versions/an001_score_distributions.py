@@ -0,0 +1,73 @@
+"""Add score_distributions table for live percentile lookups
+
+One empty row per scope is seeded, so completions only ever update them.
+Existing attempts are not backfilled here; run the
+rebuild_score_distributions task once after upgrading.
+
+Revision ID: an001_score_distributions
+Revises: ocr005_pdf_data
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an001_score_distributions'
+down_revision: Union[str, None] = 'ocr005_pdf_data'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('score_distributions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('scope', sa.String(length=30), nullable=False),
+    sa.Column('min_score', sa.Integer(), nullable=False),
+    sa.Column('bin_width', sa.Integer(), nullable=False),
+    sa.Column('counts', sa.JSON(), nullable=False),
+    sa.Column('total_count', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.BigInteger(), nullable=False),
+    sa.Column('min_observed', sa.Integer(), nullable=True),
+    sa.Column('max_observed', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_score_distributions_id'), 'score_distributions', ['id'], unique=False)
+    op.create_index(op.f('ix_score_distributions_scope'), 'score_distributions', ['scope'], unique=True)
+
+    # Same layout as score_distribution_service: 10-point bins over each scope's range
+    score_distributions = sa.table(
+        'score_distributions',
+        sa.column('scope', sa.String),
+        sa.column('min_score', sa.Integer),
+        sa.column('bin_width', sa.Integer),
+        sa.column('counts', sa.JSON),
+        sa.column('total_count', sa.Integer),
+        sa.column('score_sum', sa.BigInteger),
+    )
+    op.bulk_insert(score_distributions, [
+        {
+            'scope': scope,
+            'min_score': low,
+            'bin_width': 10,
+            'counts': [0] * ((high - low) // 10 + 1),
+            'total_count': 0,
+            'score_sum': 0,
+        }
+        for scope, (low, high) in (
+            ('total', (400, 1600)),
+            ('reading_writing', (200, 800)),
+            ('math', (200, 800)),
+        )
+    ])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_score_distributions_scope'), table_name='score_distributions')
+    op.drop_index(op.f('ix_score_distributions_id'), table_name='score_distributions')
+    op.drop_table('score_distributions')
@@ -0,0 +1,34 @@
+"""Add IRT item parameter columns to questions
+
+Revision ID: an002_question_irt_params
+Revises: an001_score_distributions
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an002_question_irt_params'
+down_revision: Union[str, None] = 'an001_score_distributions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('questions', sa.Column('irt_discrimination', sa.Float(), nullable=True))
+    op.add_column('questions', sa.Column('irt_difficulty', sa.Float(), nullable=True))
+    op.add_column('questions', sa.Column('irt_guessing', sa.Float(), nullable=True))
+    op.add_column('questions', sa.Column('irt_sample_size', sa.Integer(), nullable=True))
+    op.add_column('questions', sa.Column('irt_calibrated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('questions', 'irt_calibrated_at')
+    op.drop_column('questions', 'irt_sample_size')
+    op.drop_column('questions', 'irt_guessing')
+    op.drop_column('questions', 'irt_difficulty')
+    op.drop_column('questions', 'irt_discrimination')
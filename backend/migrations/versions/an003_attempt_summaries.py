@@ -0,0 +1,46 @@
+"""Add attempt_summaries table for materialized attempt detail/review data
+
+Summaries for existing finished attempts are built lazily on first read.
+
+Revision ID: an003_attempt_summaries
+Revises: an002_question_irt_params
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an003_attempt_summaries'
+down_revision: Union[str, None] = 'an002_question_irt_params'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('attempt_summaries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('attempt_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('domain_breakdown', sa.JSON(), nullable=False),
+    sa.Column('module_results', sa.JSON(), nullable=False),
+    sa.Column('questions', sa.JSON(), nullable=False),
+    sa.Column('total_correct', sa.Integer(), nullable=False),
+    sa.Column('total_questions', sa.Integer(), nullable=False),
+    sa.Column('total_time_seconds', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['attempt_id'], ['test_attempts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_attempt_summaries_id'), 'attempt_summaries', ['id'], unique=False)
+    op.create_index(op.f('ix_attempt_summaries_attempt_id'), 'attempt_summaries', ['attempt_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_attempt_summaries_attempt_id'), table_name='attempt_summaries')
+    op.drop_index(op.f('ix_attempt_summaries_id'), table_name='attempt_summaries')
+    op.drop_table('attempt_summaries')
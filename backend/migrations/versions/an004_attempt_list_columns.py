@@ -0,0 +1,55 @@
+"""Add denormalized list columns and keyset indexes to test_attempts
+
+Revision ID: an004_attempt_list_columns
+Revises: an003_attempt_summaries
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an004_attempt_list_columns'
+down_revision: Union[str, None] = 'an003_attempt_summaries'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('test_attempts', sa.Column('scope', sa.String(length=20), server_default='full', nullable=False))
+    op.add_column('test_attempts', sa.Column('total_time_seconds', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('test_attempts', sa.Column('question_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the config stashed in domain_breakdown and from module results
+    op.execute("""
+        UPDATE test_attempts
+        SET scope = domain_breakdown -> '_config' ->> 'scope'
+        WHERE domain_breakdown -> '_config' ->> 'scope' IS NOT NULL
+    """)
+    op.execute("""
+        UPDATE test_attempts ta
+        SET total_time_seconds = agg.total_time,
+            question_count = agg.question_count
+        FROM (
+            SELECT attempt_id,
+                   COALESCE(SUM(time_spent_seconds), 0) AS total_time,
+                   COALESCE(SUM(total_count), 0) AS question_count
+            FROM module_results
+            GROUP BY attempt_id
+        ) agg
+        WHERE agg.attempt_id = ta.id
+    """)
+
+    op.create_index('ix_test_attempts_user_started', 'test_attempts', ['user_id', 'started_at', 'id'], unique=False)
+    op.create_index('ix_test_attempts_status_completed', 'test_attempts', ['status', 'completed_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_test_attempts_status_completed', table_name='test_attempts')
+    op.drop_index('ix_test_attempts_user_started', table_name='test_attempts')
+    op.drop_column('test_attempts', 'question_count')
+    op.drop_column('test_attempts', 'total_time_seconds')
+    op.drop_column('test_attempts', 'scope')
@@ -0,0 +1,26 @@
+"""Add autosave snapshot to test_attempts
+
+Revision ID: an005_attempt_autosave_snapshot
+Revises: an004_attempt_list_columns
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an005_attempt_autosave_snapshot'
+down_revision: Union[str, None] = 'an004_attempt_list_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('test_attempts', sa.Column('autosave_snapshot', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('test_attempts', 'autosave_snapshot')
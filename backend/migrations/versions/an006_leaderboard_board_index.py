@@ -0,0 +1,26 @@
+"""Add board/rank index to leaderboard
+
+Revision ID: an006_leaderboard_board_index
+Revises: an005_attempt_autosave_snapshot
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an006_leaderboard_board_index'
+down_revision: Union[str, None] = 'an005_attempt_autosave_snapshot'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_leaderboard_board_rank', 'leaderboard', ['scope_type', 'scope_id', 'period_type', 'period_start', 'rank'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_leaderboard_board_rank', table_name='leaderboard')
@@ -0,0 +1,26 @@
+"""Add period index to platform_analytics
+
+Revision ID: an007_platform_analytics_period_index
+Revises: an006_leaderboard_board_index
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an007_platform_analytics_period_index'
+down_revision: Union[str, None] = 'an006_leaderboard_board_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_platform_analytics_period', 'platform_analytics', ['period_type', 'organization_id', 'period_start'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_platform_analytics_period', table_name='platform_analytics')
@@ -0,0 +1,47 @@
+"""Add question_skills table for SQL-side skill analytics
+
+Rows are backfilled from questions.skill_tags; new and retagged questions
+are synced on flush.
+
+Revision ID: an008_question_skills
+Revises: an007_platform_analytics_period_index
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an008_question_skills'
+down_revision: Union[str, None] = 'an007_platform_analytics_period_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('question_skills',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('skill', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('question_id', 'skill', name='uq_question_skill')
+    )
+    op.create_index(op.f('ix_question_skills_skill'), 'question_skills', ['skill'], unique=False)
+
+    op.execute("""
+        INSERT INTO question_skills (question_id, skill)
+        SELECT DISTINCT q.id, left(tag, 100)
+        FROM questions q,
+             json_array_elements_text(
+                 CASE WHEN json_typeof(q.skill_tags) = 'array' THEN q.skill_tags END
+             ) AS tag
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_question_skills_skill'), table_name='question_skills')
+    op.drop_table('question_skills')
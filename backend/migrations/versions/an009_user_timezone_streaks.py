@@ -0,0 +1,30 @@
+"""Add user timezone and last active day for incremental streaks
+
+Existing streaks are rebuilt by the repair_streaks task.
+
+Revision ID: an009_user_timezone_streaks
+Revises: an008_question_skills
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an009_user_timezone_streaks'
+down_revision: Union[str, None] = 'an008_question_skills'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('timezone', sa.String(length=64), server_default='UTC', nullable=False))
+    op.add_column('student_analytics', sa.Column('last_active_day', sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('student_analytics', 'last_active_day')
+    op.drop_column('users', 'timezone')
@@ -0,0 +1,50 @@
+"""Make domain_progress unique per (user, domain) for upserts
+
+Duplicate rows, if any, are folded into the newest one first.
+
+Revision ID: an010_domain_progress_unique
+Revises: an009_user_timezone_streaks
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an010_domain_progress_unique'
+down_revision: Union[str, None] = 'an009_user_timezone_streaks'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE domain_progress AS keep
+        SET total_questions = totals.total_questions,
+            correct_answers = totals.correct_answers,
+            accuracy = CASE WHEN totals.total_questions > 0
+                THEN totals.correct_answers::float / totals.total_questions ELSE 0 END
+        FROM (
+            SELECT user_id, domain, max(id) AS id,
+                   sum(total_questions) AS total_questions,
+                   sum(correct_answers) AS correct_answers
+            FROM domain_progress
+            GROUP BY user_id, domain
+            HAVING count(*) > 1
+        ) AS totals
+        WHERE keep.id = totals.id
+    """)
+    op.execute("""
+        DELETE FROM domain_progress AS old
+        USING domain_progress AS newer
+        WHERE old.user_id = newer.user_id
+          AND old.domain = newer.domain
+          AND old.id < newer.id
+    """)
+    op.create_unique_constraint('uq_domain_progress_user_domain', 'domain_progress', ['user_id', 'domain'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_domain_progress_user_domain', 'domain_progress', type_='unique')
@@ -0,0 +1,43 @@
+"""Add drill_attempts table
+
+Revision ID: an011_drill_attempts
+Revises: an010_domain_progress_unique
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an011_drill_attempts'
+down_revision: Union[str, None] = 'an010_domain_progress_unique'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('drill_attempts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('question_count', sa.Integer(), nullable=False),
+    sa.Column('correct_count', sa.Integer(), nullable=False),
+    sa.Column('time_spent_seconds', sa.Integer(), nullable=False),
+    sa.Column('responses', sa.JSON(), nullable=False),
+    sa.Column('domain_stats', sa.JSON(), nullable=False),
+    sa.Column('skill_stats', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_drill_attempts_id'), 'drill_attempts', ['id'], unique=False)
+    op.create_index('ix_drill_attempts_user_created', 'drill_attempts', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_drill_attempts_user_created', table_name='drill_attempts')
+    op.drop_index(op.f('ix_drill_attempts_id'), table_name='drill_attempts')
+    op.drop_table('drill_attempts')
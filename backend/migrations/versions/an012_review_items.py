@@ -0,0 +1,59 @@
+"""Add review_items spaced-repetition queue
+
+Backfilled with every question a student has missed on a completed
+attempt, due immediately.
+
+Revision ID: an012_review_items
+Revises: an011_drill_attempts
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an012_review_items'
+down_revision: Union[str, None] = 'an011_drill_attempts'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('review_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('due_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('interval_days', sa.Integer(), nullable=False),
+    sa.Column('ease_factor', sa.Float(), nullable=False),
+    sa.Column('repetitions', sa.Integer(), nullable=False),
+    sa.Column('lapses', sa.Integer(), nullable=False),
+    sa.Column('last_reviewed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'question_id', name='uq_review_item_user_question')
+    )
+    op.create_index(op.f('ix_review_items_id'), 'review_items', ['id'], unique=False)
+    op.create_index('ix_review_items_user_due', 'review_items', ['user_id', 'due_at'], unique=False)
+
+    op.execute("""
+        INSERT INTO review_items
+            (user_id, question_id, due_at, interval_days, ease_factor, repetitions, lapses)
+        SELECT ta.user_id, aa.question_id, now(), 0, 2.5, 0, count(*)
+        FROM attempt_answers aa
+        JOIN test_attempts ta ON ta.id = aa.attempt_id
+        WHERE aa.is_correct = false AND ta.status = 'COMPLETED'
+        GROUP BY ta.user_id, aa.question_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_review_items_user_due', table_name='review_items')
+    op.drop_index(op.f('ix_review_items_id'), table_name='review_items')
+    op.drop_table('review_items')
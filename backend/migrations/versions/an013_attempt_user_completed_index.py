@@ -0,0 +1,30 @@
+"""Add (user_id, status, completed_at) index to test_attempts for roster stats
+
+Revision ID: an013_attempt_user_completed_index
+Revises: an012_review_items
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an013_attempt_user_completed_index'
+down_revision: Union[str, None] = 'an012_review_items'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_test_attempts_user_status_completed',
+        'test_attempts',
+        ['user_id', 'status', 'completed_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_test_attempts_user_status_completed', table_name='test_attempts')
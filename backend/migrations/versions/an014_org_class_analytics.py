@@ -0,0 +1,71 @@
+"""Add organization_analytics and class_analytics rollups
+
+Not backfilled here: a missing row is built from the source tables the
+first time its dashboard is read or one of its counters changes.
+
+Revision ID: an014_org_class_analytics
+Revises: an013_attempt_user_completed_index
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an014_org_class_analytics'
+down_revision: Union[str, None] = 'an013_attempt_user_completed_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('organization_analytics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('member_counts', sa.JSON(), nullable=True),
+    sa.Column('class_count', sa.Integer(), nullable=False),
+    sa.Column('tests_completed', sa.Integer(), nullable=False),
+    sa.Column('score_total', sa.BigInteger(), nullable=False),
+    sa.Column('scored_tests', sa.Integer(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=True),
+    sa.Column('attempts_this_week', sa.Integer(), nullable=False),
+    sa.Column('active_students_this_week', sa.Integer(), nullable=False),
+    sa.Column('domain_performance', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_organization_analytics_id'), 'organization_analytics', ['id'], unique=False)
+    op.create_index(op.f('ix_organization_analytics_organization_id'), 'organization_analytics', ['organization_id'], unique=True)
+
+    op.create_table('class_analytics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('class_id', sa.Integer(), nullable=False),
+    sa.Column('student_count', sa.Integer(), nullable=False),
+    sa.Column('tests_completed', sa.Integer(), nullable=False),
+    sa.Column('score_total', sa.BigInteger(), nullable=False),
+    sa.Column('scored_tests', sa.Integer(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=True),
+    sa.Column('attempts_this_week', sa.Integer(), nullable=False),
+    sa.Column('active_students_this_week', sa.Integer(), nullable=False),
+    sa.Column('domain_performance', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['class_id'], ['classes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_class_analytics_id'), 'class_analytics', ['id'], unique=False)
+    op.create_index(op.f('ix_class_analytics_class_id'), 'class_analytics', ['class_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_class_analytics_class_id'), table_name='class_analytics')
+    op.drop_index(op.f('ix_class_analytics_id'), table_name='class_analytics')
+    op.drop_table('class_analytics')
+    op.drop_index(op.f('ix_organization_analytics_organization_id'), table_name='organization_analytics')
+    op.drop_index(op.f('ix_organization_analytics_id'), table_name='organization_analytics')
+    op.drop_table('organization_analytics')
@@ -0,0 +1,59 @@
+"""Add roster_imports for bulk member/class uploads
+
+Revision ID: an015_roster_imports
+Revises: an014_org_class_analytics
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an015_roster_imports'
+down_revision: Union[str, None] = 'an014_org_class_analytics'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('roster_imports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('organization_id', sa.Integer(), nullable=False),
+    sa.Column('class_id', sa.Integer(), nullable=True),
+    sa.Column('created_by_id', sa.Integer(), nullable=True),
+    sa.Column('role', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('rows', sa.JSON(), nullable=True),
+    sa.Column('total_rows', sa.Integer(), nullable=False),
+    sa.Column('processed_rows', sa.Integer(), nullable=False),
+    sa.Column('added_count', sa.Integer(), nullable=False),
+    sa.Column('enrolled_count', sa.Integer(), nullable=False),
+    sa.Column('skipped_count', sa.Integer(), nullable=False),
+    sa.Column('error_count', sa.Integer(), nullable=False),
+    sa.Column('errors', sa.JSON(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('celery_task_id', sa.String(length=255), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['class_id'], ['classes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['created_by_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_roster_imports_id'), 'roster_imports', ['id'], unique=False)
+    op.create_index(op.f('ix_roster_imports_organization_id'), 'roster_imports', ['organization_id'], unique=False)
+    op.create_index(op.f('ix_roster_imports_class_id'), 'roster_imports', ['class_id'], unique=False)
+    op.create_index(op.f('ix_roster_imports_created_by_id'), 'roster_imports', ['created_by_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_roster_imports_created_by_id'), table_name='roster_imports')
+    op.drop_index(op.f('ix_roster_imports_class_id'), table_name='roster_imports')
+    op.drop_index(op.f('ix_roster_imports_organization_id'), table_name='roster_imports')
+    op.drop_index(op.f('ix_roster_imports_id'), table_name='roster_imports')
+    op.drop_table('roster_imports')
@@ -0,0 +1,49 @@
+"""Add assignment completion counters and fan out class assignments
+
+Existing class assignments get a student_assignments row for each active
+student of the class, matching what new assignments fan out to.
+
+Revision ID: an016_assignment_fan_out
+Revises: an015_roster_imports
+Create Date: 2026-10-19 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an016_assignment_fan_out'
+down_revision: Union[str, None] = 'an015_roster_imports'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('assignments', sa.Column('assigned_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('assignments', sa.Column('submitted_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute("""
+        INSERT INTO student_assignments (assignment_id, student_id)
+        SELECT a.id, cs.student_id
+        FROM assignments a
+        JOIN class_students cs ON cs.class_id = a.class_id AND cs.is_active = true
+        ON CONFLICT (assignment_id, student_id) DO NOTHING
+    """)
+    op.execute("""
+        UPDATE assignments a SET
+            assigned_count = (
+                SELECT count(*) FROM student_assignments sa WHERE sa.assignment_id = a.id
+            ),
+            submitted_count = (
+                SELECT count(DISTINCT s.student_id) FROM assignment_submissions s
+                WHERE s.assignment_id = a.id
+            )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('assignments', 'submitted_count')
+    op.drop_column('assignments', 'assigned_count')
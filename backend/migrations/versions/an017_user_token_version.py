@@ -0,0 +1,26 @@
+"""Add users.token_version for access token revocation
+
+Revision ID: an017_user_token_version
+Revises: an016_assignment_fan_out
+Create Date: 2026-10-19 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an017_user_token_version'
+down_revision: Union[str, None] = 'an016_assignment_fan_out'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
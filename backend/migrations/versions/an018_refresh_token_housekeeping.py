@@ -0,0 +1,31 @@
+"""Index refresh_tokens for purging expired and revoked tokens
+
+Revision ID: an018_refresh_token_housekeeping
+Revises: an017_user_token_version
+Create Date: 2026-10-19 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an018_refresh_token_housekeeping'
+down_revision: Union[str, None] = 'an017_user_token_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_refresh_tokens_expires_at'), 'refresh_tokens', ['expires_at'], unique=False)
+    op.create_index(
+        'ix_refresh_tokens_revoked_at', 'refresh_tokens', ['revoked_at'], unique=False,
+        postgresql_where=sa.text('revoked'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_refresh_tokens_revoked_at', table_name='refresh_tokens')
+    op.drop_index(op.f('ix_refresh_tokens_expires_at'), table_name='refresh_tokens')
@@ -0,0 +1,59 @@
+"""Add full-text and trigram search indexes
+
+The tsvector expressions must match app.services.search_service.document_sql.
+The user trigram indexes serve the existing ILIKE searches on email/name.
+
+Revision ID: an019_search_indexes
+Revises: an018_refresh_token_housekeeping
+Create Date: 2026-10-19 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'an019_search_indexes'
+down_revision: Union[str, None] = 'an018_refresh_token_housekeeping'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+QUESTION_DOCUMENT = (
+    "coalesce(question_text, '') || ' ' || coalesce(explanation, '') || ' ' "
+    "|| coalesce(options::text, '')"
+)
+PASSAGE_DOCUMENT = (
+    "coalesce(title, '') || ' ' || coalesce(content, '') || ' ' "
+    "|| coalesce(source, '') || ' ' || coalesce(author, '')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.execute(
+        f"CREATE INDEX ix_questions_search ON questions "
+        f"USING gin (to_tsvector('english', {QUESTION_DOCUMENT}))"
+    )
+    op.execute(
+        "CREATE INDEX ix_questions_question_text_trgm ON questions "
+        "USING gin (question_text gin_trgm_ops)"
+    )
+    op.execute(
+        f"CREATE INDEX ix_passages_search ON passages "
+        f"USING gin (to_tsvector('english', {PASSAGE_DOCUMENT}))"
+    )
+    op.execute("CREATE INDEX ix_passages_title_trgm ON passages USING gin (title gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_users_email_trgm ON users USING gin (email gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_users_full_name_trgm ON users USING gin (full_name gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_full_name_trgm', table_name='users')
+    op.drop_index('ix_users_email_trgm', table_name='users')
+    op.drop_index('ix_passages_title_trgm', table_name='passages')
+    op.drop_index('ix_passages_search', table_name='passages')
+    op.drop_index('ix_questions_question_text_trgm', table_name='questions')
+    op.drop_index('ix_questions_search', table_name='questions')
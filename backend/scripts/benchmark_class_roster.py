@@ -0,0 +1,183 @@
+"""
+Benchmark the class roster query against the old per-student queries.
+
+Seeds an organization with one class of N students (default 1000), each
+with a few completed attempts, then times both approaches and prints the
+query plan of the new one. Everything runs in one transaction that is
+rolled back, so it leaves no data behind.
+
+    python scripts/benchmark_class_roster.py            # DATABASE_URL (PostgreSQL)
+    python scripts/benchmark_class_roster.py --sqlite   # throwaway in-memory SQLite
+    python scripts/benchmark_class_roster.py --students 200 --attempts 5
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, insert, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.models import (  # noqa: E402
+    Class,
+    ClassStudent,
+    Organization,
+    Test,
+    TestAttempt,
+    User,
+)
+from app.models.enums import AttemptStatus, TestType  # noqa: E402
+
+# Import OCR models to resolve relationships
+from app.models.ocr import ExtractedQuestion, OCRJob, OCRJobPage  # noqa: E402, F401
+from app.services.roster_service import class_roster_query, get_class_roster  # noqa: E402
+
+
+async def seed(db: AsyncSession, students: int, attempts: int) -> tuple[int, int]:
+    stamp = int(time.time())
+    teacher_id = (await db.execute(
+        insert(User).returning(User.id),
+        [{
+            "email": f"bench-teacher-{stamp}@example.com",
+            "password_hash": "x",
+            "full_name": "Bench Teacher",
+        }],
+    )).scalar_one()
+    org_id = (await db.execute(
+        insert(Organization).returning(Organization.id),
+        [{"name": "Roster Benchmark", "slug": f"roster-benchmark-{stamp}"}],
+    )).scalar_one()
+    class_id = (await db.execute(
+        insert(Class).returning(Class.id),
+        [{"organization_id": org_id, "name": "Benchmark Class", "teacher_id": teacher_id}],
+    )).scalar_one()
+    test_id = (await db.execute(
+        insert(Test).returning(Test.id),
+        [{"title": "Benchmark Test", "test_type": TestType.FULL_TEST}],
+    )).scalar_one()
+
+    user_ids = (await db.execute(
+        insert(User).returning(User.id),
+        [
+            {
+                "email": f"bench-{stamp}-{n}@example.com",
+                "password_hash": "x",
+                "full_name": f"Student {n:04d}",
+            }
+            for n in range(students)
+        ],
+    )).scalars().all()
+    await db.execute(
+        insert(ClassStudent),
+        [{"class_id": class_id, "student_id": user_id} for user_id in user_ids],
+    )
+
+    now = datetime.now(UTC)
+    await db.execute(
+        insert(TestAttempt),
+        [
+            {
+                "user_id": user_id,
+                "test_id": test_id,
+                "status": AttemptStatus.COMPLETED,
+                "completed_at": now - timedelta(days=n),
+                "total_score": 900 + (user_id * 37 + n * 53) % 700,
+            }
+            for user_id in user_ids
+            for n in range(attempts)
+        ],
+    )
+    return org_id, class_id
+
+
+async def per_student(db: AsyncSession, class_id: int) -> int:
+    """The previous implementation: two queries per student."""
+    result = await db.execute(
+        select(ClassStudent.student_id).where(
+            ClassStudent.class_id == class_id, ClassStudent.is_active == True  # noqa: E712
+        )
+    )
+    queries = 1
+    for user_id in result.scalars().all():
+        await db.execute(
+            select(TestAttempt.total_score)
+            .where(TestAttempt.user_id == user_id, TestAttempt.status == AttemptStatus.COMPLETED)
+            .order_by(TestAttempt.completed_at.desc())
+            .limit(1)
+        )
+        await db.execute(
+            select(func.count()).where(
+                TestAttempt.user_id == user_id, TestAttempt.status == AttemptStatus.COMPLETED
+            )
+        )
+        queries += 2
+    return queries
+
+
+async def timed(label: str, run, repeat: int = 3) -> None:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outcome = await run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<28} {best * 1000:9.1f} ms  ({outcome})")
+
+
+async def main(args: argparse.Namespace) -> None:
+    url = "sqlite+aiosqlite://" if args.sqlite else settings.database_url
+    engine = create_async_engine(url)
+    if args.sqlite:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn)
+        try:
+            org_id, class_id = await seed(db, args.students, args.attempts)
+            if conn.dialect.name == "postgresql":
+                await db.execute(
+                    text("ANALYZE users, class_students, test_attempts, student_analytics")
+                )
+            print(f"{args.students} students x {args.attempts} attempts ({conn.dialect.name})\n")
+
+            await timed("per-student queries", lambda: per_student(db, class_id))
+            await timed(
+                "single roster query",
+                lambda: _roster_size(db, org_id, class_id),
+            )
+
+            sql = str(class_roster_query(org_id, class_id).compile(
+                dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+            ))
+            explain = (
+                "EXPLAIN (ANALYZE, BUFFERS) " if conn.dialect.name == "postgresql"
+                else "EXPLAIN QUERY PLAN "
+            )
+            print("\nPlan:")
+            for row in (await db.execute(text(explain + sql))).all():
+                print("  " + " | ".join(str(value) for value in row))
+        finally:
+            await db.close()
+            await transaction.rollback()
+    await engine.dispose()
+
+
+async def _roster_size(db: AsyncSession, org_id: int, class_id: int) -> str:
+    return f"1 query, {len(await get_class_roster(db, org_id, class_id))} rows"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--attempts", type=int, default=3)
+    parser.add_argument("--sqlite", action="store_true", help="use an in-memory SQLite database")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,152 @@
+"""
+Load test: latency of unrelated requests during a burst of logins.
+
+Runs the app in-process, fires a batch of concurrent logins (each one a
+bcrypt verification) and meanwhile probes GET /health, which does no
+I/O, so its latency is how long the event loop was unavailable. Prints
+/health percentiles for hashing on the password pool and, for
+comparison, inline on the event loop as before.
+
+    python scripts/loadtest_password_hashing.py            # DATABASE_URL (PostgreSQL)
+    python scripts/loadtest_password_hashing.py --sqlite   # throwaway SQLite file
+    python scripts/loadtest_password_hashing.py --logins 100 --workers 8
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import delete, insert  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.core import security  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base, get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import RefreshToken, User  # noqa: E402
+
+# Import OCR models to resolve relationships
+from app.models.ocr import ExtractedQuestion, OCRJob, OCRJobPage  # noqa: E402, F401
+
+PASSWORD = "LoadTest123!"
+
+
+async def probe(client: AsyncClient, stop: asyncio.Event, latencies: list[float]) -> None:
+    # Latency counts from when each probe was due, so time the loop spent
+    # blocked before it could even send the request is included
+    interval = 0.01
+    due = time.perf_counter()
+    while not stop.is_set():
+        await client.get("/health")
+        latencies.append(time.perf_counter() - due)
+        due = max(due + interval, time.perf_counter())
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+
+
+async def burst(client: AsyncClient, emails: list[str]) -> tuple[float, list[float]]:
+    stop = asyncio.Event()
+    latencies: list[float] = []
+    prober = asyncio.create_task(probe(client, stop, latencies))
+
+    start = time.perf_counter()
+    try:
+        responses = await asyncio.gather(*(
+            client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+            for email in emails
+        ))
+    finally:
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await prober
+
+    failed = [r.status_code for r in responses if r.status_code != 200]
+    if failed:
+        raise SystemExit(f"{len(failed)} logins failed: {failed[:5]}")
+    return elapsed, latencies
+
+
+def report(label: str, logins: int, elapsed: float, latencies: list[float]) -> None:
+    ms = sorted(latency * 1000 for latency in latencies)
+    p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+    print(
+        f"{label:<22} {logins} logins in {elapsed:6.2f}s | /health "
+        f"p50 {statistics.median(ms):7.1f} ms  p99 {p99:7.1f} ms  max {ms[-1]:7.1f} ms  "
+        f"({len(ms)} probes)"
+    )
+
+
+async def inline(func, *args):
+    """The previous behaviour: bcrypt on the event loop."""
+    return func(*args)
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings.cache_backend = "memory"
+    if args.sqlite:
+        path = Path(tempfile.mkdtemp()) / "loadtest.db"
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}", connect_args={"timeout": 60})
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    else:
+        engine = create_async_engine(settings.database_url)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+    async def override_get_db():
+        async with session_maker() as session:
+            yield session
+            await session.commit()
+
+    app.dependency_overrides[get_db] = override_get_db
+    security.password_hash_pool = security.PasswordHashPool(args.workers)
+
+    # A separate user per login, as in a real login storm
+    stamp = int(time.time())
+    emails = [f"loadtest-{stamp}-{n}@example.com" for n in range(args.logins)]
+    password_hash = security.hash_password(PASSWORD)
+    async with session_maker() as db:
+        user_ids = (await db.execute(
+            insert(User).returning(User.id),
+            [
+                {"email": email, "password_hash": password_hash, "full_name": "Load Test"}
+                for email in emails
+            ],
+        )).scalars().all()
+        await db.commit()
+
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            # Warm up connections and imports before measuring
+            await burst(client, emails[:2])
+
+            print(f"{args.logins} concurrent logins, {args.workers} hashing threads\n")
+            elapsed, latencies = await burst(client, emails)
+            report("password pool", args.logins, elapsed, latencies)
+            print(f"{'':<22} pool: {security.password_hash_pool.stats()}")
+
+            with mock.patch.object(security.password_hash_pool, "run", inline):
+                elapsed, latencies = await burst(client, emails)
+            report("inline (previous)", args.logins, elapsed, latencies)
+    finally:
+        async with session_maker() as db:
+            await db.execute(delete(RefreshToken).where(RefreshToken.user_id.in_(user_ids)))
+            await db.execute(delete(User).where(User.id.in_(user_ids)))
+            await db.commit()
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=settings.password_hash_workers)
+    parser.add_argument("--sqlite", action="store_true", help="use a throwaway SQLite database")
+    asyncio.run(main(parser.parse_args()))
@@ -13,6 +13,7 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
+from app.core.cache import clear_local_caches, get_cache
 from app.core.config import settings
 from app.core.database import Base, get_db
 from app.core.security import create_access_token, hash_password
@@ -44,6 +45,9 @@ from app.models.enums import (
 # Use SQLite for testing (in-memory)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
+# Use the in-process cache instead of Redis
+settings.cache_backend = "memory"
+
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -86,6 +90,14 @@ async def db_session(db_engine) -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def clear_cache():
+    """Start every test with an empty cache."""
+    yield
+    await get_cache().clear()
+    clear_local_caches()
+
+
 @pytest_asyncio.fixture(scope="function")
 async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """Create an async HTTP client for testing."""
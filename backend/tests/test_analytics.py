@@ -4,8 +4,17 @@ Tests for analytics, leaderboard, and study plans.
 
 import pytest
 from httpx import AsyncClient
-
-from app.models import StudentAnalytics, ScoreHistory, TestAttempt
+from sqlalchemy import select
+
+from app.models import (
+    AttemptAnswer,
+    DomainProgress,
+    Question,
+    QuestionSkill,
+    ScoreHistory,
+    StudentAnalytics,
+    TestAttempt,
+)
 from app.models.enums import AttemptStatus
 from tests.conftest import auth_headers
 
@@ -60,6 +69,145 @@ class TestStudentAnalytics:
         data = response.json()
         assert "last_calculated_at" in data
 
+    @pytest.mark.asyncio
+    async def test_skill_performance_follows_question_tags(
+        self, test_user, test_full_sat, db_session
+    ):
+        """Test that skill accuracy is aggregated from the synced question_skills rows."""
+        from app.services.analytics_service import AnalyticsService
+
+        questions = (await db_session.execute(
+            select(Question)
+            .join(QuestionSkill, QuestionSkill.question_id == Question.id)
+            .where(QuestionSkill.skill == "area")
+            .order_by(Question.id)
+        )).scalars().all()
+        first, second = questions[:2]
+
+        tags = (await db_session.execute(
+            select(QuestionSkill.skill).where(QuestionSkill.question_id == first.id)
+        )).scalars().all()
+        assert sorted(tags) == ["area", "rectangles"]
+
+        attempt = TestAttempt(
+            user_id=test_user.id,
+            test_id=test_full_sat.id,
+            status=AttemptStatus.COMPLETED,
+        )
+        db_session.add(attempt)
+        await db_session.flush()
+        db_session.add_all([
+            AttemptAnswer(
+                attempt_id=attempt.id, question_id=first.id, answer="A", is_correct=True
+            ),
+            AttemptAnswer(
+                attempt_id=attempt.id, question_id=second.id, answer="B", is_correct=False
+            ),
+        ])
+        await db_session.flush()
+
+        service = AnalyticsService(db_session)
+        skills = await service._calculate_skill_performance(test_user.id)
+        assert skills["area"] == {"count": 2, "correct": 1, "accuracy": 0.5}
+        assert await service._calculate_skill_performance(test_user.id, []) == {}
+
+        # Retagging a question rewrites its rows
+        second.skill_tags = ["area", "triangles", "triangles"]
+        await db_session.flush()
+        skills = await service._calculate_skill_performance(test_user.id)
+        assert skills["rectangles"]["count"] == 1
+        assert skills["triangles"] == {"count": 1, "correct": 0, "accuracy": 0.0}
+
+    @pytest.mark.asyncio
+    async def test_streak_follows_user_timezone(self, test_user, db_session):
+        """Test that streaks advance per local day and the repair scan agrees."""
+        from datetime import UTC, date, datetime
+
+        from app.services.analytics_service import AnalyticsService, current_streak
+
+        test_user.timezone = "America/New_York"
+        service = AnalyticsService(db_session)
+
+        # 03:00 UTC is still the previous evening in New York
+        for at in (
+            datetime(2026, 3, 1, 15, tzinfo=UTC),
+            datetime(2026, 3, 2, 3, tzinfo=UTC),
+            datetime(2026, 3, 2, 15, tzinfo=UTC),
+            datetime(2026, 3, 3, 15, tzinfo=UTC),
+        ):
+            analytics = await service.record_activity(test_user.id, at)
+
+        assert analytics.current_streak_days == 3
+        assert analytics.longest_streak_days == 3
+        assert analytics.last_active_day == date(2026, 3, 3)
+        assert current_streak(analytics, date(2026, 3, 4)) == 3
+        assert current_streak(analytics, date(2026, 3, 5)) == 0
+
+        analytics = await service.record_activity(
+            test_user.id, datetime(2026, 3, 10, 15, tzinfo=UTC)
+        )
+        assert analytics.current_streak_days == 1
+        assert analytics.longest_streak_days == 3
+
+        await service.record_study_session(test_user.id, "practice", 30)
+        await db_session.flush()
+        analytics = await service.repair_streak(test_user.id)
+        assert analytics.current_streak_days == 1
+        assert analytics.longest_streak_days == 1
+
+    @pytest.mark.asyncio
+    async def test_dashboard_streak_lapses_without_activity(
+        self, client: AsyncClient, test_user, user_token, db_session
+    ):
+        """Test that the dashboard reports a lapsed streak, not the stored counter."""
+        from datetime import UTC, datetime, timedelta
+
+        from app.services.analytics_service import AnalyticsService
+
+        service = AnalyticsService(db_session)
+        for days_ago in (5, 4, 3):
+            await service.record_activity(
+                test_user.id, datetime.now(UTC) - timedelta(days=days_ago)
+            )
+        await db_session.commit()
+
+        response = await client.get(
+            "/api/v1/analytics/me",
+            headers=auth_headers(user_token),
+        )
+
+        data = response.json()
+        assert data["analytics"]["current_streak_days"] == 0
+        assert data["analytics"]["longest_streak_days"] == 3
+        assert data["streak"] == {"current": 0, "longest": 3}
+
+    @pytest.mark.asyncio
+    async def test_domain_results_upsert(self, test_user, db_session):
+        """Test that batched domain results accumulate and keep a rolling window."""
+        from app.services.analytics_service import AnalyticsService
+
+        service = AnalyticsService(db_session)
+        await service.record_domain_results(
+            test_user.id,
+            [("algebra", "math", False)] * 6 + [("geometry_trigonometry", "math", True)],
+        )
+        await service.record_domain_results(test_user.id, [("algebra", "math", True)] * 6)
+
+        rows = {
+            row.domain: row
+            for row in (await db_session.execute(
+                select(DomainProgress).where(DomainProgress.user_id == test_user.id)
+            )).scalars()
+        }
+        algebra = rows["algebra"]
+        await db_session.refresh(algebra)
+        assert algebra.total_questions == 12
+        assert algebra.correct_answers == 6
+        assert algebra.accuracy == 0.5
+        assert algebra.recent_results == [False] * 4 + [True] * 6
+        assert algebra.accuracy_trend == "improving"
+        assert rows["geometry_trigonometry"].total_questions == 1
+
 
 class TestScoreHistory:
     """Tests for score history."""
@@ -127,6 +275,106 @@ class TestLeaderboard:
             assert response.status_code == 200
             assert response.json()["period_type"] == period
 
+    @pytest.mark.asyncio
+    async def test_completed_attempts_rank_users(
+        self, client: AsyncClient, test_user, user_token, test_full_sat, db_session
+    ):
+        """Test that completed attempts feed the live board and its snapshot."""
+        from datetime import UTC, datetime
+
+        from app.core.cache import get_cache
+        from app.services.leaderboard_service import LeaderboardService
+
+        service = LeaderboardService(db_session, get_cache())
+        for rw_correct in (20, 30):
+            attempt = TestAttempt(
+                user_id=test_user.id,
+                test_id=test_full_sat.id,
+                status=AttemptStatus.COMPLETED,
+                completed_at=datetime.now(UTC),
+                reading_writing_raw_score=rw_correct,
+                math_raw_score=10,
+                question_count=98,
+                total_time_seconds=3600,
+            )
+            db_session.add(attempt)
+            await db_session.flush()
+            await service.record_attempt(attempt)
+
+        response = await client.get(
+            "/api/v1/analytics/leaderboard",
+            headers=auth_headers(user_token),
+            params={"period_type": "weekly"},
+        )
+        data = response.json()
+        assert data["my_rank"] == 1
+        assert data["leaderboard"][0]["score"] == 70
+        assert data["leaderboard"][0]["tests_completed"] == 2
+        assert data["leaderboard"][0]["average_accuracy"] == round(70 / 196 * 100, 1)
+
+        # The materialized snapshot serves reads once the cache is gone
+        assert await service.materialize() == 3
+        await get_cache().clear()
+
+        response = await client.get(
+            "/api/v1/analytics/leaderboard",
+            headers=auth_headers(user_token),
+            params={"period_type": "weekly"},
+        )
+        data = response.json()
+        assert data["my_rank"] == 1
+        assert data["leaderboard"][0]["score"] == 70
+
+    @pytest.mark.asyncio
+    async def test_lost_board_is_rebuilt_not_materialized(
+        self, test_user, test_full_sat, db_session
+    ):
+        """Test a board the cache lost is rebuilt from attempts before its snapshot is replaced."""
+        from datetime import UTC, datetime
+
+        from app.core.cache import get_cache
+        from app.models import Leaderboard
+        from app.services.leaderboard_service import LeaderboardService
+
+        service = LeaderboardService(db_session, get_cache())
+
+        async def complete(rw_correct: int) -> None:
+            attempt = TestAttempt(
+                user_id=test_user.id,
+                test_id=test_full_sat.id,
+                status=AttemptStatus.COMPLETED,
+                completed_at=datetime.now(UTC),
+                reading_writing_raw_score=rw_correct,
+                math_raw_score=10,
+                question_count=98,
+                total_time_seconds=3600,
+            )
+            db_session.add(attempt)
+            await db_session.flush()
+            await service.record_attempt(attempt)
+
+        await complete(20)
+        await service.materialize()
+
+        # Redis is flushed, then a new attempt starts a partial board
+        await get_cache().clear()
+        await complete(30)
+        assert await service.materialize() == 3
+
+        snapshot = (await db_session.execute(
+            select(Leaderboard).where(Leaderboard.period_type == "weekly")
+        )).scalar_one()
+        assert snapshot.score == 70
+        assert snapshot.tests_completed == 2
+
+        await get_cache().clear()
+        assert await service.rebuild() == 3
+        top = await service.top(
+            next(iter(await get_cache().smembers("leaderboard:boards"))), 10
+        )
+        assert top[0]["score"] == 70
+        assert top[0]["tests_completed"] == 2
+
 
 class TestNotifications:
     """Tests for notification system."""
@@ -331,6 +579,19 @@ class TestAdminAnalytics:
         assert "history" in data
         assert "total_users" in data["current"]
 
+    @pytest.mark.asyncio
+    async def test_score_analytics_rejects_cursor_with_other_sort(
+        self, client: AsyncClient, test_admin, admin_token
+    ):
+        """A cursor only pages results sorted by completed_at."""
+        response = await client.get(
+            "/api/v1/analytics/admin/score-analytics",
+            params={"cursor": "", "sort_by": "total_score"},
+            headers=auth_headers(admin_token),
+        )
+
+        assert response.status_code == 400
+
     @pytest.mark.asyncio
     async def test_get_score_distribution(
         self, client: AsyncClient, test_admin, admin_token
@@ -369,3 +630,97 @@ class TestAdminAnalytics:
         )
 
         assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_admin_trends_read_rollups_plus_today(
+        self, client: AsyncClient, test_admin, admin_token, test_user, test_full_sat, db_session
+    ):
+        """Test that trends combine stored daily rollups with today's live counts."""
+        from datetime import UTC, datetime, timedelta
+
+        from app.models import PlatformAnalytics
+        from app.services.platform_analytics_service import PlatformAnalyticsService
+
+        now = datetime.now(UTC)
+        for completed_at, score in ((now - timedelta(days=1), 1200), (now, 1400)):
+            db_session.add(TestAttempt(
+                user_id=test_user.id,
+                test_id=test_full_sat.id,
+                status=AttemptStatus.COMPLETED,
+                started_at=completed_at - timedelta(hours=2),
+                completed_at=completed_at,
+                total_score=score,
+                total_time_seconds=7200,
+            ))
+        await db_session.flush()
+
+        assert await PlatformAnalyticsService(db_session).rollup_recent(days=3) == 3
+
+        yesterday = (now - timedelta(days=1)).date()
+        result = await db_session.execute(
+            select(PlatformAnalytics).where(PlatformAnalytics.tests_completed > 0)
+        )
+        rollup = result.scalar_one()
+        assert rollup.average_score == 1200
+        assert rollup.total_study_minutes == 120
+        assert rollup.score_distribution == {"1200-1400": 1}
+
+        response = await client.get(
+            "/api/v1/analytics/admin/trends",
+            headers=auth_headers(admin_token),
+            params={"days": 7},
+        )
+        assert response.status_code == 200
+        daily = {d["date"]: d for d in response.json()["daily"]}
+        assert len(daily) == 7
+        assert daily[yesterday.isoformat()]["tests_completed"] == 1
+        assert daily[now.date().isoformat()]["average_score"] == 1400
+
+        # Past days the job never rolled up are stored now; today never is
+        stored = (await db_session.execute(select(PlatformAnalytics))).scalars().all()
+        assert len(stored) == 6
+        assert max(row.period_start for row in stored).date() == yesterday
+
+        response = await client.get(
+            "/api/v1/analytics/admin/users",
+            headers=auth_headers(admin_token),
+            params={"days": 7},
+        )
+        data = response.json()
+        assert data["role_distribution"]["admin"] == 1
+        assert data["cumulative_growth"][-1]["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_admin_dashboard_is_cached(
+        self, client: AsyncClient, test_admin, admin_token, test_user, db_session
+    ):
+        """Test dashboard counts and that repeat loads are served from cache."""
+        from app.models import User
+
+        response = await client.get(
+            "/api/v1/analytics/admin/dashboard",
+            headers=auth_headers(admin_token),
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["users"]["total"] == 2
+        assert data["users"]["new_this_week"] == 2
+        assert data["attempts"]["completion_rate"] == 0
+        assert set(data["scores"]["distributions"]) == {"total", "reading_writing", "math"}
+
+        db_session.add(User(email="late@test.com", password_hash="x", full_name="Late"))
+        await db_session.flush()
+
+        response = await client.get(
+            "/api/v1/analytics/admin/dashboard",
+            headers=auth_headers(admin_token),
+        )
+        assert response.json()["users"]["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_public_stats(self, client: AsyncClient, test_user):
+        """Test public stats without authentication."""
+        response = await client.get("/api/v1/analytics/public/stats")
+
+        assert response.status_code == 200
+        assert response.json() == {"total_users": 1, "tests_completed": 0, "avg_score": None}
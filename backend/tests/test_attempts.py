@@ -205,6 +205,116 @@ class TestSubmitModule:
 
         assert response.status_code == 200
 
+    @pytest.mark.asyncio
+    async def test_submit_module_retry_is_idempotent(
+        self, client: AsyncClient, test_user, user_token, test_full_sat, db_session
+    ):
+        """Test that a retried submit replays the response without rescoring."""
+        from sqlalchemy import func, select
+
+        from app.models import AttemptAnswer, ModuleResult
+
+        start_response = await client.post(
+            "/api/v1/attempts",
+            headers=auth_headers(user_token),
+            params={"test_id": test_full_sat.id},
+        )
+        attempt_id = start_response.json()["id"]
+        current_module_id = start_response.json()["current_module_id"]
+
+        module_response = await client.get(
+            f"/api/v1/attempts/{attempt_id}/current-module",
+            headers=auth_headers(user_token),
+        )
+        questions = module_response.json()["questions"]
+
+        payload = {
+            "module_id": current_module_id,
+            "answers": [{"question_id": q["id"], "answer": "B"} for q in questions],
+            "time_spent_seconds": 1800,
+        }
+        headers = {**auth_headers(user_token), "Idempotency-Key": "submit-1"}
+
+        first = await client.post(
+            f"/api/v1/attempts/{attempt_id}/submit-module", headers=headers, json=payload
+        )
+        retry = await client.post(
+            f"/api/v1/attempts/{attempt_id}/submit-module", headers=headers, json=payload
+        )
+
+        assert first.status_code == 200
+        assert retry.status_code == 200
+        assert retry.json() == first.json()
+
+        result = await db_session.execute(
+            select(func.count(ModuleResult.id)).where(ModuleResult.attempt_id == attempt_id)
+        )
+        assert result.scalar() == 1
+        result = await db_session.execute(
+            select(func.count(AttemptAnswer.id)).where(AttemptAnswer.attempt_id == attempt_id)
+        )
+        assert result.scalar() == len(questions)
+
+        # Without the key the duplicate is rejected rather than scored again
+        duplicate = await client.post(
+            f"/api/v1/attempts/{attempt_id}/submit-module",
+            headers=auth_headers(user_token),
+            json=payload,
+        )
+        assert duplicate.status_code == 400
+
+
+    @pytest.mark.asyncio
+    async def test_committed_submit_survives_side_effect_failures(
+        self, client: AsyncClient, test_user, user_token, test_full_sat, db_session
+    ):
+        """Test that failures after the commit are logged, not returned as errors."""
+        from unittest import mock
+
+        from sqlalchemy import select
+
+        from app.models import TestModule
+        from app.services.leaderboard_service import LeaderboardService
+        from app.services.recommendation_service import RecommendationService
+
+        module = (await db_session.execute(
+            select(TestModule)
+            .where(TestModule.test_id == test_full_sat.id)
+            .order_by(TestModule.order_index)
+        )).scalars().first()
+        start_response = await client.post(
+            "/api/v1/attempts",
+            headers=auth_headers(user_token),
+            json={
+                "test_id": test_full_sat.id,
+                "config": {"scope": "single_module", "selected_module_id": module.id},
+            },
+        )
+        attempt_id = start_response.json()["id"]
+        module_response = await client.get(
+            f"/api/v1/attempts/{attempt_id}/current-module",
+            headers=auth_headers(user_token),
+        )
+        answers = [
+            {"question_id": q["id"], "answer": "B", "time_spent_seconds": 30, "is_flagged": False}
+            for q in module_response.json()["questions"]
+        ]
+
+        failure = mock.AsyncMock(side_effect=ConnectionError("cache down"))
+        with (
+            mock.patch.object(RecommendationService, "mark_stale", failure),
+            mock.patch.object(LeaderboardService, "record_attempt", failure),
+        ):
+            response = await client.post(
+                f"/api/v1/attempts/{attempt_id}/submit-module",
+                headers=auth_headers(user_token),
+                json={"module_id": module.id, "answers": answers, "time_spent_seconds": 600},
+            )
+
+        assert response.status_code == 200
+        assert response.json()["test_completed"] is True
+        assert failure.await_count == 2
+
 
 class TestAdaptiveTesting:
     """Tests for adaptive module difficulty."""
@@ -310,6 +420,56 @@ class TestAttemptHistory:
         assert data["id"] == attempt_id
         assert data["status"] == "in_progress"
 
+    @pytest.mark.asyncio
+    async def test_list_my_attempts_cursor_pagination(
+        self, client: AsyncClient, test_user, user_token, test_full_sat, db_session
+    ):
+        """Test keyset pagination walks every attempt once, newest first."""
+        from datetime import UTC, datetime, timedelta
+
+        from app.models import TestAttempt
+        from app.models.enums import AttemptStatus
+
+        base = datetime(2025, 1, 1, tzinfo=UTC)
+        for i in range(5):
+            db_session.add(TestAttempt(
+                user_id=test_user.id,
+                test_id=test_full_sat.id,
+                status=AttemptStatus.COMPLETED,
+                started_at=base + timedelta(days=i),
+                total_time_seconds=60 * i,
+            ))
+        await db_session.flush()
+
+        seen = []
+        cursor = ""
+        while cursor is not None:
+            response = await client.get(
+                "/api/v1/attempts",
+                headers=auth_headers(user_token),
+                params={"cursor": cursor, "page_size": 2},
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] is None
+            seen.extend(item["time_spent_seconds"] for item in data["items"])
+            cursor = data["next_cursor"]
+
+        assert seen == [240, 180, 120, 60, 0]
+
+    @pytest.mark.asyncio
+    async def test_list_my_attempts_invalid_cursor(
+        self, client: AsyncClient, test_user, user_token
+    ):
+        """Test a malformed cursor is rejected."""
+        response = await client.get(
+            "/api/v1/attempts",
+            headers=auth_headers(user_token),
+            params={"cursor": "not-a-cursor"},
+        )
+
+        assert response.status_code == 400
+
 
 class TestAbandonAttempt:
     """Tests for abandoning an attempt."""
@@ -373,3 +533,238 @@ class TestDeleteAttempt:
             headers=auth_headers(user_token),
         )
         assert detail_response.status_code == 404
+
+
+class TestAttemptSummary:
+    """Tests for materialized attempt summaries."""
+
+    @pytest.mark.asyncio
+    async def test_completed_attempt_serves_summary_with_etag(
+        self, client: AsyncClient, test_user, user_token, test_full_sat, db_session
+    ):
+        """Test detail and review read the summary and honour If-None-Match."""
+        from sqlalchemy import select
+
+        from app.models import AttemptSummary, TestModule
+
+        result = await db_session.execute(
+            select(TestModule)
+            .where(TestModule.test_id == test_full_sat.id)
+            .order_by(TestModule.order_index)
+        )
+        module = result.scalars().first()
+
+        start_response = await client.post(
+            "/api/v1/attempts",
+            headers=auth_headers(user_token),
+            json={
+                "test_id": test_full_sat.id,
+                "config": {"scope": "single_module", "selected_module_id": module.id},
+            },
+        )
+        attempt_id = start_response.json()["id"]
+
+        module_response = await client.get(
+            f"/api/v1/attempts/{attempt_id}/current-module",
+            headers=auth_headers(user_token),
+        )
+        questions = module_response.json()["questions"]
+
+        # Answer all but the last question, half of them correctly
+        answers = [
+            {
+                "question_id": q["id"],
+                "answer": "B" if i % 2 == 0 else "A",
+                "time_spent_seconds": 30,
+                "is_flagged": False,
+            }
+            for i, q in enumerate(questions[:-1])
+        ]
+        submit_response = await client.post(
+            f"/api/v1/attempts/{attempt_id}/submit-module",
+            headers=auth_headers(user_token),
+            json={"module_id": module.id, "answers": answers, "time_spent_seconds": 900},
+        )
+        assert submit_response.json()["test_completed"] is True
+
+        result = await db_session.execute(
+            select(AttemptSummary).where(AttemptSummary.attempt_id == attempt_id)
+        )
+        summary = result.scalar_one()
+        assert summary.total_questions == len(questions)
+        assert summary.total_time_seconds == 900
+
+        detail_response = await client.get(
+            f"/api/v1/attempts/{attempt_id}",
+            headers=auth_headers(user_token),
+        )
+        assert detail_response.status_code == 200
+        etag = detail_response.headers["etag"]
+        detail = detail_response.json()
+        assert detail["module_results"][0]["module_id"] == module.id
+        assert detail["domain_breakdown"][0]["total"] == len(answers)
+
+        cached_response = await client.get(
+            f"/api/v1/attempts/{attempt_id}",
+            headers={**auth_headers(user_token), "If-None-Match": etag},
+        )
+        assert cached_response.status_code == 304
+
+        review_response = await client.get(
+            f"/api/v1/attempts/{attempt_id}/review",
+            headers=auth_headers(user_token),
+        )
+        assert review_response.status_code == 200
+        review = review_response.json()
+        assert len(review["modules"]) == 1
+        assert len(review["modules"][0]["questions"]) == len(questions)
+        assert review["modules"][0]["questions"][-1]["is_correct"] is None
+        assert review["summary"]["total_questions"] == len(questions)
+
+
+class TestAutosave:
+    """Tests for the autosave buffer."""
+
+    @pytest.mark.asyncio
+    async def test_autosaved_answers_are_merged_on_submit(
+        self, client: AsyncClient, test_user, user_token, test_full_sat
+    ):
+        """Test that buffered answers count even if the submit omits them."""
+        start_response = await client.post(
+            "/api/v1/attempts",
+            headers=auth_headers(user_token),
+            params={"test_id": test_full_sat.id},
+        )
+        attempt_id = start_response.json()["id"]
+        current_module_id = start_response.json()["current_module_id"]
+
+        module_response = await client.get(
+            f"/api/v1/attempts/{attempt_id}/current-module",
+            headers=auth_headers(user_token),
+        )
+        questions = module_response.json()["questions"]
+
+        save_response = await client.put(
+            f"/api/v1/attempts/{attempt_id}/autosave",
+            headers=auth_headers(user_token),
+            json={
+                "module_id": current_module_id,
+                "answers": [
+                    {"question_id": q["id"], "answer": "B", "time_spent_seconds": 20}
+                    for q in questions[:3]
+                ],
+            },
+        )
+        assert save_response.status_code == 200
+
+        # A later save for the same question overwrites the buffered answer
+        await client.put(
+            f"/api/v1/attempts/{attempt_id}/autosave",
+            headers=auth_headers(user_token),
+            json={
+                "module_id": current_module_id,
+                "answers": [{"question_id": questions[0]["id"], "answer": "A", "is_flagged": True}],
+            },
+        )
+
+        buffer_response = await client.get(
+            f"/api/v1/attempts/{attempt_id}/autosave",
+            headers=auth_headers(user_token),
+        )
+        assert buffer_response.status_code == 200
+        buffered = {a["question_id"]: a for a in buffer_response.json()["answers"]}
+        assert len(buffered) == 3
+        assert buffered[questions[0]["id"]]["answer"] == "A"
+        assert buffered[questions[0]["id"]]["is_flagged"] is True
+
+        # Submit resends only the third question, with a different answer
+        response = await client.post(
+            f"/api/v1/attempts/{attempt_id}/submit-module",
+            headers=auth_headers(user_token),
+            json={
+                "module_id": current_module_id,
+                "answers": [{"question_id": questions[2]["id"], "answer": "A"}],
+                "time_spent_seconds": 1800,
+            },
+        )
+        assert response.status_code == 200
+        results = {r["id"]: r for r in response.json()["question_results"]}
+        assert len(results) == 3
+        assert results[questions[1]["id"]]["user_answer"] == "B"
+        assert results[questions[2]["id"]]["user_answer"] == "A"
+
+        # The buffer is cleared once the module is stored
+        buffer_response = await client.get(
+            f"/api/v1/attempts/{attempt_id}/autosave",
+            headers=auth_headers(user_token),
+        )
+        assert buffer_response.json()["answers"] == []
+
+    @pytest.mark.asyncio
+    async def test_autosave_rejects_wrong_module(
+        self, client: AsyncClient, test_user, user_token, test_full_sat
+    ):
+        """Test that saving against another module fails."""
+        start_response = await client.post(
+            "/api/v1/attempts",
+            headers=auth_headers(user_token),
+            params={"test_id": test_full_sat.id},
+        )
+        attempt_id = start_response.json()["id"]
+
+        response = await client.put(
+            f"/api/v1/attempts/{attempt_id}/autosave",
+            headers=auth_headers(user_token),
+            json={"module_id": 999999, "answers": []},
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_flushed_snapshot_survives_cache_loss(
+        self, client: AsyncClient, test_user, user_token, test_full_sat, db_session
+    ):
+        """Test that the flusher persists buffers readable after a cache flush."""
+        from app.core.cache import get_cache
+        from app.models import TestAttempt
+        from app.services.autosave_service import AutosaveService
+
+        start_response = await client.post(
+            "/api/v1/attempts",
+            headers=auth_headers(user_token),
+            params={"test_id": test_full_sat.id},
+        )
+        attempt_id = start_response.json()["id"]
+        current_module_id = start_response.json()["current_module_id"]
+
+        module_response = await client.get(
+            f"/api/v1/attempts/{attempt_id}/current-module",
+            headers=auth_headers(user_token),
+        )
+        question_id = module_response.json()["questions"][0]["id"]
+
+        await client.put(
+            f"/api/v1/attempts/{attempt_id}/autosave",
+            headers=auth_headers(user_token),
+            json={
+                "module_id": current_module_id,
+                "answers": [{"question_id": question_id, "answer": "C"}],
+            },
+        )
+
+        cache = get_cache()
+        assert await AutosaveService(cache).flush_to_database(db_session) == 1
+        # Nothing left to flush until the next save
+        assert await AutosaveService(cache).flush_to_database(db_session) == 0
+
+        attempt = await db_session.get(TestAttempt, attempt_id)
+        await db_session.refresh(attempt)
+        assert attempt.autosave_snapshot["answers"][str(question_id)]["answer"] == "C"
+
+        await cache.clear()
+
+        buffer_response = await client.get(
+            f"/api/v1/attempts/{attempt_id}/autosave",
+            headers=auth_headers(user_token),
+        )
+        assert buffer_response.json()["answers"][0]["answer"] == "C"
@@ -152,6 +152,72 @@ class TestTokenRefresh:
         data = refresh_response.json()
         assert "access_token" in data
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("store", ["database", "cache"])
+    async def test_refresh_token_rotation_and_revocation(
+        self, client: AsyncClient, test_user, store, monkeypatch
+    ):
+        """Test that a refresh token works once and logout-all revokes the rest."""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "refresh_token_store", store)
+
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": "student@test.com", "password": "Test1234!"},
+        )
+        access_token = login_response.json()["access_token"]
+        first = login_response.cookies["refresh_token"]
+
+        response = await client.post("/api/v1/auth/refresh", json={"refresh_token": first})
+        assert response.status_code == 200
+        second = response.cookies["refresh_token"]
+        assert second != first
+
+        response = await client.post("/api/v1/auth/refresh", json={"refresh_token": first})
+        assert response.status_code == 401
+
+        response = await client.post("/api/v1/auth/logout-all", headers=auth_headers(access_token))
+        assert response.status_code == 200
+        assert response.json()["message"] == "Logged out from 1 device(s)"
+
+        response = await client.post("/api/v1/auth/refresh", json={"refresh_token": second})
+        assert response.status_code == 401
+        response = await client.get("/api/v1/auth/me", headers=auth_headers(access_token))
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_purge_removes_expired_and_old_revoked_tokens(self, db_session, test_user):
+        """Test that the purge deletes stale tokens in batches and keeps live ones."""
+        from datetime import UTC, datetime, timedelta
+
+        from sqlalchemy import select
+
+        from app.models import RefreshToken
+        from app.services.refresh_token_store import DatabaseTokenStore
+
+        now = datetime.now(UTC)
+        for token_hash, expires_at, revoked_at in [
+            ("live", now + timedelta(days=1), None),
+            ("recently-revoked", now + timedelta(days=1), now - timedelta(days=1)),
+            ("expired", now - timedelta(days=1), None),
+            ("old-revoked", now + timedelta(days=1), now - timedelta(days=30)),
+            ("expired-revoked", now - timedelta(days=1), now - timedelta(days=30)),
+        ]:
+            db_session.add(RefreshToken(
+                user_id=test_user.id,
+                token_hash=token_hash,
+                expires_at=expires_at,
+                revoked=revoked_at is not None,
+                revoked_at=revoked_at,
+            ))
+        await db_session.commit()
+
+        assert await DatabaseTokenStore(db_session).purge(batch_size=2) == 3
+
+        result = await db_session.execute(select(RefreshToken.token_hash))
+        assert set(result.scalars().all()) == {"live", "recently-revoked"}
+
     @pytest.mark.asyncio
     async def test_refresh_without_token(self, client: AsyncClient):
         """Test refresh without token fails."""
@@ -183,6 +249,74 @@ class TestCurrentUser:
 
         assert response.status_code == 401  # No auth header
 
+    @pytest.mark.asyncio
+    async def test_update_timezone(self, client: AsyncClient, test_user, user_token):
+        """Test setting the profile timezone; unknown names are rejected."""
+        response = await client.patch(
+            "/api/v1/users/me",
+            headers=auth_headers(user_token),
+            json={"timezone": "Asia/Tashkent"},
+        )
+        assert response.status_code == 200
+        assert response.json()["timezone"] == "Asia/Tashkent"
+
+        response = await client.patch(
+            "/api/v1/users/me",
+            headers=auth_headers(user_token),
+            json={"timezone": "Mars/Olympus"},
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_cached_user_until_tokens_revoked(
+        self, client: AsyncClient, test_user, user_token, db_session
+    ):
+        """Test that the user is served from cache and revocation still applies at once."""
+        from sqlalchemy import update
+
+        from app.models import User
+
+        # Each request normally gets a fresh session
+        db_session.expunge_all()
+        response = await client.get("/api/v1/auth/me", headers=auth_headers(user_token))
+        assert response.status_code == 200
+
+        db_session.expunge_all()
+        await db_session.execute(
+            update(User).where(User.id == test_user.id).values(full_name="Renamed")
+        )
+        await db_session.commit()
+        response = await client.get("/api/v1/auth/me", headers=auth_headers(user_token))
+        assert response.json()["full_name"] == "Test Student"
+
+        db_session.expunge_all()
+        response = await client.post("/api/v1/auth/logout-all", headers=auth_headers(user_token))
+        assert response.status_code == 200
+
+        db_session.expunge_all()
+        response = await client.get("/api/v1/auth/me", headers=auth_headers(user_token))
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_login_refreshes_cached_user(
+        self, client: AsyncClient, test_user, user_token, db_session
+    ):
+        """Test that logging in drops the cached user, so /me shows the new login time."""
+        db_session.expunge_all()
+        response = await client.get("/api/v1/auth/me", headers=auth_headers(user_token))
+        assert response.json()["last_login_at"] is None
+
+        db_session.expunge_all()
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": "student@test.com", "password": "Test1234!"},
+        )
+        assert response.status_code == 200
+
+        db_session.expunge_all()
+        response = await client.get("/api/v1/auth/me", headers=auth_headers(user_token))
+        assert response.json()["last_login_at"] is not None
+
 
 class TestLogout:
     """Tests for logout."""
@@ -237,6 +371,34 @@ class TestPasswordChange:
         )
         assert login_response.status_code == 200
 
+    @pytest.mark.asyncio
+    async def test_hashing_runs_on_password_pool(
+        self, client: AsyncClient, test_user, user_token, test_admin, admin_token
+    ):
+        """Test that password checks go through the pool and are counted."""
+        response = await client.get(
+            "/api/v1/analytics/admin/password-hashing", headers=auth_headers(user_token)
+        )
+        assert response.status_code == 403
+
+        stats = await client.get(
+            "/api/v1/analytics/admin/password-hashing", headers=auth_headers(admin_token)
+        )
+        completed = stats.json()["completed"]
+
+        response = await client.post(
+            "/api/v1/auth/change-password",
+            headers=auth_headers(user_token),
+            json={"current_password": "Test1234!", "new_password": "NewSecure456!"},
+        )
+        assert response.status_code == 200
+
+        stats = await client.get(
+            "/api/v1/analytics/admin/password-hashing", headers=auth_headers(admin_token)
+        )
+        assert stats.json()["completed"] == completed + 2
+        assert stats.json()["queued"] == 0
+
     @pytest.mark.asyncio
     async def test_change_password_wrong_current(self, client: AsyncClient, test_user, user_token):
         """Test password change with wrong current password."""
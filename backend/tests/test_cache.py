@@ -0,0 +1,70 @@
+"""
+Tests for the cache helpers.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.cache import LocalCache, MemoryCache, get_or_compute
+
+
+class TestGetOrCompute:
+    """Tests for the single-flight cached computation."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self):
+        """Test that a burst of misses runs the computation once."""
+        cache = MemoryCache()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"value": 42}
+
+        results = await asyncio.gather(
+            *(get_or_compute(cache, "stats", 60, compute) for _ in range(10))
+        )
+
+        assert calls == 1
+        assert all(result == {"value": 42} for result in results)
+        assert await cache.get_json("stats:lock") is None
+
+    @pytest.mark.asyncio
+    async def test_waits_for_computation_in_another_worker(self):
+        """Test that a held lock makes callers wait for the stored result."""
+        cache = MemoryCache()
+        await cache.set_nx("stats:lock", 1, ttl=10)
+
+        async def other_worker():
+            await asyncio.sleep(0.1)
+            await cache.set_json("stats", {"value": "theirs"}, ttl=60)
+
+        async def compute():
+            return {"value": "ours"}
+
+        _, result = await asyncio.gather(
+            other_worker(), get_or_compute(cache, "stats", 60, compute)
+        )
+
+        assert result == {"value": "theirs"}
+
+
+class TestLocalCache:
+    """Tests for the in-process LRU."""
+
+    def test_evicts_least_recently_used_and_expires(self):
+        """Test that the oldest unread entry goes first and TTLs are honoured."""
+        cache = LocalCache(maxsize=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        assert cache.get("a") == 1
+
+        cache.set("c", 3, ttl=60)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+        cache.set("d", 4, ttl=0)
+        assert cache.get("d") is None
@@ -0,0 +1,187 @@
+"""
+Tests for drill practice mode.
+"""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.models import DrillAttempt, Question, StudentAnalytics
+from app.models.enums import QuestionDomain
+from tests.conftest import auth_headers
+
+
+class TestSubmitDrill:
+    """Tests for submitting drills."""
+
+    @pytest.mark.asyncio
+    async def test_submit_drill_is_stored_and_counted(
+        self, client: AsyncClient, test_user, user_token, test_full_sat, db_session
+    ):
+        """Test that a drill is one stored row whose deltas reach the student's analytics."""
+        questions = (await db_session.execute(
+            select(Question)
+            .where(Question.domain == QuestionDomain.INFORMATION_AND_IDEAS)
+            .order_by(Question.id)
+            .limit(6)
+        )).scalars().all()
+        answers = [
+            {"question_id": q.id, "answer": "B" if index < 4 else "A"}
+            for index, q in enumerate(questions)
+        ]
+
+        for _ in range(2):
+            response = await client.post(
+                "/api/v1/drills/submit",
+                headers=auth_headers(user_token),
+                json={"answers": answers, "time_spent_seconds": 300},
+            )
+            assert response.status_code == 200
+            assert response.json()["correct_count"] == 4
+
+        drills = (await db_session.execute(
+            select(DrillAttempt).where(DrillAttempt.user_id == test_user.id)
+        )).scalars().all()
+        assert len(drills) == 2
+        assert drills[0].responses[0] == [questions[0].id, "B", True]
+        assert drills[0].domain_stats == {"information_and_ideas": [6, 4]}
+
+        analytics = (await db_session.execute(
+            select(StudentAnalytics).where(StudentAnalytics.user_id == test_user.id)
+        )).scalar_one()
+        assert analytics.total_questions_answered == 12
+        assert analytics.domain_performance["information_and_ideas"]["count"] == 12
+        assert analytics.domain_performance["information_and_ideas"]["correct"] == 8
+        assert analytics.skill_performance["author-perspective"]["count"] == 12
+        assert analytics.strong_domains == ["information_and_ideas"]
+
+
+class TestWeakAreaDrill:
+    """Tests for recommendation-backed weak-area drills."""
+
+    @pytest.mark.asyncio
+    async def test_weak_area_drill_serves_recommendations(
+        self, client: AsyncClient, test_user, user_token, test_full_sat, db_session
+    ):
+        """Test that weak-area drills come from the ranked list and rotate through it."""
+        from app.core.cache import get_cache
+        from app.services.recommendation_service import STALE_KEY, RecommendationService
+
+        db_session.add(StudentAnalytics(
+            user_id=test_user.id,
+            domain_performance={
+                "algebra": {"count": 20, "correct": 6, "accuracy": 0.3},
+                "information_and_ideas": {"count": 20, "correct": 18, "accuracy": 0.9},
+            },
+        ))
+        await db_session.flush()
+        await RecommendationService(db_session, get_cache()).refresh(test_user.id)
+
+        served = []
+        for _ in range(2):
+            response = await client.get(
+                "/api/v1/drills/weak-areas",
+                headers=auth_headers(user_token),
+                params={"question_count": 5},
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert {q["domain"] for q in data["questions"]} == {"algebra"}
+            served.append({q["id"] for q in data["questions"]})
+        assert not served[0] & served[1]
+
+        response = await client.post(
+            "/api/v1/drills/submit",
+            headers=auth_headers(user_token),
+            json={"answers": [{"question_id": q, "answer": "A"} for q in served[0]]},
+        )
+        assert response.status_code == 200
+        assert await get_cache().smembers(STALE_KEY) == {str(test_user.id)}
+
+        # Rebuilt lists skip questions answered recently
+        await RecommendationService(db_session, get_cache()).refresh_stale()
+        ids = await RecommendationService(db_session, get_cache()).take(test_user.id, 200)
+        assert ids and not set(ids) & served[0]
+
+    @pytest.mark.asyncio
+    async def test_weak_area_drill_without_history_uses_general_mix(
+        self, client: AsyncClient, test_user, user_token, test_full_sat, db_session
+    ):
+        """Test that a user without analytics gets the general mix, not a bank scan."""
+        from app.core.cache import get_cache
+        from app.services.recommendation_service import RecommendationService
+
+        assert await RecommendationService(db_session, get_cache()).compute(test_user.id) == []
+
+        response = await client.get(
+            "/api/v1/drills/weak-areas",
+            headers=auth_headers(user_token),
+            params={"question_count": 5},
+        )
+        assert response.status_code == 200
+        assert len(response.json()["questions"]) == 5
+
+
+class TestReviewDrill:
+    """Tests for the spaced-repetition review queue."""
+
+    @pytest.mark.asyncio
+    async def test_missed_questions_come_back_for_review(
+        self, client: AsyncClient, test_user, user_token, test_full_sat, db_session
+    ):
+        """Test that missed questions are due now and a correct review reschedules them."""
+        from app.models import ReviewItem
+        from app.services.review_service import ReviewService
+
+        question_ids = (await db_session.execute(
+            select(Question.id).order_by(Question.id).limit(3)
+        )).scalars().all()
+        service = ReviewService(db_session)
+        await service.enqueue_missed(test_user.id, question_ids)
+        await service.enqueue_missed(test_user.id, question_ids[:1])
+
+        response = await client.get("/api/v1/drills/review", headers=auth_headers(user_token))
+        assert response.status_code == 200
+        assert {q["id"] for q in response.json()["questions"]} == set(question_ids)
+
+        response = await client.post(
+            "/api/v1/drills/submit",
+            headers=auth_headers(user_token),
+            json={
+                "answers": [{"question_id": q, "answer": "B"} for q in question_ids],
+                "is_review": True,
+            },
+        )
+        assert response.status_code == 200
+
+        items = (await db_session.execute(
+            select(ReviewItem)
+            .where(ReviewItem.user_id == test_user.id)
+            .order_by(ReviewItem.question_id)
+            .execution_options(populate_existing=True)
+        )).scalars().all()
+        assert [item.lapses for item in items] == [2, 1, 1]
+        assert all(item.interval_days == 1 and item.last_reviewed_at for item in items)
+
+        response = await client.get("/api/v1/drills/review", headers=auth_headers(user_token))
+        assert response.json()["questions"] == []
+
+    def test_sm2_intervals(self):
+        """Test that correct reviews stretch the interval and a miss resets it."""
+        from datetime import UTC, datetime
+
+        from app.models import ReviewItem
+        from app.services.review_service import schedule
+
+        now = datetime(2026, 1, 1, tzinfo=UTC)
+        item = ReviewItem(interval_days=0, ease_factor=2.5, repetitions=0, lapses=1)
+        intervals = []
+        for quality in (4, 4, 4, 1):
+            state = schedule(item, quality, now)
+            for key, value in state.items():
+                setattr(item, key, value)
+            intervals.append(item.interval_days)
+
+        assert intervals == [1, 6, 15, 1]
+        assert item.lapses == 2
+        assert item.ease_factor < 2.5
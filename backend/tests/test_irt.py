@@ -0,0 +1,146 @@
+"""
+Tests for IRT ability estimation, calibration and routing.
+"""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.models import Question, TestModule
+from app.models.enums import ModuleDifficulty, SATModule, SATSection
+from app.services.irt_service import (
+    ItemParameters,
+    build_chunks,
+    calibrate_items,
+    estimate_ability,
+)
+from tests.conftest import auth_headers
+
+
+class TestAbilityEstimate:
+    """Tests for EAP ability estimation."""
+
+    def test_no_responses_returns_prior(self):
+        """Test that no data gives the prior mean."""
+        estimate = estimate_ability([])
+
+        assert abs(estimate.theta) < 1e-6
+        assert estimate.standard_error == pytest.approx(1.0, abs=0.05)
+
+    def test_ability_increases_with_correct_answers(self):
+        """Test that more correct answers give a higher estimate."""
+        items = [ItemParameters(discrimination=1.2, difficulty=0.0, guessing=0.25)] * 20
+
+        low = estimate_ability(zip(items, [True] * 5 + [False] * 15))
+        mid = estimate_ability(zip(items, [True] * 10 + [False] * 10))
+        high = estimate_ability(zip(items, [True] * 18 + [False] * 2))
+
+        assert low.theta < mid.theta < high.theta
+
+    def test_hard_items_count_for_more(self):
+        """Test that the same raw score on harder items means higher ability."""
+        results = [True] * 10 + [False] * 10
+        easy = [ItemParameters(discrimination=1.2, difficulty=-1.5)] * 20
+        hard = [ItemParameters(discrimination=1.2, difficulty=1.5)] * 20
+
+        assert (
+            estimate_ability(zip(hard, results)).theta
+            > estimate_ability(zip(easy, results)).theta
+        )
+
+
+class TestCalibration:
+    """Tests for EM item calibration."""
+
+    def test_recovers_item_difficulty_order(self):
+        """Test that simulated item difficulties are recovered."""
+        np = pytest.importorskip("numpy")
+        rng = np.random.default_rng(42)
+
+        n_people, difficulty = 2000, np.array([-1.5, -0.5, 0.5, 1.5])
+        theta = rng.normal(size=n_people)
+        p = 1.0 / (1.0 + np.exp(-(theta[:, None] - difficulty)))
+        responses = rng.random(p.shape) < p
+
+        rows = [
+            (person, item, bool(responses[person, item]))
+            for person in range(n_people)
+            for item in range(len(difficulty))
+        ]
+        chunks = build_chunks(rows, {i: i for i in range(len(difficulty))}, chunk_size=1000)
+        assert len(chunks) > 1
+
+        a, b = calibrate_items(chunks, np.zeros(len(difficulty)), iterations=50)
+
+        assert list(np.argsort(b)) == [0, 1, 2, 3]
+        assert np.abs(b - difficulty).max() < 0.3
+        assert np.all(a > 0.5)
+
+
+class TestIRTRouting:
+    """Tests for ability-based module routing."""
+
+    @pytest.mark.asyncio
+    async def test_calibrated_module_routes_on_ability(
+        self, client: AsyncClient, test_user, user_token, test_full_sat, db_session
+    ):
+        """Test that half right on very hard items routes to the harder module."""
+        result = await db_session.execute(
+            select(TestModule).where(TestModule.test_id == test_full_sat.id)
+        )
+        modules = result.scalars().all()
+        rw_module_1 = next(
+            m for m in modules
+            if m.section == SATSection.READING_WRITING and m.module == SATModule.MODULE_1
+        )
+        rw_harder = next(
+            m for m in modules
+            if m.section == SATSection.READING_WRITING
+            and m.module == SATModule.MODULE_2
+            and m.difficulty == ModuleDifficulty.HARDER
+        )
+
+        result = await db_session.execute(
+            select(Question).where(Question.module_id == rw_module_1.id)
+        )
+        for question in result.scalars():
+            question.irt_discrimination = 1.5
+            question.irt_difficulty = 2.5
+            question.irt_guessing = 0.25
+        await db_session.flush()
+
+        start_response = await client.post(
+            "/api/v1/attempts",
+            headers=auth_headers(user_token),
+            params={"test_id": test_full_sat.id},
+        )
+        attempt_id = start_response.json()["id"]
+
+        module_response = await client.get(
+            f"/api/v1/attempts/{attempt_id}/current-module",
+            headers=auth_headers(user_token),
+        )
+        questions = module_response.json()["questions"]
+
+        # 14/27 correct would route to the standard module on percentage alone
+        answers = [
+            {
+                "question_id": q["id"],
+                "answer": "B" if i < 14 else "A",
+                "time_spent_seconds": 30,
+                "is_flagged": False,
+            }
+            for i, q in enumerate(questions)
+        ]
+        response = await client.post(
+            f"/api/v1/attempts/{attempt_id}/submit-module",
+            headers=auth_headers(user_token),
+            json={
+                "module_id": rw_module_1.id,
+                "answers": answers,
+                "time_spent_seconds": 1800,
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json()["next_module_id"] == rw_harder.id
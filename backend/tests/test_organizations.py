@@ -5,7 +5,8 @@ Tests for organizations, classes, and assignments.
 import pytest
 from httpx import AsyncClient
 
-from app.models import Organization, OrganizationMember, Class
+from app.models import Class, ClassStudent, Organization, OrganizationMember, TestAttempt
+from app.models.enums import AttemptStatus
 from tests.conftest import auth_headers
 
 
@@ -135,6 +136,58 @@ class TestOrganizationMembership:
 
         assert response.status_code == 404
 
+    @pytest.mark.asyncio
+    async def test_membership_is_cached_until_invalidated(
+        self, client: AsyncClient, test_user, user_token, test_teacher, teacher_token, db_session
+    ):
+        """Test that permission checks use cached roles and see changes made through the API."""
+        from sqlalchemy import update
+
+        from app.services.membership_service import invalidate_memberships
+
+        org = Organization(name="Cached Center", slug="cached-center")
+        db_session.add(org)
+        await db_session.flush()
+        db_session.add(
+            OrganizationMember(organization_id=org.id, user_id=test_user.id, role="owner")
+        )
+        await db_session.commit()
+
+        response = await client.get(
+            f"/api/v1/organizations/{org.id}", headers=auth_headers(teacher_token)
+        )
+        assert response.status_code == 404
+
+        # Adding a member through the API takes effect on their next request
+        response = await client.post(
+            f"/api/v1/organizations/{org.id}/members",
+            headers=auth_headers(user_token),
+            params={"user_id": test_teacher.id, "role": "teacher"},
+        )
+        assert response.status_code == 200
+        response = await client.get(
+            f"/api/v1/organizations/{org.id}", headers=auth_headers(teacher_token)
+        )
+        assert response.json()["my_role"] == "teacher"
+
+        # A change behind the cache's back is only seen once invalidated
+        await db_session.execute(
+            update(OrganizationMember)
+            .where(OrganizationMember.user_id == test_teacher.id)
+            .values(is_active=False)
+        )
+        await db_session.commit()
+        response = await client.get(
+            f"/api/v1/organizations/{org.id}", headers=auth_headers(teacher_token)
+        )
+        assert response.status_code == 200
+
+        await invalidate_memberships(db_session, test_teacher.id)
+        response = await client.get(
+            f"/api/v1/organizations/{org.id}", headers=auth_headers(teacher_token)
+        )
+        assert response.status_code == 404
+
 
 class TestOrganizationMembers:
     """Tests for managing organization members."""
@@ -312,6 +365,144 @@ class TestClasses:
 
         assert response.status_code == 200
 
+    @pytest.mark.asyncio
+    async def test_list_class_students_with_stats(
+        self, client: AsyncClient, test_user, test_teacher, test_full_sat, user_token, db_session
+    ):
+        """Test that the roster reports each student's test stats."""
+        from datetime import UTC, datetime, timedelta
+
+        org = Organization(name="Roster Center", slug="roster-center")
+        db_session.add(org)
+        await db_session.flush()
+        db_session.add(
+            OrganizationMember(organization_id=org.id, user_id=test_user.id, role="owner")
+        )
+        class_ = Class(organization_id=org.id, name="Roster Class", teacher_id=test_user.id)
+        db_session.add(class_)
+        await db_session.flush()
+        db_session.add(ClassStudent(class_id=class_.id, student_id=test_teacher.id))
+
+        now = datetime.now(UTC)
+        for days_ago, score in ((3, 1300), (1, 1100), (2, 1450)):
+            db_session.add(TestAttempt(
+                user_id=test_teacher.id,
+                test_id=test_full_sat.id,
+                status=AttemptStatus.COMPLETED,
+                completed_at=now - timedelta(days=days_ago),
+                total_score=score,
+            ))
+        await db_session.commit()
+
+        response = await client.get(
+            f"/api/v1/organizations/{org.id}/classes/{class_.id}/students",
+            headers=auth_headers(user_token),
+        )
+
+        assert response.status_code == 200
+        [student] = response.json()["students"]
+        assert student["user_id"] == test_teacher.id
+        assert student["latest_score"] == 1100
+        assert student["tests_completed"] == 3
+        assert student["average_score"] == 1283
+        assert student["best_score"] == 1450
+        assert student["last_activity_at"] is not None
+        assert student["weak_domains"] == []
+
+
+class TestRosterImport:
+    """Tests for bulk roster imports."""
+
+    @pytest.mark.asyncio
+    async def test_csv_import_adds_members_and_reports_bad_rows(
+        self, client: AsyncClient, test_user, test_teacher, test_admin, user_token, db_session,
+        monkeypatch,
+    ):
+        """Test that a CSV import adds members in bulk and reports each failed row."""
+        from types import SimpleNamespace
+
+        from sqlalchemy import select
+
+        from app.api.v1.endpoints import organizations
+        from app.services.roster_import_service import RosterImportService
+
+        queued = []
+        monkeypatch.setattr(
+            organizations.process_roster_import,
+            "delay",
+            lambda import_id: queued.append(import_id) or SimpleNamespace(id="task-1"),
+        )
+
+        org = Organization(name="Import Center", slug="import-center")
+        db_session.add(org)
+        await db_session.flush()
+        db_session.add(
+            OrganizationMember(organization_id=org.id, user_id=test_user.id, role="owner")
+        )
+        db_session.add(
+            OrganizationMember(organization_id=org.id, user_id=test_admin.id, role="student")
+        )
+        class_ = Class(organization_id=org.id, name="Import Class", teacher_id=test_user.id)
+        db_session.add(class_)
+        await db_session.commit()
+
+        csv_data = (
+            "Email,Grade_Level\n"
+            "teacher@test.com,11\n"
+            "admin@test.com,\n"
+            "nobody@test.com,10\n"
+            "teacher@test.com,11\n"
+            ",10\n"
+        )
+        response = await client.post(
+            f"/api/v1/organizations/{org.id}/imports",
+            headers=auth_headers(user_token),
+            files={"file": ("roster.csv", csv_data, "text/csv")},
+            data={"class_id": str(class_.id)},
+        )
+        assert response.status_code == 202
+        assert response.json()["total_rows"] == 5
+        assert queued == [response.json()["id"]]
+
+        await RosterImportService(db_session).run(queued[0])
+
+        response = await client.get(
+            f"/api/v1/organizations/{org.id}/imports/{queued[0]}",
+            headers=auth_headers(user_token),
+        )
+        data = response.json()
+        assert data["status"] == "completed"
+        assert data["processed_rows"] == 5
+        assert data["added_count"] == 1
+        assert data["enrolled_count"] == 2
+        assert [(e["row"], e["error"]) for e in data["errors"]] == [
+            (4, "User not found"),
+            (5, "Duplicate email"),
+            (6, "Missing email"),
+        ]
+
+        member = (await db_session.execute(
+            select(OrganizationMember).where(OrganizationMember.user_id == test_teacher.id)
+        )).scalar_one()
+        assert member.grade_level == 11
+
+        response = await client.get(
+            f"/api/v1/organizations/{org.id}/classes/{class_.id}/dashboard",
+            headers=auth_headers(user_token),
+        )
+        assert response.json()["student_count"] == 2
+
+        # Importing the same people again changes nothing
+        response = await client.post(
+            f"/api/v1/organizations/{org.id}/imports/json",
+            headers=auth_headers(user_token),
+            json={"rows": [{"email": "teacher@test.com"}], "class_id": class_.id},
+        )
+        assert response.status_code == 202
+        roster_import = await RosterImportService(db_session).run(queued[1])
+        assert roster_import.added_count == 0
+        assert roster_import.skipped_count == 1
+
 
 class TestAssignments:
     """Tests for assignment management."""
@@ -413,6 +604,64 @@ class TestAssignments:
         data = response.json()
         assert len(data["assignments"]) >= 1
 
+    @pytest.mark.asyncio
+    async def test_assignment_fan_out_and_submissions(
+        self, client: AsyncClient, test_user, test_teacher, test_admin, user_token, teacher_token,
+        db_session,
+    ):
+        """Test that an assignment fans out to class and listed students and counts submissions."""
+        org = Organization(name="Fan Out Center", slug="fan-out-center")
+        db_session.add(org)
+        await db_session.flush()
+        db_session.add_all([
+            OrganizationMember(organization_id=org.id, user_id=test_user.id, role="owner"),
+            OrganizationMember(organization_id=org.id, user_id=test_teacher.id, role="student"),
+            OrganizationMember(organization_id=org.id, user_id=test_admin.id, role="student"),
+        ])
+        class_ = Class(organization_id=org.id, name="Fan Out Class", teacher_id=test_user.id)
+        db_session.add(class_)
+        await db_session.flush()
+        db_session.add(ClassStudent(class_id=class_.id, student_id=test_teacher.id))
+        await db_session.commit()
+
+        response = await client.post(
+            f"/api/v1/organizations/{org.id}/assignments",
+            headers=auth_headers(user_token),
+            json={
+                "title": "Fan Out",
+                "class_id": class_.id,
+                # Outsiders are not assigned
+                "student_ids": [test_admin.id, test_teacher.id, 99999],
+                "assignment_type": "practice",
+            },
+        )
+        assert response.status_code == 201
+        assert response.json()["assigned_count"] == 2
+        assignment_id = response.json()["id"]
+
+        for _ in range(2):
+            response = await client.post(
+                f"/api/v1/organizations/{org.id}/assignments/{assignment_id}/submit",
+                headers=auth_headers(teacher_token),
+                json={},
+            )
+            assert response.status_code == 200
+
+        response = await client.get(
+            f"/api/v1/organizations/{org.id}/assignments", headers=auth_headers(teacher_token)
+        )
+        [assignment] = response.json()["assignments"]
+        assert assignment["submission_status"] == "submitted"
+        assert "submitted_count" not in assignment
+
+        response = await client.get(
+            f"/api/v1/organizations/{org.id}/assignments", headers=auth_headers(user_token)
+        )
+        [assignment] = response.json()["assignments"]
+        assert assignment["submission_status"] == "not_started"
+        assert assignment["assigned_count"] == 2
+        assert assignment["submitted_count"] == 1
+
 
 class TestOrganizationDashboard:
     """Tests for organization dashboard."""
@@ -445,3 +694,97 @@ class TestOrganizationDashboard:
         assert "member_counts" in data
         assert "class_count" in data
         assert "student_count" in data
+
+    @pytest.mark.asyncio
+    async def test_dashboards_follow_membership_and_attempts(
+        self, client: AsyncClient, test_user, test_teacher, test_full_sat, user_token, db_session
+    ):
+        """Test that org and class rollups pick up new members, classes and completed tests."""
+        from datetime import UTC, datetime, timedelta
+
+        from sqlalchemy import select
+
+        from app.models import AttemptAnswer, Question
+        from app.services.org_analytics_service import OrgAnalyticsService
+
+        org = Organization(name="Rollup Center", slug="rollup-center")
+        db_session.add(org)
+        await db_session.flush()
+        db_session.add(
+            OrganizationMember(organization_id=org.id, user_id=test_user.id, role="owner")
+        )
+        # Completed before the student joins; joining brings it into the totals
+        db_session.add(TestAttempt(
+            user_id=test_teacher.id,
+            test_id=test_full_sat.id,
+            status=AttemptStatus.COMPLETED,
+            completed_at=datetime.now(UTC) - timedelta(days=30),
+            total_score=1200,
+        ))
+        await db_session.commit()
+
+        response = await client.get(
+            f"/api/v1/organizations/{org.id}/dashboard", headers=auth_headers(user_token)
+        )
+        assert response.json()["member_counts"] == {"owner": 1}
+
+        response = await client.post(
+            f"/api/v1/organizations/{org.id}/members",
+            headers=auth_headers(user_token),
+            params={"user_id": test_teacher.id, "role": "student"},
+        )
+        assert response.status_code == 200
+        response = await client.post(
+            f"/api/v1/organizations/{org.id}/classes",
+            headers=auth_headers(user_token),
+            json={"name": "Rollup Class"},
+        )
+        class_id = response.json()["id"]
+        response = await client.post(
+            f"/api/v1/organizations/{org.id}/classes/{class_id}/students",
+            headers=auth_headers(user_token),
+            params={"student_id": test_teacher.id},
+        )
+        assert response.status_code == 200
+
+        question = (await db_session.execute(
+            select(Question).where(Question.domain.is_not(None)).order_by(Question.id).limit(1)
+        )).scalar_one()
+        attempt = TestAttempt(
+            user_id=test_teacher.id,
+            test_id=test_full_sat.id,
+            status=AttemptStatus.COMPLETED,
+            completed_at=datetime.now(UTC),
+            total_score=1400,
+        )
+        db_session.add(attempt)
+        await db_session.flush()
+        db_session.add(AttemptAnswer(
+            attempt_id=attempt.id, question_id=question.id, answer="B", is_correct=True
+        ))
+        await OrgAnalyticsService(db_session).record_attempt(attempt)
+        await db_session.commit()
+
+        response = await client.get(
+            f"/api/v1/organizations/{org.id}/dashboard", headers=auth_headers(user_token)
+        )
+        data = response.json()
+        assert data["member_counts"] == {"owner": 1, "student": 1}
+        assert data["class_count"] == 1
+        assert data["student_count"] == 1
+        assert data["tests_completed"] == 2
+        assert data["average_score"] == 1300
+        assert data["attempts_this_week"] == 1
+        assert data["active_students_this_week"] == 1
+        assert data["domain_performance"][question.domain.value]["count"] == 1
+
+        response = await client.get(
+            f"/api/v1/organizations/{org.id}/classes/{class_id}/dashboard",
+            headers=auth_headers(user_token),
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["student_count"] == 1
+        assert data["tests_completed"] == 2
+        assert data["attempts_this_week"] == 1
+        assert data["domain_performance"][question.domain.value]["correct"] == 1
@@ -4,7 +4,14 @@ Tests for SAT scoring service.
 
 import pytest
 
-from app.models.enums import ModuleDifficulty, SATSection
+from app.models import TestAttempt
+from app.models.enums import AttemptStatus, ModuleDifficulty, SATSection
+from app.services.score_distribution_service import (
+    MIN_SAMPLES,
+    ScoreDistributionService,
+    percentile_from_counts,
+    quantile_from_counts,
+)
 from app.services.scoring_service import (
     calculate_section_score,
     calculate_total_score,
@@ -170,6 +177,140 @@ class TestPercentile:
         assert p_lower <= p_middle <= p_upper
 
 
+class TestScoreDistribution:
+    """Tests for the live platform score distribution."""
+
+    def test_percentile_from_counts_midpoint(self):
+        """Test that ties count as half below."""
+        counts = [10, 20, 10]
+
+        assert percentile_from_counts(counts, 0) == 12.5
+        assert percentile_from_counts(counts, 1) == 50.0
+        assert percentile_from_counts(counts, 2) == 87.5
+
+    def test_percentile_from_empty_counts(self):
+        """Test empty distribution."""
+        assert percentile_from_counts([0, 0, 0], 1) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_record_attempt_falls_back_to_static_table(
+        self, db_session, test_user, test_full_sat
+    ):
+        """Test small samples use the reference table."""
+        attempt = TestAttempt(
+            user_id=test_user.id,
+            test_id=test_full_sat.id,
+            status=AttemptStatus.COMPLETED,
+            scope="full",
+            reading_writing_scaled_score=500,
+            math_scaled_score=500,
+            total_score=1000,
+        )
+        db_session.add(attempt)
+
+        percentile = await ScoreDistributionService(db_session).record_attempt(attempt)
+
+        assert percentile == get_percentile(1000)
+
+    @pytest.mark.asyncio
+    async def test_record_attempt_uses_live_distribution(
+        self, db_session, test_user, test_full_sat
+    ):
+        """Test percentiles come from recorded attempts once there are enough."""
+        service = ScoreDistributionService(db_session)
+        for i in range(MIN_SAMPLES):
+            score = 800 if i % 2 else 1200
+            attempt = TestAttempt(
+                user_id=test_user.id,
+                test_id=test_full_sat.id,
+                status=AttemptStatus.COMPLETED,
+                scope="full",
+                reading_writing_scaled_score=score // 2,
+                math_scaled_score=score // 2,
+                total_score=score,
+            )
+            await service.record_attempt(attempt)
+        await db_session.flush()
+
+        assert await service.get_percentile("total", 1000) == 50.0
+        assert await service.get_percentile("total", 1600) == 100.0
+
+        distribution = await service.get_distribution("total")
+        assert distribution.total_count == MIN_SAMPLES
+        assert distribution.min_observed == 800
+        assert distribution.max_observed == 1200
+
+    @pytest.mark.asyncio
+    async def test_single_module_attempts_excluded(
+        self, db_session, test_user, test_full_sat
+    ):
+        """Test single-module practice does not feed the distribution."""
+        attempt = TestAttempt(
+            user_id=test_user.id,
+            test_id=test_full_sat.id,
+            status=AttemptStatus.COMPLETED,
+            math_scaled_score=600,
+            total_score=600,
+            scope="single_module",
+        )
+
+        percentile = await ScoreDistributionService(db_session).record_attempt(attempt)
+
+        assert percentile is None
+        assert await ScoreDistributionService(db_session).get_distribution("math") is None
+
+    def test_quantile_from_counts_matches_percentile_cont(self):
+        """Test quantiles interpolate between ranked scores."""
+        # Scores 400, 420, 420, 430
+        counts = [1, 0, 2, 1]
+
+        assert quantile_from_counts(counts, 400, 10, 0.5) == 420
+        assert quantile_from_counts(counts, 400, 10, 0.25) == 415
+        assert quantile_from_counts(counts, 400, 10, 0.75) == 422.5
+        assert quantile_from_counts([0, 0], 400, 10, 0.5) is None
+
+    @pytest.mark.asyncio
+    async def test_rebuild_bins_in_sql_and_summarizes(
+        self, db_session, test_user, test_full_sat
+    ):
+        """Test rebuild from stored attempts and the bucketed summary."""
+        from app.core.cache import get_cache
+
+        for rw, math in ((300, 350), (500, 500), (700, 780)):
+            db_session.add(TestAttempt(
+                user_id=test_user.id,
+                test_id=test_full_sat.id,
+                status=AttemptStatus.COMPLETED,
+                scope="full",
+                reading_writing_scaled_score=rw,
+                math_scaled_score=math,
+                total_score=rw + math,
+            ))
+        db_session.add(TestAttempt(
+            user_id=test_user.id,
+            test_id=test_full_sat.id,
+            status=AttemptStatus.COMPLETED,
+            scope="math_only",
+            math_scaled_score=600,
+            total_score=600,
+        ))
+        await db_session.flush()
+
+        service = ScoreDistributionService(db_session)
+        assert await service.rebuild() == {"total": 3, "reading_writing": 3, "math": 4}
+        await db_session.flush()
+
+        summary = await service.get_summary("total", 400, get_cache())
+        assert summary["distribution"] == {"400-800": 1, "800-1200": 1, "1200-1600": 1}
+        assert summary["stats"]["median"] == 1000
+        assert summary["stats"]["min"] == 650
+        assert summary["stats"]["max"] == 1480
+
+        math_summary = await service.get_summary("math", 200, get_cache())
+        assert math_summary["stats"]["count"] == 4
+        assert math_summary["stats"]["median"] == 550
+
+
 class TestScoreConsistency:
     """Tests for score consistency and edge cases."""
 
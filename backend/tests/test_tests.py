@@ -335,3 +335,69 @@ class TestQuestionManagement:
         data = response.json()
         assert data["question_image_url"] is not None
         assert data["options"][0]["image_url"] is not None
+
+
+class TestQuestionBankSearch:
+    """Tests for ranked search over questions and passages."""
+
+    @pytest.mark.asyncio
+    async def test_search_ranks_and_highlights(
+        self, client: AsyncClient, test_admin, admin_token, test_full_sat, db_session
+    ):
+        """Test that search matches every field, ranks better matches first and highlights them."""
+        from sqlalchemy import select
+
+        from app.models import Question, TestModule
+        from app.models.enums import QuestionType
+
+        result = await db_session.execute(
+            select(TestModule).where(TestModule.test_id == test_full_sat.id).limit(1)
+        )
+        module = result.scalar_one()
+        for number, text in [
+            (90, "Photosynthesis in leaves"),
+            (91, "Photosynthesis and photosynthetic rates"),
+        ]:
+            db_session.add(Question(
+                module_id=module.id,
+                question_number=number,
+                question_text=text,
+                question_type=QuestionType.MULTIPLE_CHOICE,
+                correct_answer=["A"],
+            ))
+        await db_session.commit()
+
+        response = await client.get(
+            "/api/v1/questions",
+            headers=auth_headers(admin_token),
+            params={"search": "photosynth", "page_size": 5},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert data["items"][0]["question_number"] == 91
+        assert "<mark>Photosynthesis</mark>" in data["items"][0]["highlight"]
+
+        # Options and explanations are searched too
+        response = await client.get(
+            "/api/v1/questions",
+            headers=auth_headers(admin_token),
+            params={"search": "skeptical methodology"},
+        )
+        assert response.json()["total"] == 27 * 4
+
+        response = await client.get(
+            "/api/v1/questions/export",
+            headers=auth_headers(admin_token),
+            params={"search": "photosynthesis leaves"},
+        )
+        assert [q["question_number"] for q in response.json()] == [90]
+
+        response = await client.get(
+            "/api/v1/passages",
+            headers=auth_headers(admin_token),
+            params={"search": "Jane Smith"},
+        )
+        data = response.json()
+        assert data["total"] == 1
+        assert "<mark>Jane</mark>" in data["items"][0]["highlight"]